@@ -1,2 +1,3 @@
+from .health import health_bp
 from .knowledge import knowledge_bp
 from .plans import plans_bp
\ No newline at end of file
@@ -0,0 +1,184 @@
+# api/routes/asgi.py
+"""asyncio handlers for the hottest read/delete paths.
+
+Served by the ASGI entry point (asgi.py) ahead of the Flask app, which
+still handles every other route. Handlers share the Flask services' plan
+and answer caches, so invalidations on either side are seen by both, and
+use the AsyncPlanRepository opened in the ASGI lifespan for DynamoDB. The
+lifespan also builds the services, so no request builds one on the loop.
+"""
+
+import asyncio
+import functools
+import time
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from api.routes.compression import choose_encoding, compress, should_compress
+from api.routes.plans import plan_service, MAX_PAGE_SIZE, _parse_fields, _parse_list_filters
+from api.routes.knowledge import kb_service
+from infrastructure.cache import InMemoryCacheBackend
+from infrastructure.config import COMPRESSION_ENABLED, METRICS_ENABLED
+from infrastructure.metrics import record_request, server_timing, stage, start_timings, stop_timings
+from infrastructure.utils import select_fields
+from infrastructure.utils.json_helper import dumps_json
+import logging
+
+logger = logging.getLogger(__name__)
+
+def async_json_response(payload, status: int = 200, headers: dict = None) -> Response:
+    """Starlette twin of json_response"""
+    with stage('encode'):
+        body = dumps_json(payload)
+    return Response(body, status_code=status, headers=headers, media_type='application/json')
+
+def _timed(path: str, handler):
+    """Twin of the Flask app's request timing hooks; handlers are left bare when metrics are off"""
+    if not METRICS_ENABLED:
+        return handler
+
+    @functools.wraps(handler)
+    async def timed_handler(request: Request) -> Response:
+        started = time.perf_counter()
+        token = start_timings()
+        try:
+            response = await handler(request)
+        finally:
+            timings = stop_timings(token)
+        elapsed = time.perf_counter() - started
+        response.headers['Server-Timing'] = server_timing(timings, elapsed)
+        record_request(request.method, path, response.status_code, elapsed)
+        return response
+    return timed_handler
+
+def _compressed(handler):
+    """Twin of the Flask app's compression hook"""
+    if not COMPRESSION_ENABLED:
+        return handler
+
+    @functools.wraps(handler)
+    async def compressed_handler(request: Request) -> Response:
+        response = await handler(request)
+        if not should_compress(response.status_code, response.media_type, len(response.body),
+                               'content-encoding' in response.headers):
+            return response
+        response.headers.add_vary_header('Accept-Encoding')
+        encoding = choose_encoding(request.headers.get('accept-encoding'))
+        if encoding is None:
+            return response
+        # Off the event loop: a full page of plans takes milliseconds to compress
+        response.body = await asyncio.to_thread(compress, response.body, encoding)
+        response.headers['content-length'] = str(len(response.body))
+        response.headers['content-encoding'] = encoding
+        etag = response.headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            response.headers['etag'] = f"W/{etag}"
+        return response
+    return compressed_handler
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+def _repository(request: Request):
+    return request.app.state.plan_repository
+
+async def _plan_cache_call(method: str, *args):
+    """Call a PlanCache method without blocking the loop on a Redis or DynamoDB
+    round trip; the in-memory backend is cheaper to call inline"""
+    cache = plan_service.plan_cache
+    if isinstance(cache.backend, InMemoryCacheBackend):
+        return getattr(cache, method)(*args)
+    return await asyncio.to_thread(getattr(cache, method), *args)
+
+# List plans, one page at a time
+async def list_plans(request: Request) -> Response:
+    try:
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            limit = 50
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return async_json_response({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}, 400)
+        view = request.query_params.get('view', 'full')
+        if view not in ('full', 'summary'):
+            return async_json_response({'error': "view must be 'full' or 'summary'"}, 400)
+
+        try:
+            fields = _parse_fields(request.query_params)
+            items, next_cursor = await _repository(request).list_page(
+                limit=limit,
+                cursor=request.query_params.get('cursor'),
+                summary=view == 'summary',
+                filters=_parse_list_filters(request.query_params)
+            )
+        except ValueError as e:
+            return async_json_response({'error': str(e)}, 400)
+        return async_json_response({'items': select_fields(items, fields), 'nextCursor': next_cursor})
+    except Exception as e:
+        logger.error(f"Error listing plans: {str(e)}")
+        return async_json_response({'error': str(e)}, 500)
+
+# Get a specific plan
+async def get_plan(request: Request) -> Response:
+    plan_id = str(request.path_params['plan_id'])
+    try:
+        try:
+            fields = _parse_fields(request.query_params)
+        except ValueError as e:
+            return async_json_response({'error': str(e)}, 400)
+        cached = await _plan_cache_call('get', plan_id, fields)
+        if cached is None:
+            item = await _repository(request).get(plan_id)
+            if not item:
+                return async_json_response({'error': 'Plan not found'}, 404)
+            cached = await _plan_cache_call('put', item, fields)
+
+        headers = {'ETag': f'"{cached.etag}"', 'Cache-Control': 'no-cache'}
+        if _etag_matches(request.headers.get('if-none-match'), cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(cached.body, headers=headers, media_type='application/json')
+    except Exception as e:
+        logger.error(f"Error retrieving plan: {str(e)}")
+        return async_json_response({'error': str(e)}, 500)
+
+# Delete a plan (all of its versions, atomically)
+async def delete_plan(request: Request) -> Response:
+    plan_id = str(request.path_params['plan_id'])
+    try:
+        deleted = await _repository(request).delete(plan_id)
+        await _plan_cache_call('invalidate', plan_id)
+        if not deleted:
+            return async_json_response({'error': 'Plan not found'}, 404)
+        return async_json_response({'message': 'Plan deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting plan: {str(e)}")
+        return async_json_response({'error': str(e)}, 500)
+
+async def query_kb(request: Request) -> Response:
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        question = data.get('question') if isinstance(data, dict) else None
+        if not question:
+            return async_json_response({'error': 'No question provided'}, 400)
+
+        return async_json_response(await kb_service.aquery(question))
+    except Exception as e:
+        logger.error(f"Error processing request: {str(e)}")
+        return async_json_response({'error': str(e)}, 500)
+
+# Plan ids are uuid4s, so /api/plans/jobs and friends fall through to Flask
+async_routes = [
+    Route(path, _timed(path, _compressed(handler)), methods=methods)
+    for path, handler, methods in (
+        ('/api/plans/', list_plans, ['GET']),
+        ('/api/plans/{plan_id:uuid}', get_plan, ['GET']),
+        ('/api/plans/{plan_id:uuid}', delete_plan, ['DELETE']),
+        ('/api/rag/query', query_kb, ['POST'])
+    )
+]
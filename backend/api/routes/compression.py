@@ -0,0 +1,86 @@
+# api/routes/compression.py
+
+import gzip
+from typing import Optional
+from flask import Response
+from infrastructure.config import (
+    COMPRESSION_BROTLI_QUALITY, COMPRESSION_ENABLED, COMPRESSION_GZIP_LEVEL, COMPRESSION_MIN_BYTES
+)
+from infrastructure.metrics import stage
+
+# brotli is optional; without it clients are offered gzip only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json',)
+# Server preference when the client accepts several equally
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding allowed by an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for entry in accept_encoding.split(','):
+        name, _, params = entry.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    with stage('compress'):
+        if encoding == 'br':
+            return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def should_compress(status: int, mimetype: Optional[str], length: Optional[int], encoded: bool) -> bool:
+    """Whether a buffered response is worth compressing at all (before looking at the client)"""
+    return (
+        COMPRESSION_ENABLED
+        and 200 <= status < 300 and status != 204
+        and not encoded
+        and mimetype in COMPRESSIBLE_MIMETYPES
+        and length is not None and length >= COMPRESSION_MIN_BYTES
+    )
+
+
+def compress_response(response: Response, accept_encoding: Optional[str]) -> Response:
+    """Flask after_request step: compress a large JSON body for clients that accept it.
+
+    Streamed responses (SSE) are left alone. A compressed response's ETag
+    is made weak, since the bytes differ from the identity encoding;
+    If-None-Match still matches it under weak comparison.
+    """
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if not should_compress(response.status_code, response.mimetype, response.content_length,
+                           'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
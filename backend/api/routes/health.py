@@ -0,0 +1,53 @@
+# api/routes/health.py
+from flask import Blueprint, jsonify
+from infrastructure.config import DYNAMODB_TABLES, HEALTH_CHECK_CACHE_SECONDS
+from infrastructure.db.dynamodb import DynamoDBConnection
+from infrastructure.lifecycle import is_draining
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+health_bp = Blueprint('health', __name__)
+
+# (checked_at, error or None) of the last DynamoDB check, shared by request threads
+_dynamodb_check = (0.0, None)
+_check_lock = threading.Lock()
+
+
+def _check_dynamodb():
+    """None if the plans table is reachable, else the error; cached for HEALTH_CHECK_CACHE_SECONDS"""
+    global _dynamodb_check
+    checked_at, error = _dynamodb_check
+    if time.monotonic() - checked_at < HEALTH_CHECK_CACHE_SECONDS:
+        return error
+    with _check_lock:
+        checked_at, error = _dynamodb_check
+        if time.monotonic() - checked_at < HEALTH_CHECK_CACHE_SECONDS:
+            return error
+        try:
+            client = DynamoDBConnection().dynamodb.meta.client
+            client.describe_table(TableName=DYNAMODB_TABLES['PLANS'])
+            error = None
+        except Exception as e:
+            logger.error(f"Readiness check failed: {str(e)}")
+            error = str(e)
+        _dynamodb_check = (time.monotonic(), error)
+        return error
+
+# The process is up and serving requests; no dependencies are checked
+@health_bp.route('/live', methods=['GET'])
+def live():
+    return jsonify({'status': 'ok'})
+
+# Ready for traffic: not draining and DynamoDB reachable. Bedrock is
+# deliberately not called, so probes cost nothing and an LLM outage
+# (handled by the gateway's circuit breaker) does not pull every worker
+@health_bp.route('/ready', methods=['GET'])
+def ready():
+    if is_draining():
+        return jsonify({'status': 'draining'}), 503
+    error = _check_dynamodb()
+    if error:
+        return jsonify({'status': 'unavailable', 'dynamodb': error}), 503
+    return jsonify({'status': 'ok', 'dynamodb': 'ok'})
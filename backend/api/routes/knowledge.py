@@ -1,11 +1,15 @@
 # api/routes/knowledge.py
 from flask import Blueprint, request, jsonify
 from api.services import KnowledgeBaseService
+from api.routes.responses import json_response, sse_frame, sse_response
+from infrastructure.config import RAG_BATCH_MAX_QUESTIONS
+from infrastructure.utils import LazyService
 import logging
 
 logger = logging.getLogger(__name__)
 knowledge_bp = Blueprint('knowledge', __name__)
-kb_service = KnowledgeBaseService()
+# Built on first use so importing the app (and forking workers) stays cheap
+kb_service = LazyService(KnowledgeBaseService)
 
 @knowledge_bp.route('/query', methods=['POST'])
 def query_kb():
@@ -21,4 +25,53 @@ def query_kb():
         
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# Answer a list of related questions in one request (e.g. a review checklist)
+@knowledge_bp.route('/batch', methods=['POST'])
+def batch_query_kb():
+    try:
+        questions = (request.get_json(silent=True) or {}).get('questions')
+        if not isinstance(questions, list) or not questions:
+            return jsonify({'error': "Request body must contain a non-empty 'questions' list"}), 400
+        if len(questions) > RAG_BATCH_MAX_QUESTIONS:
+            return jsonify({'error': f'At most {RAG_BATCH_MAX_QUESTIONS} questions per request'}), 400
+        if not all(isinstance(question, str) and question.strip() for question in questions):
+            return jsonify({'error': 'Every question must be a non-empty string'}), 400
+
+        return json_response(kb_service.batch_query(questions))
+    except Exception as e:
+        logger.error(f"Error processing batch request: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@knowledge_bp.route('/cache', methods=['GET'])
+def cache_stats():
+    return jsonify(kb_service.answer_cache.stats())
+
+# Called after the knowledge base data source is re-synced
+@knowledge_bp.route('/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    try:
+        removed = kb_service.invalidate_cache()
+        return jsonify({'invalidated': removed})
+    except Exception as e:
+        logger.error(f"Error invalidating answer cache: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@knowledge_bp.route('/stream', methods=['GET', 'POST'])
+def stream_kb():
+    # EventSource can only issue GETs, so accept the question as a query parameter too
+    if request.method == 'POST':
+        question = (request.get_json(silent=True) or {}).get('question')
+    else:
+        question = request.args.get('question')
+
+    if not question:
+        return jsonify({'error': 'No question provided'}), 400
+
+    def generate():
+        for event, data in kb_service.stream_query(question):
+            # Tokens go out as unnamed messages
+            yield sse_frame(event, data, unnamed=('token',))
+
+    return sse_response(generate())
\ No newline at end of file
@@ -1,16 +1,76 @@
 # api/routes/plans.py
 
-import json
-from flask import Blueprint, request, jsonify
-from api.services import TurnaroundPlanService
-from infrastructure.utils.json_helper import DecimalEncoder, decimal_to_float
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify
+from api.services import (
+    TurnaroundPlanService, PlanConflictError, SchedulingService, ScheduleError, SimulationService
+)
+from api.routes.responses import json_response, sse_frame, sse_response
+from infrastructure.cache import create_cache_backend, is_process_local
+from infrastructure.jobs import JobQueue, QueueFullError
+from infrastructure.lifecycle import register_drain_hook
+from infrastructure.metrics import server_timing
+from infrastructure.utils import LazyService, parse_fields
+from infrastructure.config import (
+    PLAN_JOB_WORKERS, PLAN_JOB_QUEUE_SIZE, PLAN_JOB_RESULT_TTL_SECONDS, JOB_STORE_URL,
+    IDEMPOTENCY_CACHE_URL, IDEMPOTENCY_TTL_SECONDS, PORTFOLIO_MAX_PLANS
+)
 import logging
 
 logger = logging.getLogger(__name__)
 plans_bp = Blueprint('plans', __name__)
-plan_service = TurnaroundPlanService()
+# Built on first use so importing the app (and forking workers) stays cheap
+plan_service = LazyService(TurnaroundPlanService)
+scheduling_service = SchedulingService(plan_service)
+simulation_service = SimulationService(plan_service)
+plan_jobs = JobQueue(
+    'plan-generation',
+    max_workers=PLAN_JOB_WORKERS,
+    max_queue_size=PLAN_JOB_QUEUE_SIZE,
+    result_ttl=PLAN_JOB_RESULT_TTL_SECONDS,
+    # Shared records let any worker answer a poll; a local queue needs none
+    store=None if is_process_local(JOB_STORE_URL) else create_cache_backend(
+        JOB_STORE_URL, namespace='plan-jobs', default_ttl=PLAN_JOB_RESULT_TTL_SECONDS
+    )
+)
+# On shutdown, finish queued and running generations before the worker exits
+register_drain_hook(lambda timeout: plan_jobs.shutdown(wait=True, timeout=timeout))
+# Idempotency-Key -> {fingerprint, jobId, planId} for /generate retries
+idempotency_records = create_cache_backend(
+    IDEMPOTENCY_CACHE_URL,
+    namespace='generate-idempotency',
+    default_ttl=IDEMPOTENCY_TTL_SECONDS
+)
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
 
-# Generate a new plan
+def _generate_and_save(plan_details, idempotency_key=None, fingerprint=None):
+    """Job body: run the LLM generation and DynamoDB write off the request thread"""
+    # Decimals are left in place; json_response encodes them when the job is polled
+    plan = plan_service.create_and_save_plan(plan_details)
+    if idempotency_key:
+        # Lets a worker that does not hold the job answer retries with the plan
+        record = idempotency_records.get(idempotency_key) or {'fingerprint': fingerprint}
+        idempotency_records.set(idempotency_key, {**record, 'planId': plan['id']})
+    return plan
+
+def _replay(record):
+    """Response for a retried request whose key was already used, or None
+    when neither its job nor its plan can be found any more"""
+    headers = {'Idempotent-Replayed': 'true'}
+    job = plan_jobs.record(record['jobId']) if record.get('jobId') else None
+    if job:
+        job.pop('timings', None)
+        headers['Location'] = f"/api/plans/jobs/{job['id']}"
+        return json_response(job, 202, headers)
+    plan = plan_service.get_plan(record['planId']) if record.get('planId') else None
+    if plan:
+        return json_response({
+            'id': record.get('jobId'), 'status': 'succeeded', 'createdAt': plan.get('createdAt'),
+            'waitTime': None, 'runTime': None, 'result': plan, 'error': None
+        }, 200, headers)
+    return None
+
+# Queue generation of a new plan
 @plans_bp.route('/generate', methods=['POST'])
 def generate_plan():
     try:
@@ -23,13 +83,48 @@ def generate_plan():
             return jsonify({
                 'error': f'Missing required fields: {", ".join(missing_fields)}'
             }), 400
+
+        fingerprint = plan_service.generation_key(plan_details)
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key:
+            if len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+                return jsonify({'error': 'Idempotency-Key is too long'}), 400
+            # Claimed atomically, so concurrent requests reusing a key cannot both run
+            if not idempotency_records.add(idempotency_key, {'fingerprint': fingerprint}):
+                record = idempotency_records.get(idempotency_key) or {'fingerprint': fingerprint}
+                if record['fingerprint'] != fingerprint:
+                    return jsonify({
+                        'error': 'Idempotency-Key was already used with a different request'
+                    }), 422
+                replayed = _replay(record)
+                if replayed is not None:
+                    return replayed
+                # Claimed by an identical request that has not submitted yet (it
+                # joins that job below), or the job's result has expired (or it
+                # failed): run the request again
+                idempotency_records.set(idempotency_key, {'fingerprint': fingerprint})
+
+        # An identical request that is still queued or running gets the same job
+        job, created = plan_jobs.submit_unique(
+            fingerprint, _generate_and_save, plan_details,
+            idempotency_key=idempotency_key, fingerprint=fingerprint
+        )
+        if idempotency_key:
+            # Merge: a fast job may already have recorded its planId
+            record = idempotency_records.get(idempotency_key) or {}
+            idempotency_records.set(idempotency_key, {**record, 'fingerprint': fingerprint, 'jobId': job['id']})
+        job.pop('timings', None)
+        headers = {'Location': f"/api/plans/jobs/{job['id']}"}
+        if not created:
+            headers['Idempotent-Replayed'] = 'true'
+        return json_response(job, 202, headers)
         
-        plan = plan_service.create_and_save_plan(plan_details)
-        # Convert Decimal to float before JSON serialization
-        serializable_plan = decimal_to_float(plan)
-        
-        return json.dumps(serializable_plan, cls=DecimalEncoder), 200, {'Content-Type': 'application/json'}
-        
+    except QueueFullError as e:
+        logger.error(f"Rejected plan generation: {str(e)}")
+        return jsonify({
+            'error': 'Too many plans are being generated, please retry shortly',
+            'details': str(e)
+        }), 503, {'Retry-After': '10'}
     except Exception as e:
         logger.error(f"Error generating plan: {str(e)}")
         return jsonify({
@@ -37,30 +132,280 @@ def generate_plan():
             'details': str(e)
         }), 500
 
-# List all plans
+# Generate a plan on the request, streaming sections as Server-Sent Events
+@plans_bp.route('/generate/stream', methods=['POST'])
+def generate_plan_stream():
+    plan_details = request.get_json(silent=True)
+    if not isinstance(plan_details, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    required_fields = ['title', 'plantType', 'duration', 'budget', 'scope']
+    missing_fields = [field for field in required_fields if field not in plan_details]
+    if missing_fields:
+        return jsonify({
+            'error': f'Missing required fields: {", ".join(missing_fields)}'
+        }), 400
+
+    def generate():
+        for event, data in plan_service.stream_plan(plan_details):
+            yield sse_frame(event, data)
+
+    return sse_response(generate())
+
+# Get the status (and result, once finished) of a generation job
+@plans_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = plan_jobs.record(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    timings = job.pop('timings', None)
+    response = json_response(job)
+    if timings:
+        # Where the generation's time went, prefixed to tell it from this poll's own stages
+        response.headers['Server-Timing'] = server_timing(timings, job['runTime'], prefix='job.')
+    return response
+
+# Queue depth and wait/run time statistics for plan generation
+@plans_bp.route('/jobs', methods=['GET'])
+def get_job_stats():
+    return jsonify(plan_jobs.stats())
+
+MAX_PAGE_SIZE = 100
+PLAN_STATUSES = ('draft', 'approved', 'in_progress', 'completed')
+# Returned whatever ?fields= selects: they identify the plan and its version
+ALWAYS_FIELDS = ('id', 'createdAt', 'updatedAt')
+
+def _parse_fields(args):
+    """?fields=title,details.milestones as a field tree (None for the whole plan); raises ValueError"""
+    return parse_fields(args.get('fields'), always=ALWAYS_FIELDS)
+
+def _parse_list_filters(args) -> dict:
+    """Read status / plantType / from / to query parameters; raises ValueError when invalid"""
+    filters = {}
+    status = args.get('status')
+    if status:
+        if status not in PLAN_STATUSES:
+            raise ValueError(f"status must be one of: {', '.join(PLAN_STATUSES)}")
+        filters['status'] = status
+    if args.get('plantType'):
+        filters['plantType'] = args['plantType']
+
+    for bound in ('from', 'to'):
+        value = args.get(bound)
+        if not value:
+            continue
+        try:
+            datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{bound} must be an ISO 8601 date or datetime")
+        # createdAt is stored as an ISO string, so a bare date as the upper
+        # bound has to cover the whole day
+        if bound == 'to' and len(value) == 10:
+            value = f"{value}T23:59:59.999999"
+        filters[bound] = value
+    return filters
+
+# List plans, one page at a time
 @plans_bp.route('/', methods=['GET'])
 def list_plans():
     try:
-        plans = plan_service.list_plans()
-        serializable_plans = decimal_to_float(plans)
-        return json.dumps(serializable_plans, cls=DecimalEncoder), 200, {'Content-Type': 'application/json'}
+        limit = request.args.get('limit', default=50, type=int)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        view = request.args.get('view', 'full')
+        if view not in ('full', 'summary'):
+            return jsonify({'error': "view must be 'full' or 'summary'"}), 400
+
+        try:
+            plans = plan_service.list_plans_page(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                summary=view == 'summary',
+                filters=_parse_list_filters(request.args),
+                fields=_parse_fields(request.args)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return json_response(plans)
     except Exception as e:
         logger.error(f"Error listing plans: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Score stored plans against industry benchmarks and rank them by realism
+@plans_bp.route('/portfolio/analysis', methods=['GET'])
+def portfolio_analysis():
+    try:
+        try:
+            limit = int(request.args.get('limit', PORTFOLIO_MAX_PLANS))
+        except ValueError:
+            limit = PORTFOLIO_MAX_PLANS
+        if not 1 <= limit <= PORTFOLIO_MAX_PLANS:
+            return jsonify({'error': f'limit must be between 1 and {PORTFOLIO_MAX_PLANS}'}), 400
+        order = request.args.get('order', 'desc')
+        if order not in ('asc', 'desc'):
+            return jsonify({'error': "order must be 'asc' or 'desc'"}), 400
+
+        try:
+            filters = _parse_list_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return json_response(plan_service.analyze_portfolio(limit, filters, ascending=order == 'asc'))
+    except Exception as e:
+        logger.error(f"Error analyzing portfolio: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # Get a specific plan
 @plans_bp.route('/<plan_id>', methods=['GET'])
 def get_plan(plan_id):
     try:
-        plan = plan_service.get_plan(plan_id)
-        if not plan:
+        try:
+            fields = _parse_fields(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        cached = plan_service.get_plan_response(plan_id, fields)
+        if not cached:
             return jsonify({'error': 'Plan not found'}), 404
-        serializable_plan = decimal_to_float(plan)
-        return json.dumps(serializable_plan, cls=DecimalEncoder), 200, {'Content-Type': 'application/json'}
+
+        # Clients revalidate with If-None-Match and get a bodiless 304 when
+        # unchanged; weak comparison, as compressed responses carry W/ ETags
+        if request.if_none_match.contains_weak(cached.etag):
+            response = Response(status=304)
+        else:
+            response = Response(cached.body, mimetype='application/json')
+        response.set_etag(cached.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Error retrieving plan: {str(e)}")
         return jsonify({'error': str(e)}), 500
     
+# Critical-path schedule of a plan's milestones
+@plans_bp.route('/<plan_id>/schedule', methods=['GET'])
+def get_schedule(plan_id):
+    try:
+        schedule = scheduling_service.get_schedule(plan_id)
+        if schedule is None:
+            return jsonify({'error': 'Plan not found'}), 404
+        return json_response(schedule)
+    except ScheduleError as e:
+        return jsonify({'error': str(e)}), 422
+    except Exception as e:
+        logger.error(f"Error scheduling plan: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Recompute the schedule with some milestone durations changed; nothing is saved
+@plans_bp.route('/<plan_id>/schedule/what-if', methods=['POST'])
+def schedule_what_if(plan_id):
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        try:
+            result = scheduling_service.what_if(plan_id, data.get('changes'))
+        except ScheduleError as e:
+            return jsonify({'error': str(e)}), 422
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if result is None:
+            return jsonify({'error': 'Plan not found'}), 404
+        return json_response(result)
+    except Exception as e:
+        logger.error(f"Error running schedule what-if: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Monte Carlo schedule and cost risk (P50/P80/P90, criticality indices)
+@plans_bp.route('/<plan_id>/simulate', methods=['POST'])
+def simulate_plan(plan_id):
+    try:
+        options = request.get_json(silent=True)
+        if options is None:
+            options = {}
+        if not isinstance(options, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        try:
+            result = simulation_service.simulate(plan_id, options)
+        except ScheduleError as e:
+            return jsonify({'error': str(e)}), 422
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if result is None:
+            return jsonify({'error': 'Plan not found'}), 404
+        return json_response(result)
+    except Exception as e:
+        logger.error(f"Error simulating plan: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Partially update a plan (title, status and/or individual details fields)
+@plans_bp.route('/<plan_id>', methods=['PATCH'])
+def update_plan(plan_id):
+    try:
+        updates = request.get_json(silent=True)
+        if not isinstance(updates, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        if updates.get('id', plan_id) != plan_id:
+            return jsonify({'error': 'Plan id in body does not match URL'}), 400
+
+        try:
+            # createdAt (if the client sends it) completes the table key and saves a lookup
+            plan = plan_service.update_plan(plan_id, updates, created_at=updates.get('createdAt'))
+        except PlanConflictError as e:
+            return jsonify({'error': str(e)}), 409
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if not plan:
+            return jsonify({'error': 'Plan not found'}), 404
+        response = json_response(plan)
+        response.set_etag(plan_service.plan_cache.make_etag(plan))
+        return response
+    except Exception as e:
+        logger.error(f"Error updating plan {plan_id}: {str(e)}")
+        return jsonify({'error': 'Failed to update plan'}), 500
+
+MAX_BATCH_SIZE = 500
+
+def _batch_refs():
+    """ids from a batch request body; raises ValueError when missing or too many"""
+    refs = (request.get_json(silent=True) or {}).get('ids')
+    if not isinstance(refs, list) or not refs:
+        raise ValueError("Request body must contain a non-empty 'ids' list")
+    if len(refs) > MAX_BATCH_SIZE:
+        raise ValueError(f'At most {MAX_BATCH_SIZE} ids per request')
+    return refs
+
+def _batch_response(results, success_status):
+    succeeded = sum(1 for result in results if result['status'] == success_status)
+    return json_response({
+        'results': results,
+        'summary': {'requested': len(results), 'succeeded': succeeded, 'failed': len(results) - succeeded}
+    })
+
+# Fetch many plans at once; ids may be plain ids or {"id", "createdAt"} keys
+@plans_bp.route('/batch-get', methods=['POST'])
+def batch_get_plans():
+    try:
+        try:
+            results = plan_service.batch_get_plans(_batch_refs(), _parse_fields(request.args))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return _batch_response(results, 'ok')
+    except Exception as e:
+        logger.error(f"Error batch retrieving plans: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Delete many plans at once
+@plans_bp.route('/batch-delete', methods=['POST'])
+def batch_delete_plans():
+    try:
+        try:
+            results = plan_service.batch_delete_plans(_batch_refs())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return _batch_response(results, 'deleted')
+    except Exception as e:
+        logger.error(f"Error batch deleting plans: {str(e)}")
+        return jsonify({'error': 'Failed to delete plans'}), 500
+
 # Delete a plan
 @plans_bp.route('/<plan_id>', methods=['DELETE'])
 def delete_plan(plan_id):
@@ -0,0 +1,28 @@
+# api/routes/responses.py
+
+from flask import Response, stream_with_context
+from infrastructure.metrics import stage
+from infrastructure.utils.json_helper import dumps_json
+
+def json_response(payload, status: int = 200, headers: dict = None) -> Response:
+    """JSON response encoded in a single pass; Decimals are handled by the encoder"""
+    with stage('encode'):
+        body = dumps_json(payload)
+    return Response(body, status=status, headers=headers, mimetype='application/json')
+
+def sse_frame(event: str, data, unnamed: tuple = ()) -> str:
+    """Encode one Server-Sent Events frame; events listed in unnamed go out as plain messages"""
+    frame = f"data: {dumps_json(data).decode('utf-8')}\n\n"
+    return frame if event in unnamed else f"event: {event}\n{frame}"
+
+def sse_response(frames) -> Response:
+    """Streaming text/event-stream response over an iterable of frames"""
+    return Response(
+        stream_with_context(frames),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Stop reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        }
+    )
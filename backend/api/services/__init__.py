@@ -1,2 +1,4 @@
 from .knowledgebaseservice import KnowledgeBaseService
-from .turnaroundplanservice import TurnaroundPlanService
\ No newline at end of file
+from .turnaroundplanservice import TurnaroundPlanService, PlanConflictError
+from .schedulingservice import SchedulingService, ScheduleError
+from .simulationservice import SimulationService
\ No newline at end of file
@@ -1,31 +1,117 @@
-from langchain_aws.retrievers import AmazonKnowledgeBasesRetriever
-from langchain_aws import ChatBedrockConverse
-from langchain.chains import RetrievalQA
-import boto3
+import asyncio
+import hashlib
 import os
 import re
+import unicodedata
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+from infrastructure.cache import create_cache_backend
+from infrastructure.metrics import stage
+from infrastructure.config import (
+    KNOWLEDGE_BASE_ID, RAG_CACHE_URL, RAG_CACHE_TTL_SECONDS, RAG_CACHE_MAX_ENTRIES,
+    RAG_RETRIEVER, LOCAL_INDEX_PATH, RAG_BATCH_RETRIEVAL_CONCURRENCY, RAG_BATCH_GENERATION_CONCURRENCY
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class StreamingAnswerFormatter:
+    """Applies KnowledgeBaseService.format_line to a token stream.
+
+    A line is held back only until its formatting is decided: the first
+    characters settle numbered and bullet lines, and a plain line is
+    known not to be a header once it outgrows HEADER_MAX_CHARS. From then
+    on its text is emitted token by token (trailing whitespace waits, since
+    format_line strips it), so the concatenated output still equals
+    format_answer() of the full text.
+    """
+
+    def __init__(self, service: 'KnowledgeBaseService'):
+        self.service = service
+        # Start of the current line while its formatting is undecided
+        self._line = ''
+        self._decided = False
+        # Trailing whitespace of a decided line, dropped if the line ends
+        self._held = ''
+        self._emitted_any = False
+
+    def feed(self, token: str) -> str:
+        """Consume a token and return any newly formatted text"""
+        out: List[str] = []
+        *complete, rest = token.split('\n')
+        for part in complete:
+            self._append(part, out)
+            self._end_line(out)
+        self._append(rest, out)
+        return ''.join(out)
+
+    def flush(self) -> str:
+        """Format whatever remains once the stream has ended"""
+        out: List[str] = []
+        self._end_line(out)
+        return ''.join(out)
+
+    def _append(self, text: str, out: List[str]) -> None:
+        if not self._decided:
+            self._line = (self._line + text).lstrip()
+            prefix = self._prefix(self._line)
+            if prefix is None:
+                return
+            text, self._line = self._line, ''
+            self._decided = True
+            out.append(('\n' if self._emitted_any else '') + prefix)
+            self._emitted_any = True
+        text = self._held + text
+        kept = text.rstrip()
+        self._held = text[len(kept):]
+        out.append(kept)
+
+    def _end_line(self, out: List[str]) -> None:
+        if not self._decided:
+            formatted = self.service.format_line(self._line)
+            if formatted is not None:
+                out.append(('\n' if self._emitted_any else '') + formatted)
+                self._emitted_any = True
+        self._line, self._decided, self._held = '', False, ''
+
+    def _prefix(self, line: str) -> Optional[str]:
+        """What format_line puts before this line, or None while that depends on text still to come"""
+        if not line:
+            return None
+        digits = re.match(r'\d+', line)
+        if digits:
+            if digits.end() == len(line):
+                return None
+            if line[digits.end()] == '.':
+                return '\n'
+        elif line[0] in ('•', '*'):
+            return ''
+        # Plain text: a header only if it ends with ':' while still short
+        return '' if len(line.rstrip()) > self.service.HEADER_MAX_CHARS else None
+
+
 class KnowledgeBaseService:
+    # Longest line ending in ':' that is still formatted as a header
+    HEADER_MAX_CHARS = 80
+
     def __init__(self):
         load_dotenv()
 
-        session = boto3.Session(profile_name='PrecisionTurn-Dev')
+        # LangChain and the retrieval stack are imported here rather than at
+        # module level so the app starts without paying for them until a
+        # question is first asked
+        from langchain.chains import RetrievalQA
+        from infrastructure.llm.chat_models import create_chat_model
+        from infrastructure.retrieval import create_retriever
 
-        self.retriever = AmazonKnowledgeBasesRetriever(
-            knowledge_base_id="TVZXIOTZ7U",
-            retrieval_config={"vectorSearchConfiguration": {"numberOfResults": 4}},
-            aws_session=session,
-            region_name='us-east-2'
-        )
+        # Identifies the corpus answers come from (used to scope the answer cache)
+        self.knowledge_base_id = KNOWLEDGE_BASE_ID if RAG_RETRIEVER == 'bedrock' else f"local:{LOCAL_INDEX_PATH}"
+        # Bedrock Knowledge Bases or the local vector index, per RAG_RETRIEVER
+        self.retriever = create_retriever()
         
-        self.llm = ChatBedrockConverse(
-            model="us.amazon.nova-lite-v1:0",
-            region_name='us-east-2'
-        )
+        # Shares the plan service's gateway, so both respect one concurrency limit
+        self.llm = create_chat_model("us.amazon.nova-lite-v1:0")
 
         self.qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
@@ -34,57 +120,67 @@ class KnowledgeBaseService:
             return_source_documents=True
         )
 
+        # Answers keyed on knowledge base + normalized question
+        self.answer_cache = create_cache_backend(
+            RAG_CACHE_URL,
+            namespace='rag-answers',
+            max_entries=RAG_CACHE_MAX_ENTRIES,
+            default_ttl=RAG_CACHE_TTL_SECONDS
+        )
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Canonical form of a question so trivial variations share a cache entry"""
+        text = unicodedata.normalize('NFKC', question).lower()
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text.rstrip('?!. ')
+
+    def _cache_key(self, question: str) -> str:
+        digest = hashlib.sha256(self.normalize_question(question).encode('utf-8')).hexdigest()
+        return f"{self.knowledge_base_id}:{digest}"
+
+    def invalidate_cache(self) -> int:
+        """Drop cached answers for this knowledge base, e.g. after a re-sync"""
+        removed = self.answer_cache.clear(prefix=f"{self.knowledge_base_id}:")
+        logger.info(f"Invalidated {removed} cached answers for knowledge base {self.knowledge_base_id}")
+        return removed
+
     def format_answer(self, text: str) -> str:
         """Enhanced formatting for better readability"""
-        # Split into lines and process each line
-        lines = text.split('\n')
         formatted_lines = []
-        current_section = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Handle numbered points (e.g., "1.", "2.")
-            if re.match(r'^\d+\.', line):
-                # If we have a previous section, add it
-                if current_section:
-                    formatted_lines.extend(current_section)
-                    current_section = []
-                formatted_lines.append(f"\n{line}")
-                
-            # Handle bullet points
-            elif line.startswith('•') or line.startswith('*'):
-                if current_section:
-                    formatted_lines.extend(current_section)
-                    current_section = []
-                formatted_lines.append(line)
-                
-            # Handle emphasized points (with asterisks)
-            elif line.startswith('**'):
-                if current_section:
-                    formatted_lines.extend(current_section)
-                    current_section = []
-                # Clean up the asterisks but keep it as a strong point
-                clean_line = line.replace('**', '')
-                formatted_lines.append(f"• {clean_line}")
-                
-            # Regular text
-            elif line:
-                if line.endswith(':'):
-                    # This is likely a header/title
-                    if current_section:
-                        formatted_lines.extend(current_section)
-                        current_section = []
-                    formatted_lines.append(f"\n{line}")
-                else:
-                    current_section.append(line)
-        
-        # Add any remaining section
-        if current_section:
-            formatted_lines.extend(current_section)
-        
+        for line in text.split('\n'):
+            formatted = self.format_line(line)
+            if formatted is not None:
+                formatted_lines.append(formatted)
         return '\n'.join(formatted_lines)
 
+    def format_line(self, line: str) -> Optional[str]:
+        """Format a single answer line, or return None for blank lines"""
+        line = line.strip()
+
+        # Handle numbered points (e.g., "1.", "2.")
+        if re.match(r'^\d+\.', line):
+            return f"\n{line}"
+
+        # Handle bullet points
+        if line.startswith('•') or line.startswith('*'):
+            return line
+
+        # Handle emphasized points (with asterisks)
+        if line.startswith('**'):
+            # Clean up the asterisks but keep it as a strong point
+            clean_line = line.replace('**', '')
+            return f"• {clean_line}"
+
+        # Regular text
+        if line:
+            if line.endswith(':') and len(line) <= self.HEADER_MAX_CHARS:
+                # This is likely a header/title
+                return f"\n{line}"
+            return line
+
+        return None
+
     def truncate_content(self, content: str, max_length: int = 200) -> str:
         """Truncate content to a reasonable length while maintaining sentence integrity."""
         if len(content) <= max_length:
@@ -111,26 +207,233 @@ class KnowledgeBaseService:
             for i, doc in enumerate(docs)
         ]
 
+    def _rank_sources(self, docs) -> List[Dict[str, Any]]:
+        """Format and sort sources by relevance, keeping the top 3"""
+        sources = self.format_source_documents(docs)
+        sources.sort(key=lambda x: float(x['metadata'].get('score', 0)), reverse=True)
+        return sources[:3]
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """Extract text from a streamed message chunk (plain string or Converse content blocks)"""
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        return ''.join(
+            block.get('text', '') for block in content
+            if isinstance(block, dict) and block.get('type', 'text') == 'text'
+        )
+
+    def stream_query(self, question: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Answer a question as a stream of (event, data) pairs.
+
+        Emits a single 'sources' event as soon as retrieval returns, then
+        'token' events carrying formatted answer text as the model decodes,
+        and finally 'end' (or 'error' if anything fails).
+        """
+        from langchain.chains.retrieval_qa.prompt import PROMPT as QA_PROMPT
+
+        try:
+            cached = self.answer_cache.get(self._cache_key(question))
+            if cached is not None:
+                yield 'sources', {'source_documents': cached['source_documents']}
+                yield 'token', {'token': cached['answer']}
+                yield 'end', {'error': None}
+                return
+
+            with stage('rag.retrieve'):
+                docs = self.retriever.invoke(question)
+            sources = self._rank_sources(docs)
+            yield 'sources', {'source_documents': sources}
+
+            # Same prompt the "stuff" RetrievalQA chain builds in query()
+            context = '\n\n'.join(doc.page_content for doc in docs)
+            prompt = QA_PROMPT.format(context=context, question=question)
+
+            formatter = StreamingAnswerFormatter(self)
+            answer_parts = []
+            for chunk in self.llm.stream(prompt):
+                text = formatter.feed(self._chunk_text(chunk))
+                if text:
+                    answer_parts.append(text)
+                    yield 'token', {'token': text}
+            text = formatter.flush()
+            if text:
+                answer_parts.append(text)
+                yield 'token', {'token': text}
+
+            self.answer_cache.set(self._cache_key(question), {
+                "answer": ''.join(answer_parts),
+                "source_documents": sources,
+                "error": None
+            })
+            yield 'end', {'error': None}
+        except Exception as e:
+            logger.error(f"Error in stream_query: {str(e)}")
+            yield 'error', {'error': str(e)}
+
     def query(self, question: str):
+        cache_key = self._cache_key(question)
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.qa_chain.invoke({"query": question})
+            # Retrieval and the model call; the llm stage inside it is recorded separately
+            with stage('rag.chain'):
+                result = self.qa_chain.invoke({"query": question})
             
-            # Format the answer
-            formatted_answer = self.format_answer(result['result'])
+            with stage('rag.format'):
+                # Format the answer
+                formatted_answer = self.format_answer(result['result'])
             
-            # Format and sort sources by relevance
-            sources = self.format_source_documents(result['source_documents'])
-            sources.sort(key=lambda x: float(x['metadata'].get('score', 0)), reverse=True)
+                # Format and sort sources by relevance
+                sources = self._rank_sources(result['source_documents'])
             
-            return {
+            response = {
                 "answer": formatted_answer,
-                "source_documents": sources[:3],  # Limit to top 3 sources
+                "source_documents": sources,
                 "error": None
             }
+            # Only successful answers are cached; errors are retried next time
+            self.answer_cache.set(cache_key, response)
+            return response
         except Exception as e:
             logger.error(f"Error in query: {str(e)}")
             return {
                 "answer": None,
                 "source_documents": [],
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    async def aquery(self, question: str):
+        """query() for asyncio callers.
+
+        Neither the Bedrock retriever nor ChatBedrockConverse implements
+        native async, so ainvoke runs both calls in the loop's default
+        executor: the loop stays free, but each call still holds a thread.
+        Cache lookups (Redis or DynamoDB I/O) are moved off the loop too.
+        """
+        cache_key = self._cache_key(question)
+        cached = await asyncio.to_thread(self.answer_cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            with stage('rag.chain'):
+                result = await self.qa_chain.ainvoke({"query": question})
+            with stage('rag.format'):
+                response = {
+                    "answer": self.format_answer(result['result']),
+                    "source_documents": self._rank_sources(result['source_documents']),
+                    "error": None
+                }
+            await asyncio.to_thread(self.answer_cache.set, cache_key, response)
+            return response
+        except Exception as e:
+            logger.error(f"Error in aquery: {str(e)}")
+            return {
+                "answer": None,
+                "source_documents": [],
+                "error": str(e)
+            }
+
+    @staticmethod
+    def _source_id(source: Dict[str, Any]) -> str:
+        """Stable id of a formatted source, equal for the same passage retrieved by different questions"""
+        key = f"{source['metadata'].get('location', '')}\n{source['content']}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def batch_query(self, questions: List[str]) -> Dict[str, Any]:
+        """Answer many questions in one call; results come back in the order asked.
+
+        Questions that normalize the same are answered once and cached
+        answers are reused. The rest are retrieved for concurrently, then
+        answered with at most RAG_BATCH_GENERATION_CONCURRENCY model calls
+        in flight, using the same prompt as query(). Each source passage
+        appears once in 'documents' and results refer to it by id with
+        their own score. New answers are cached, so a later /query for the
+        same question is a hit. One question failing does not fail the rest.
+        """
+        from langchain.chains.retrieval_qa.prompt import PROMPT as QA_PROMPT
+
+        # Cache key -> first question with that key; later duplicates share its answer
+        unique: Dict[str, str] = {}
+        for question in questions:
+            unique.setdefault(self._cache_key(question), question)
+
+        answers: Dict[str, Dict[str, Any]] = {}
+        cached_keys = set()
+        for key in unique:
+            cached = self.answer_cache.get(key)
+            if cached is not None:
+                answers[key] = cached
+                cached_keys.add(key)
+        pending = [key for key in unique if key not in answers]
+
+        if pending:
+            with stage('rag.retrieve'):
+                retrieved = self.retriever.batch(
+                    [unique[key] for key in pending],
+                    config={'max_concurrency': RAG_BATCH_RETRIEVAL_CONCURRENCY},
+                    return_exceptions=True
+                )
+            prompts, prompt_keys = [], []
+            for key, docs in zip(pending, retrieved):
+                if isinstance(docs, Exception):
+                    logger.error(f"Retrieval failed in batch_query: {str(docs)}")
+                    answers[key] = {"answer": None, "source_documents": [], "error": str(docs)}
+                    continue
+                # Same "stuff" prompt the RetrievalQA chain builds in query()
+                context = '\n\n'.join(doc.page_content for doc in docs)
+                prompts.append(QA_PROMPT.format(context=context, question=unique[key]))
+                prompt_keys.append(key)
+                answers[key] = {"answer": None, "source_documents": self._rank_sources(docs), "error": None}
+
+            with stage('rag.generate'):
+                generated = self.llm.batch(
+                    prompts,
+                    config={'max_concurrency': RAG_BATCH_GENERATION_CONCURRENCY},
+                    return_exceptions=True
+                )
+            with stage('rag.format'):
+                for key, message in zip(prompt_keys, generated):
+                    if isinstance(message, Exception):
+                        logger.error(f"Generation failed in batch_query: {str(message)}")
+                        answers[key] = {"answer": None, "source_documents": [], "error": str(message)}
+                        continue
+                    answers[key]["answer"] = self.format_answer(self._chunk_text(message))
+                    self.answer_cache.set(key, answers[key])
+
+        documents: Dict[str, Dict[str, Any]] = {}
+        results = []
+        for question in questions:
+            key = self._cache_key(question)
+            answer = answers[key]
+            refs = []
+            for source in answer['source_documents']:
+                source_id = self._source_id(source)
+                documents.setdefault(source_id, {
+                    "content": source['content'],
+                    "location": source['metadata'].get('location')
+                })
+                refs.append({"id": source_id, "score": source['metadata'].get('score', 0)})
+            results.append({
+                "question": question,
+                "answer": answer['answer'],
+                "sources": refs,
+                "cached": key in cached_keys,
+                "error": answer['error']
+            })
+
+        return {
+            "results": results,
+            "documents": documents,
+            "summary": {
+                "questions": len(questions),
+                "unique": len(unique),
+                "cached": len(cached_keys),
+                "failed": sum(1 for result in results if result['error']),
+                "documents": len(documents)
+            }
+        }
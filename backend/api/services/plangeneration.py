@@ -0,0 +1,361 @@
+# api/services/plangeneration.py
+
+import hashlib
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from infrastructure.config import PLAN_SECTION_MAX_ATTEMPTS
+from infrastructure.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# The plan schema, one entry per top-level section, in document order.
+# TurnaroundPlanService._get_plan_schema assembles the full schema from these.
+PLAN_SECTIONS: Dict[str, Dict[str, str]] = {
+    'milestones': {
+        'instructions': """Milestones: Break down into phases, each with:
+                - Title of the phase
+                - Duration in days
+                - Key deliverables
+                - Dependencies on other phases, given as the titles of earlier phases""",
+        'schema': """[
+                {
+                    "title": string,
+                    "duration": number,
+                    "deliverables": [string],
+                    "dependencies": [string]
+                }
+            ]"""
+    },
+    'resources': {
+        'instructions': """Resource Requirements:
+                - Personnel with roles, count needed, and required skills
+                - Equipment with types and quantities""",
+        'schema': """{
+                "personnel": [
+                    {
+                        "role": string,
+                        "count": number,
+                        "skills": string
+                    }
+                ],
+                "equipment": [
+                    {
+                        "type": string,
+                        "quantity": number
+                    }
+                ]
+            }"""
+    },
+    'risk_assessment': {
+        'instructions': """Risk Assessment:
+                - High-risk items with titles
+                - Detailed descriptions
+                - Mitigation strategies""",
+        'schema': """{
+                "high_risks": [
+                    {
+                        "title": string,
+                        "description": string,
+                        "mitigation": string
+                    }
+                ]
+            }"""
+    },
+    'cost_breakdown': {
+        'instructions': """Cost Breakdown:
+                - Category of expense
+                - Amount allocated
+                - Additional details""",
+        'schema': """[
+                {
+                    "category": string,
+                    "amount": number,
+                    "details": string
+                }
+            ]"""
+    },
+    'safety_plan': {
+        'instructions': """Safety Plan:
+                - Required permits and certifications
+                - Safety protocols and procedures""",
+        'schema': """{
+                "required_permits": [string],
+                "safety_protocols": [string]
+            }"""
+    }
+}
+
+# Value used for a section that could not be generated
+SECTION_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    'milestones': list,
+    'resources': lambda: {'personnel': [], 'equipment': []},
+    'risk_assessment': lambda: {'high_risks': []},
+    'cost_breakdown': list,
+    'safety_plan': lambda: {'required_permits': [], 'safety_protocols': []}
+}
+
+
+# plan_details fields that shape the generated plan; anything else
+# (client-side ids, UI state) does not change what the model is asked
+GENERATION_INPUT_FIELDS = ('title', 'plantType', 'duration', 'budget', 'scope', 'constraints')
+
+
+def _normalize_input(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip()
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        # 30, 30.0 and Decimal('30') hash alike
+        return int(value) if float(value).is_integer() else float(value)
+    try:
+        return _normalize_input(float(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def generation_fingerprint(plan_details: Dict[str, Any], *context: str) -> str:
+    """Canonical hash of the generation inputs.
+
+    Whitespace runs collapse, plantType is case-folded and numbers compare
+    by value, so trivially different submissions of the same plan share a
+    fingerprint. context (model id, generation mode) is hashed in as well.
+    """
+    inputs = {
+        field: _normalize_input(plan_details.get(field))
+        for field in GENERATION_INPUT_FIELDS if plan_details.get(field) not in (None, '')
+    }
+    if isinstance(inputs.get('plantType'), str):
+        inputs['plantType'] = inputs['plantType'].lower()
+    canonical = json.dumps([inputs, list(context)], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SectionError(ValueError):
+    """A section response was missing, not JSON, or the wrong shape"""
+
+
+def extract_json(content: str) -> Any:
+    """Parse the outermost JSON object or array in a model response"""
+    starts = [i for i in (content.find('{'), content.find('[')) if i != -1]
+    if not starts:
+        raise SectionError('No JSON in response')
+    start = min(starts)
+    end = content.rfind('}' if content[start] == '{' else ']') + 1
+    try:
+        return json.loads(content[start:end])
+    except json.JSONDecodeError as e:
+        raise SectionError(f'Invalid JSON: {e}')
+
+
+def _number(value: Any, field: str) -> float:
+    if isinstance(value, bool):
+        raise SectionError(f'{field} must be a number')
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(',', '').replace('$', '').strip())
+    except ValueError:
+        raise SectionError(f'{field} must be a number')
+
+
+def _records(value: Any, field: str, required: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    if not isinstance(value, list):
+        raise SectionError(f'{field} must be a list')
+    records = []
+    for record in value:
+        if not isinstance(record, dict) or any(not record.get(key) for key in required):
+            raise SectionError(f'{field} entries need {", ".join(required)}')
+        records.append(record)
+    return records
+
+
+def _strings(value: Any, field: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise SectionError(f'{field} must be a list of strings')
+    return value
+
+
+def validate_section(name: str, value: Any) -> Any:
+    """Check a section against its schema, coercing numeric strings; raises SectionError"""
+    if name == 'milestones':
+        milestones = _records(value, 'milestones', ('title',))
+        if not milestones:
+            raise SectionError('milestones is empty')
+        for milestone in milestones:
+            milestone['duration'] = _number(milestone.get('duration'), 'milestone duration')
+            milestone['deliverables'] = _strings(milestone.get('deliverables', []), 'deliverables')
+            milestone['dependencies'] = _strings(milestone.get('dependencies', []), 'dependencies')
+        return milestones
+    if name == 'resources':
+        if not isinstance(value, dict):
+            raise SectionError('resources must be an object')
+        personnel = _records(value.get('personnel', []), 'personnel', ('role',))
+        for person in personnel:
+            person['count'] = _number(person.get('count', 0), 'personnel count')
+        equipment = _records(value.get('equipment', []), 'equipment', ('type',))
+        for item in equipment:
+            item['quantity'] = _number(item.get('quantity', 0), 'equipment quantity')
+        return {'personnel': personnel, 'equipment': equipment}
+    if name == 'risk_assessment':
+        if not isinstance(value, dict):
+            raise SectionError('risk_assessment must be an object')
+        return {'high_risks': _records(value.get('high_risks', []), 'high_risks', ('title',))}
+    if name == 'cost_breakdown':
+        costs = _records(value, 'cost_breakdown', ('category',))
+        for cost in costs:
+            cost['amount'] = _number(cost.get('amount'), 'cost amount')
+        return costs
+    if name == 'safety_plan':
+        if not isinstance(value, dict):
+            raise SectionError('safety_plan must be an object')
+        return {
+            'required_permits': _strings(value.get('required_permits', []), 'required_permits'),
+            'safety_protocols': _strings(value.get('safety_protocols', []), 'safety_protocols')
+        }
+    raise SectionError(f'Unknown section: {name}')
+
+
+def cross_validate(plan: Dict[str, Any], plan_details: Dict[str, Any]) -> List[str]:
+    """Repair inconsistencies between independently generated sections.
+
+    Milestone dependencies that name no milestone (or the milestone itself)
+    are dropped, names are matched case-insensitively and rewritten to the
+    exact title, and dependencies closing a cycle are removed so the
+    milestones form a DAG. Returns a warning per repair, plus one when the
+    cost breakdown exceeds the budget.
+    """
+    warnings: List[str] = []
+    milestones = plan.get('milestones') or []
+    titles = {milestone['title'].strip().lower(): milestone['title'] for milestone in milestones}
+
+    for milestone in milestones:
+        resolved = []
+        for dependency in milestone.get('dependencies', []):
+            title = titles.get(dependency.strip().lower())
+            if title is None or title == milestone['title']:
+                warnings.append(f"Dropped dependency '{dependency}' of milestone '{milestone['title']}'")
+            elif title not in resolved:
+                resolved.append(title)
+        milestone['dependencies'] = resolved
+
+    # Depth-first search; an edge to a milestone still on the stack closes a cycle
+    by_title = {milestone['title']: milestone for milestone in milestones}
+    state: Dict[str, int] = {}
+
+    def visit(title: str) -> None:
+        state[title] = 1
+        milestone = by_title[title]
+        for dependency in list(milestone['dependencies']):
+            if state.get(dependency) == 1:
+                milestone['dependencies'].remove(dependency)
+                warnings.append(f"Removed dependency '{dependency}' of milestone '{title}' to break a cycle")
+            elif dependency not in state:
+                visit(dependency)
+        state[title] = 2
+
+    for title in by_title:
+        if title not in state:
+            visit(title)
+
+    budget = plan_details.get('budget')
+    total = sum(cost.get('amount', 0) for cost in plan.get('cost_breakdown') or [])
+    if isinstance(budget, (int, float)) and budget and total > budget * 1.1:
+        warnings.append(f"Cost breakdown totals {total:,.0f}, more than the {budget:,.0f} budget")
+    return warnings
+
+
+class SectionedPlanGenerator:
+    """Generates a plan as concurrent per-section LLM calls.
+
+    Each section of PLAN_SECTIONS gets its own short prompt and is parsed
+    and validated on its own; a malformed section is retried alone rather
+    than discarding the whole plan. Wall-clock time is about that of the
+    slowest section. The LLM gateway still bounds how many of these calls
+    run at once across all requests.
+    """
+
+    def __init__(self, llm, max_attempts: int = PLAN_SECTION_MAX_ATTEMPTS):
+        self.llm = llm
+        self.max_attempts = max_attempts
+
+    def build_prompt(self, section: str, plan_details: Dict[str, Any]) -> str:
+        spec = PLAN_SECTIONS[section]
+        return f"""Given the following turnaround project details:
+
+                Title: {plan_details['title']}
+                Plant Type: {plan_details['plantType']}
+                Duration: {plan_details['duration']} days
+                Budget: ${plan_details['budget']:,}
+                Scope: {plan_details['scope']}
+                Constraints: {plan_details.get('constraints', 'None specified')}
+
+                Generate this part of a structured turnaround plan:
+
+                {spec['instructions']}
+
+                Respond with only a JSON object of this form:
+                {{"{section}": {spec['schema']}}}"""
+
+    def generate_section(self, section: str, plan_details: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """Value for one section and None, or its default and the last error"""
+        prompt = self.build_prompt(section, plan_details)
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self.llm.invoke(prompt)
+                content = response.content if hasattr(response, 'content') else str(response)
+                with stage('plan.parse'):
+                    parsed = extract_json(content)
+                if isinstance(parsed, dict) and section in parsed:
+                    parsed = parsed[section]
+                return validate_section(section, parsed), None
+            except SectionError as e:
+                error = str(e)
+                logger.error(f"Section {section} attempt {attempt} invalid: {error}")
+            except Exception as e:
+                # Gateway errors (circuit open, retries exhausted) will not clear up immediately
+                error = str(e)
+                logger.error(f"Section {section} generation failed: {error}")
+                break
+        return SECTION_DEFAULTS[section](), error
+
+    def iter_sections(self, plan_details: Dict[str, Any]) -> Iterator[Tuple[str, Any, Optional[str]]]:
+        """(section, value, error) for each section in the order they finish"""
+        with ThreadPoolExecutor(max_workers=len(PLAN_SECTIONS), thread_name_prefix='plan-section') as pool:
+            # Each call runs in a copy of this context so its stage timings
+            # reach the request (or job) that asked for the plan
+            futures = {
+                pool.submit(copy_context().run, self.generate_section, section, plan_details): section
+                for section in PLAN_SECTIONS
+            }
+            for future in as_completed(futures):
+                value, error = future.result()
+                yield futures[future], value, error
+
+    def merge(self, results: Dict[str, Tuple[Any, Optional[str]]],
+              plan_details: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Assemble finished sections into (plan, warnings), cross-validating them"""
+        if all(error for _, error in results.values()):
+            raise RuntimeError(f"No plan section could be generated: {results['milestones'][1]}")
+        plan = {section: results[section][0] for section in PLAN_SECTIONS}
+        warnings = [
+            f"Section {section} could not be generated: {results[section][1]}"
+            for section in PLAN_SECTIONS if results[section][1]
+        ]
+        warnings.extend(cross_validate(plan, plan_details))
+        return plan, warnings
+
+    def generate(self, plan_details: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """All sections, merged and cross-validated; returns (plan, warnings)"""
+        started = time.perf_counter()
+        results = {section: (value, error) for section, value, error in self.iter_sections(plan_details)}
+        plan, warnings = self.merge(results, plan_details)
+        logger.info(f"Generated {len(plan)} plan sections in {time.perf_counter() - started:.2f}s")
+        return plan, warnings
@@ -0,0 +1,343 @@
+# api/services/schedulingservice.py
+
+import heapq
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from infrastructure.config import SCHEDULE_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+# Slack below this counts as zero (durations may be fractional days)
+FLOAT_TOLERANCE = 1e-9
+
+
+class ScheduleError(ValueError):
+    """The milestones cannot be scheduled (their dependencies form a cycle)"""
+
+
+def plan_milestones(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Milestones of a saved plan: details.milestones, else the generated plan's"""
+    details = plan.get('details') or {}
+    milestones = details.get('milestones')
+    if milestones is None:
+        milestones = (details.get('generated_plan') or {}).get('milestones')
+    return milestones if isinstance(milestones, list) else []
+
+
+class MilestoneSchedule:
+    """Critical path method over a plan's milestone DAG.
+
+    Milestones become integer nodes with predecessor/successor lists and a
+    topological order, built once in O(V + E). Each node keeps its earliest
+    start (longest path from the project start) and its tail (longest path
+    from its own start to the project end); latest start and total float
+    follow from those and the project duration.
+
+    set_duration() recomputes incrementally: earliest starts are pushed
+    forward through the changed milestone's descendants and tails back
+    through its ancestors, in topological order, stopping wherever a value
+    does not change. A what-if on one work package of a large imported
+    schedule touches only the part of the graph it actually moves.
+
+    Dependencies on unknown milestones, self-dependencies, duplicate titles
+    and unusable durations are reported in issues and ignored; a cycle
+    raises ScheduleError, since no schedule exists.
+    """
+
+    def __init__(self, milestones: List[Dict[str, Any]]):
+        self.issues: List[str] = []
+        self.titles: List[str] = []
+        self.durations: List[float] = []
+        self.index: Dict[str, int] = {}
+        folded: Dict[str, int] = {}
+
+        for milestone in milestones:
+            title = str(milestone.get('title') or f"Milestone {len(self.titles) + 1}")
+            if title in self.index:
+                self.issues.append(f"Duplicate milestone title '{title}'; dependencies resolve to the first")
+            else:
+                self.index[title] = len(self.titles)
+                folded.setdefault(title.strip().lower(), len(self.titles))
+            self.titles.append(title)
+            self.durations.append(self._duration(milestone.get('duration'), title))
+
+        n = len(self.titles)
+        self.predecessors: List[List[int]] = [[] for _ in range(n)]
+        self.successors: List[List[int]] = [[] for _ in range(n)]
+        for node, milestone in enumerate(milestones):
+            for dependency in milestone.get('dependencies') or []:
+                dependency = str(dependency)
+                source = self.index.get(dependency, folded.get(dependency.strip().lower()))
+                if source is None:
+                    self.issues.append(f"Milestone '{self.titles[node]}' depends on unknown milestone '{dependency}'")
+                elif source == node:
+                    self.issues.append(f"Milestone '{self.titles[node]}' depends on itself")
+                elif source not in self.predecessors[node]:
+                    self.predecessors[node].append(source)
+                    self.successors[source].append(node)
+
+        self.order = self._topological_order()
+        self.rank = [0] * n
+        for position, node in enumerate(self.order):
+            self.rank[node] = position
+        self.sources = [node for node in range(n) if not self.predecessors[node]]
+        self.earliest_start = [0.0] * n
+        self.tail = [0.0] * n
+        self._compute()
+
+    def _duration(self, value: Any, title: str) -> float:
+        try:
+            duration = float(value)
+        except (TypeError, ValueError):
+            duration = -1.0
+        if duration < 0 or duration != duration:
+            self.issues.append(f"Milestone '{title}' has no usable duration; using 0")
+            return 0.0
+        return duration
+
+    def _topological_order(self) -> List[int]:
+        """Kahn's algorithm; raises ScheduleError naming one cycle if there is any"""
+        indegree = [len(predecessors) for predecessors in self.predecessors]
+        ready = deque(node for node, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for successor in self.successors[node]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    ready.append(successor)
+        if len(order) < len(self.titles):
+            raise ScheduleError(f"Milestone dependencies form a cycle: {' -> '.join(self._cycle(indegree))}")
+        return order
+
+    def _cycle(self, indegree: List[int]) -> List[str]:
+        # Every node left with indegree > 0 has a predecessor that is also left,
+        # so walking predecessors from one of them must revisit a node
+        node = next(node for node, degree in enumerate(indegree) if degree > 0)
+        path: List[int] = []
+        seen: Dict[int, int] = {}
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(p for p in self.predecessors[node] if indegree[p] > 0)
+        cycle = path[seen[node]:] + [node]
+        return [self.titles[n] for n in reversed(cycle)]
+
+    def _compute(self) -> None:
+        """Full forward and backward pass"""
+        durations, earliest_start, tail = self.durations, self.earliest_start, self.tail
+        for node in self.order:
+            earliest_start[node] = max(
+                (earliest_start[p] + durations[p] for p in self.predecessors[node]), default=0.0
+            )
+        for node in reversed(self.order):
+            tail[node] = durations[node] + max((tail[s] for s in self.successors[node]), default=0.0)
+
+    @property
+    def project_duration(self) -> float:
+        return max((self.tail[node] for node in self.sources), default=0.0)
+
+    def set_duration(self, node: int, duration: float) -> Set[int]:
+        """Change one milestone's duration; returns the nodes whose timings moved"""
+        if duration < 0:
+            raise ValueError("duration must not be negative")
+        if duration == self.durations[node]:
+            return set()
+        self.durations[node] = duration
+        changed = {node}
+        durations, earliest_start, tail = self.durations, self.earliest_start, self.tail
+
+        # Forward: the milestone's finish moved, so its successors may start later or earlier.
+        # Nodes are settled in topological order, each queued at most once.
+        heap = [(self.rank[s], s) for s in self.successors[node]]
+        heapq.heapify(heap)
+        queued = set(self.successors[node])
+        while heap:
+            _, current = heapq.heappop(heap)
+            start = max(earliest_start[p] + durations[p] for p in self.predecessors[current])
+            if start != earliest_start[current]:
+                earliest_start[current] = start
+                changed.add(current)
+                for successor in self.successors[current]:
+                    if successor not in queued:
+                        queued.add(successor)
+                        heapq.heappush(heap, (self.rank[successor], successor))
+
+        # Backward: the milestone's own tail changed, and maybe its ancestors'
+        heap = [(-self.rank[node], node)]
+        queued = {node}
+        while heap:
+            _, current = heapq.heappop(heap)
+            new_tail = durations[current] + max((tail[s] for s in self.successors[current]), default=0.0)
+            if new_tail != tail[current] or current == node:
+                tail[current] = new_tail
+                changed.add(current)
+                for predecessor in self.predecessors[current]:
+                    if predecessor not in queued:
+                        queued.add(predecessor)
+                        heapq.heappush(heap, (-self.rank[predecessor], predecessor))
+        return changed
+
+    def critical_path(self) -> List[str]:
+        """One chain of zero-float milestones from the project start to its end"""
+        project = self.project_duration
+        durations, earliest_start, tail = self.durations, self.earliest_start, self.tail
+        node = next((n for n in self.order if not self.predecessors[n]
+                     and abs(tail[n] - project) <= FLOAT_TOLERANCE), None)
+        path = []
+        while node is not None:
+            path.append(self.titles[node])
+            finish = earliest_start[node] + durations[node]
+            remaining = tail[node] - durations[node]
+            node = next((s for s in self.successors[node]
+                         if abs(earliest_start[s] - finish) <= FLOAT_TOLERANCE
+                         and abs(tail[s] - remaining) <= FLOAT_TOLERANCE), None)
+        return path
+
+    def milestone(self, node: int, project: Optional[float] = None) -> Dict[str, Any]:
+        project = self.project_duration if project is None else project
+        start = self.earliest_start[node]
+        latest_start = project - self.tail[node]
+        slack = max(0.0, latest_start - start)
+        return {
+            'title': self.titles[node],
+            'duration': self.durations[node],
+            'earliestStart': start,
+            'earliestFinish': start + self.durations[node],
+            'latestStart': latest_start,
+            'latestFinish': latest_start + self.durations[node],
+            'totalFloat': slack,
+            'critical': slack <= FLOAT_TOLERANCE,
+            'dependencies': [self.titles[p] for p in self.predecessors[node]]
+        }
+
+    def milestones(self, nodes: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Timings for nodes (default all), in plan order"""
+        project = self.project_duration
+        nodes = range(len(self.titles)) if nodes is None else sorted(nodes)
+        return [self.milestone(node, project) for node in nodes]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'projectDuration': self.project_duration,
+            'criticalPath': self.critical_path(),
+            'milestones': self.milestones(),
+            'issues': list(self.issues)
+        }
+
+
+class SchedulingService:
+    """Schedules for saved plans, kept built per plan version.
+
+    The schedule cache is keyed by plan id and ETag, so a PATCH to the plan
+    yields a fresh schedule while repeated /schedule and what-if calls on
+    an unchanged plan reuse the graph. Plans are read through the plan
+    service's response cache.
+    """
+
+    def __init__(self, plan_service, max_entries: int = SCHEDULE_CACHE_MAX_ENTRIES):
+        self.plan_service = plan_service
+        self.max_entries = max_entries
+        # plan id -> (etag, schedule, lock guarding what-if edits, plan context)
+        self._schedules: 'OrderedDict[str, Tuple[str, MilestoneSchedule, threading.Lock, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _schedule(self, plan_id: str) -> Optional[Tuple[MilestoneSchedule, threading.Lock, Dict[str, Any]]]:
+        cached_plan = self.plan_service.get_plan_response(plan_id)
+        if cached_plan is None:
+            return None
+        with self._lock:
+            entry = self._schedules.get(plan_id)
+            if entry and entry[0] == cached_plan.etag:
+                self._schedules.move_to_end(plan_id)
+                return entry[1], entry[2], entry[3]
+
+        plan = json.loads(cached_plan.body)
+        schedule = MilestoneSchedule(plan_milestones(plan))
+        context = {'plannedDuration': (plan.get('details') or {}).get('duration')}
+        lock = threading.Lock()
+        with self._lock:
+            self._schedules[plan_id] = (cached_plan.etag, schedule, lock, context)
+            self._schedules.move_to_end(plan_id)
+            while len(self._schedules) > self.max_entries:
+                self._schedules.popitem(last=False)
+        return schedule, lock, context
+
+    def get_schedule(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Full schedule of a plan, or None if the plan does not exist"""
+        found = self._schedule(plan_id)
+        if found is None:
+            return None
+        schedule, lock, context = found
+        with lock:
+            result = schedule.to_dict()
+        result['plannedDuration'] = context['plannedDuration']
+        return result
+
+    def what_if(self, plan_id: str, changes: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Project duration and critical path with some durations changed.
+
+        changes is a list of {"milestone": title, "duration": days}. They
+        are applied incrementally and reverted afterwards, so the cached
+        schedule still describes the saved plan. changedMilestones lists
+        the recomputed milestones whose duration, earliest start or latest
+        start differ from the baseline. Milestones outside the recomputed
+        region keep their earliest start; their latest start and float
+        shift by delta.
+        """
+        found = self._schedule(plan_id)
+        if found is None:
+            return None
+        schedule, lock, _ = found
+
+        parsed = []
+        if not isinstance(changes, list) or not changes:
+            raise ValueError("changes must be a non-empty list")
+        for change in changes:
+            if not isinstance(change, dict):
+                raise ValueError("Each change must be an object with milestone and duration")
+            title = change.get('milestone')
+            node = schedule.index.get(title) if isinstance(title, str) else None
+            if node is None:
+                raise ValueError(f"Unknown milestone: {title}")
+            duration = change.get('duration')
+            if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+                raise ValueError("duration must be a non-negative number")
+            parsed.append((node, float(duration)))
+
+        with lock:
+            baseline = schedule.project_duration
+            baseline_path = schedule.critical_path()
+            originals = []
+            moved: Set[int] = set()
+            try:
+                for node, duration in parsed:
+                    originals.append((node, schedule.durations[node]))
+                    moved |= schedule.set_duration(node, duration)
+                project = schedule.project_duration
+                delta = project - baseline
+                critical_path = schedule.critical_path()
+                after = schedule.milestones(moved)
+            finally:
+                for node, duration in reversed(originals):
+                    schedule.set_duration(node, duration)
+            before = schedule.milestones(moved)
+
+        changed = [
+            timing for timing, old in zip(after, before)
+            if timing['duration'] != old['duration'] or timing['earliestStart'] != old['earliestStart']
+            or abs(timing['latestStart'] - old['latestStart']) > FLOAT_TOLERANCE
+        ]
+        return {
+            'baselineDuration': baseline,
+            'projectDuration': project,
+            'delta': delta,
+            'baselineCriticalPath': baseline_path,
+            'criticalPath': critical_path,
+            'changedMilestones': changed
+        }
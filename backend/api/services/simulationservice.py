@@ -0,0 +1,354 @@
+# api/services/simulationservice.py
+
+import json
+import logging
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.services.schedulingservice import MilestoneSchedule, ScheduleError, plan_milestones
+from infrastructure.config import (
+    SIMULATION_DEFAULT_ITERATIONS, SIMULATION_MAX_ITERATIONS, SIMULATION_BATCH_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+# (optimistic, most likely, pessimistic) as multiples of the planned value
+DURATION_FACTORS = (0.85, 1.0, 1.35)
+COST_FACTORS = (0.95, 1.0, 1.25)
+# Extra pessimistic spread for a milestone named by a high risk, and for
+# every milestone per high risk that names none (capped)
+RISK_WIDENING = 0.25
+UNASSIGNED_RISK_WIDENING = 0.05
+MAX_UNASSIGNED_RISK_WIDENING = 0.25
+
+DISTRIBUTIONS = ('pert', 'triangular')
+PERCENTILES = (50, 80, 90)
+# Resolution of the tabulated quantile functions samples are drawn from
+QUANTILE_POINTS = 4096
+MIN_ITERATIONS = 100
+# Samples are float32; path sums that agree to this relative error tie
+CRITICAL_TOLERANCE = 1e-5
+
+
+def quantile_tables(shapes: np.ndarray, distribution: str) -> np.ndarray:
+    """Standardized quantile functions on [0, 1], one row per mode position.
+
+    A triangular or PERT distribution with bounds (low, high) and mode m is
+    low + (high - low) * X, where X depends only on r = (m - low) / (high - low).
+    Each row holds X's quantiles at QUANTILE_POINTS evenly spaced
+    probabilities, so sampling is an integer draw and a gather rather than
+    numpy's much slower beta sampler.
+    """
+    u = (np.arange(QUANTILE_POINTS) + 0.5) / QUANTILE_POINTS
+    r = shapes[:, None]
+    if distribution == 'triangular':
+        return np.where(u < r, np.sqrt(u * r), 1 - np.sqrt((1 - u) * (1 - r)))
+
+    # PERT is Beta(1 + 4r, 1 + 4(1 - r)); integrate its density and invert the CDF
+    x = np.linspace(0.0, 1.0, 2049)
+    mid = (x[1:] + x[:-1]) / 2
+    log_pdf = 4 * r * np.log(mid) + 4 * (1 - r) * np.log1p(-mid)
+    pdf = np.exp(log_pdf - log_pdf.max(axis=1, keepdims=True))
+    cdf = np.concatenate([np.zeros((len(shapes), 1)), np.cumsum(pdf, axis=1)], axis=1)
+    cdf /= cdf[:, -1:]
+    return np.array([np.interp(u, row, x) for row in cdf]).reshape(len(shapes), QUANTILE_POINTS)
+
+
+class MonteCarloSimulator:
+    """Samples activity durations and cost categories and propagates them
+    through the milestone DAG, a batch of iterations at a time.
+
+    Each batch is an (activities x iterations) float32 array: the forward pass
+    takes, per activity in topological order, the element-wise max of its
+    predecessors' finishes, and a backward pass of the same shape gives the
+    longest remaining path from each activity. An activity is critical in
+    an iteration when its start plus that remaining path equals the
+    project duration. Project overrun beyond the deterministic schedule
+    adds delay_cost_per_day to that iteration's cost.
+    """
+
+    def __init__(self, schedule: MilestoneSchedule, durations: np.ndarray, costs: np.ndarray,
+                 distribution: str = 'pert', delay_cost_per_day: float = 0.0):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+        self.schedule = schedule
+        self.distribution = distribution
+        self.delay_cost_per_day = delay_cost_per_day
+        self.order = schedule.order
+        self.sinks = np.array([n for n in range(len(schedule.titles)) if not schedule.successors[n]], dtype=np.intp)
+        self.duration_low, self.duration_width, self.duration_groups = self._prepare(durations)
+        self.cost_low, self.cost_width, self.cost_groups = self._prepare(costs)
+
+    def _prepare(self, ranges: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[Tuple[np.ndarray, Any]]]:
+        """(low, width, [(quantile table, rows)]) for an (n x 3) low/mode/high array"""
+        ranges = np.asarray(ranges, dtype=float).reshape(-1, 3)
+        low, mode, high = ranges[:, 0], ranges[:, 1], ranges[:, 2]
+        width = high - low
+        shapes = np.divide(mode - low, width, out=np.full(len(low), 0.5), where=width > 0)
+        # Activities derived from the plan mostly share a shape, so there are
+        # few tables, each small enough to stay in cache while gathering
+        unique, inverse = np.unique(np.round(shapes, 4), return_inverse=True)
+        tables = quantile_tables(unique, self.distribution).astype(np.float32)
+        # No rows (a plan without costs) leaves no groups and an empty sample array
+        groups = [(tables[0], slice(None))] if len(unique) == 1 else [
+            (table, np.flatnonzero(inverse == k)) for k, table in enumerate(tables)
+        ]
+        return low.astype(np.float32)[:, None], width.astype(np.float32)[:, None], groups
+
+    @staticmethod
+    def _sample(rng: np.random.Generator, low: np.ndarray, width: np.ndarray,
+                groups: List[Tuple[np.ndarray, Any]], size: int) -> np.ndarray:
+        indexes = rng.integers(0, QUANTILE_POINTS, size=(len(low), size), dtype=np.int16)
+        if len(groups) == 1:
+            samples = groups[0][0].take(indexes)
+        else:
+            samples = np.empty((len(low), size), dtype=np.float32)
+            for table, rows in groups:
+                samples[rows] = table.take(indexes[rows])
+        samples *= width
+        samples += low
+        return samples
+
+    @staticmethod
+    def _longest(paths: np.ndarray, durations: np.ndarray, order, neighbours) -> None:
+        """paths[node] = durations[node] + max(paths[neighbour]), visiting nodes in order"""
+        for node in order:
+            linked = neighbours[node]
+            out = paths[node]
+            if not linked:
+                out[:] = durations[node]
+                continue
+            if len(linked) == 1:
+                np.add(paths[linked[0]], durations[node], out=out)
+                continue
+            np.maximum(paths[linked[0]], paths[linked[1]], out=out)
+            for other in linked[2:]:
+                np.maximum(out, paths[other], out=out)
+            out += durations[node]
+
+    def _propagate(self, durations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Project duration per iteration and per-activity critical counts"""
+        finish = np.empty_like(durations)
+        self._longest(finish, durations, self.order, self.schedule.predecessors)
+        project = finish[self.sinks].max(axis=0)
+
+        # Longest path from each activity's start to the project end
+        tail = np.empty_like(durations)
+        self._longest(tail, durations, self.order[::-1], self.schedule.successors)
+
+        # start + tail = finish - duration + tail; equal to project on a critical path
+        finish -= durations
+        finish += tail
+        critical = finish >= project * (1 - CRITICAL_TOLERANCE)
+        return project, critical.sum(axis=1)
+
+    def run(self, iterations: int, seed: Optional[int] = None,
+            batch_size: int = SIMULATION_BATCH_SIZE) -> Dict[str, Any]:
+        rng = np.random.default_rng(seed)
+        n = len(self.order)
+        durations_out = np.empty(iterations)
+        costs_out = np.empty(iterations)
+        critical_counts = np.zeros(n, dtype=np.int64)
+        deterministic = self.schedule.project_duration
+
+        for start in range(0, iterations, batch_size):
+            size = min(batch_size, iterations - start)
+            durations = self._sample(rng, self.duration_low, self.duration_width, self.duration_groups, size)
+            project, critical = self._propagate(durations)
+            critical_counts += critical
+
+            cost = self._sample(rng, self.cost_low, self.cost_width, self.cost_groups, size).sum(axis=0, dtype=np.float64)
+            if self.delay_cost_per_day:
+                cost += np.maximum(project - deterministic, 0) * self.delay_cost_per_day
+            durations_out[start:start + size] = project
+            costs_out[start:start + size] = cost
+
+        return {
+            'durations': durations_out,
+            'costs': costs_out,
+            'criticality': critical_counts / iterations
+        }
+
+
+def _risk_text(risk: Dict[str, Any]) -> str:
+    return ' '.join(str(risk.get(field, '')) for field in ('title', 'description', 'mitigation')).lower()
+
+
+def _factors(value: Any, default: Tuple[float, float, float], field: str) -> Tuple[float, float, float]:
+    if value is None:
+        return default
+    if (not isinstance(value, list) or len(value) != 3
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{field} must be [low, mode, high]")
+    low, mode, high = (float(v) for v in value)
+    if not 0 <= low <= mode <= high:
+        raise ValueError(f"{field} must satisfy 0 <= low <= mode <= high")
+    return low, mode, high
+
+
+def _range(value: Any, field: str) -> Tuple[float, float, float]:
+    if not isinstance(value, dict):
+        raise ValueError(f"{field} must be an object with low, mode and high")
+    return _factors([value.get('low'), value.get('mode'), value.get('high')], None, field)
+
+
+def derive_parameters(plan: Dict[str, Any], schedule: MilestoneSchedule,
+                      options: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """(duration ranges, cost ranges, cost category names) for a plan.
+
+    Planned durations and amounts are the most likely values, spread by
+    DURATION_FACTORS / COST_FACTORS (or the durationFactors / costFactors
+    options). A high risk that mentions a milestone by title widens that
+    milestone's pessimistic bound by RISK_WIDENING; risks naming no
+    milestone widen every milestone a little. Per-milestone and
+    per-category {low, mode, high} options replace the derived ranges.
+    """
+    details = plan.get('details') or {}
+    duration_factors = _factors(options.get('durationFactors'), DURATION_FACTORS, 'durationFactors')
+    cost_factors = _factors(options.get('costFactors'), COST_FACTORS, 'costFactors')
+
+    risks = (details.get('risk_assessment') or {}).get('high_risks') or []
+    risk_texts = [_risk_text(risk) for risk in risks if isinstance(risk, dict)]
+    lowered = [title.lower() for title in schedule.titles]
+    named = [sum(1 for text in risk_texts if title in text) for title in lowered]
+    unassigned = sum(1 for text in risk_texts if not any(title in text for title in lowered))
+    global_widening = min(unassigned * UNASSIGNED_RISK_WIDENING, MAX_UNASSIGNED_RISK_WIDENING)
+
+    low, mode, high = duration_factors
+    durations = np.array([
+        [d * low, d * mode, d * (high + global_widening + RISK_WIDENING * risks_named)]
+        for d, risks_named in zip(schedule.durations, named)
+    ]).reshape(-1, 3)
+    overrides = options.get('milestones') or {}
+    if not isinstance(overrides, dict):
+        raise ValueError("milestones must be an object keyed by milestone title")
+    for title, value in overrides.items():
+        if title not in schedule.index:
+            raise ValueError(f"Unknown milestone: {title}")
+        durations[schedule.index[title]] = _range(value, f"milestones.{title}")
+
+    categories, costs = [], []
+    for cost in details.get('cost_breakdown') or []:
+        try:
+            amount = float(cost.get('amount'))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        categories.append(str(cost.get('category') or f"Cost {len(categories) + 1}"))
+        costs.append([amount * cost_factors[0], amount * cost_factors[1], amount * cost_factors[2]])
+    costs = np.array(costs, dtype=float).reshape(-1, 3)
+    cost_overrides = options.get('costs') or {}
+    if not isinstance(cost_overrides, dict):
+        raise ValueError("costs must be an object keyed by cost category")
+    for category, value in cost_overrides.items():
+        if category not in categories:
+            raise ValueError(f"Unknown cost category: {category}")
+        costs[categories.index(category)] = _range(value, f"costs.{category}")
+    return durations, costs, categories
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    return {f'p{p}': float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SimulationService:
+    """Monte Carlo schedule and cost risk for saved plans"""
+
+    def __init__(self, plan_service):
+        self.plan_service = plan_service
+
+    def simulate(self, plan_id: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Simulate a plan; None if it does not exist.
+
+        options: iterations, seed, distribution (pert | triangular),
+        startDate (ISO date, adds completion dates), delayCostPerDay, and
+        the overrides derive_parameters accepts.
+        """
+        iterations = options.get('iterations', SIMULATION_DEFAULT_ITERATIONS)
+        if isinstance(iterations, bool) or not isinstance(iterations, int) \
+                or not MIN_ITERATIONS <= iterations <= SIMULATION_MAX_ITERATIONS:
+            raise ValueError(f"iterations must be between {MIN_ITERATIONS} and {SIMULATION_MAX_ITERATIONS}")
+        seed = options.get('seed')
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+            raise ValueError("seed must be a non-negative integer")
+        start_date = None
+        if options.get('startDate') is not None:
+            try:
+                start_date = date.fromisoformat(str(options['startDate']))
+            except ValueError:
+                raise ValueError("startDate must be an ISO date (YYYY-MM-DD)")
+
+        cached = self.plan_service.get_plan_response(plan_id)
+        if cached is None:
+            return None
+        plan = json.loads(cached.body)
+        milestones = plan_milestones(plan)
+        if not milestones:
+            raise ScheduleError("Plan has no milestones to simulate")
+        schedule = MilestoneSchedule(milestones)
+        durations, costs, categories = derive_parameters(plan, schedule, options)
+
+        deterministic_cost = float(costs[:, 1].sum())
+        delay_cost = options.get('delayCostPerDay')
+        if delay_cost is None:
+            # Overrun days cost the plan's average daily burn
+            delay_cost = deterministic_cost / schedule.project_duration if schedule.project_duration else 0.0
+        elif isinstance(delay_cost, bool) or not isinstance(delay_cost, (int, float)) or delay_cost < 0:
+            raise ValueError("delayCostPerDay must be a non-negative number")
+
+        started = time.perf_counter()
+        simulator = MonteCarloSimulator(
+            schedule, durations, costs,
+            distribution=options.get('distribution', 'pert'),
+            delay_cost_per_day=float(delay_cost)
+        )
+        run = simulator.run(iterations, seed=seed)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Simulated {iterations} iterations of {len(schedule.titles)} milestones in {elapsed:.3f}s")
+
+        details = plan.get('details') or {}
+        planned_duration = _number(details.get('duration'))
+        budget = _number(details.get('budget'))
+        result = {
+            'iterations': iterations,
+            'distribution': simulator.distribution,
+            'duration': {
+                'deterministic': schedule.project_duration,
+                'mean': float(run['durations'].mean()),
+                **_percentiles(run['durations']),
+                'planned': planned_duration,
+                'probabilityWithinPlanned': (
+                    float((run['durations'] <= planned_duration).mean()) if planned_duration else None
+                )
+            },
+            'cost': {
+                'deterministic': deterministic_cost,
+                'mean': float(run['costs'].mean()),
+                **_percentiles(run['costs']),
+                'budget': budget,
+                'probabilityWithinBudget': float((run['costs'] <= budget).mean()) if budget else None,
+                'categories': categories
+            },
+            'criticality': sorted(
+                ({'title': title, 'index': float(index)}
+                 for title, index in zip(schedule.titles, run['criticality'])),
+                key=lambda entry: entry['index'], reverse=True
+            ),
+            'issues': schedule.issues,
+            'elapsedSeconds': round(elapsed, 4)
+        }
+        if start_date:
+            result['completionDate'] = {
+                key: (start_date + timedelta(days=float(np.ceil(value)))).isoformat()
+                for key, value in _percentiles(run['durations']).items()
+            }
+        return result
@@ -1,47 +1,85 @@
 ## api/services/turnaroundplanservice.py
 
 # Import Precision Turnaround Plan Service
-from infrastructure.db.repositories.plan_repository import PlanRepository
+from infrastructure.db.repositories.plan_repository import PlanRepository, PlanConditionError
 from infrastructure.db.models.plan import PlanModel
-
-# Import AWS Bedrock client and AIMessage from langchain
-from langchain_aws import ChatBedrockConverse
-from langchain_core.messages import AIMessage
+from infrastructure.cache import CachedPlan, PlanCache, create_cache_backend
+from infrastructure.data import get_benchmark_index
+from infrastructure.metrics import stage
+from infrastructure.utils import FieldTree, SingleFlight, StreamingJSONObjectParser, select_fields
+from infrastructure.utils.json_helper import float_to_decimal
+from infrastructure.config import (
+    PLAN_CACHE_URL, PLAN_CACHE_TTL_SECONDS, PLAN_CACHE_MAX_ENTRIES, PLAN_CACHE_MAX_VARIANTS, PLAN_GENERATION_MODE,
+    PLAN_GENERATION_CACHE_URL, PLAN_GENERATION_CACHE_TTL_SECONDS, PLAN_GENERATION_CACHE_MAX_ENTRIES,
+    PORTFOLIO_MAX_PLANS
+)
+from api.services.plangeneration import (
+    PLAN_SECTIONS, SECTION_DEFAULTS, SectionedPlanGenerator, generation_fingerprint
+)
 
 # Impport core libraries
-import boto3
+import copy
 import json
 import logging
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 
 
 logger = logging.getLogger(__name__)
 
+class PlanConflictError(ValueError):
+    """An update conflicts with the plan's current status"""
+
+
 class TurnaroundPlanService:
+    VALID_STATUS_TRANSITIONS = {
+        'draft': ['approved'],
+        'approved': ['in_progress'],
+        'in_progress': ['completed'],
+        'completed': []
+    }
+    # Plans in these statuses only accept status transitions, not content edits
+    LOCKED_STATUSES = ('approved', 'completed')
+    # Sent back by clients that PATCH a whole plan object; never written
+    READ_ONLY_FIELDS = ('id', 'createdAt', 'updatedAt')
+    MODEL_ID = "us.amazon.nova-lite-v1:0"
+    # Bump when prompts change so cached generations are not reused
+    GENERATION_VERSION = '1'
+
     def __init__(self):
-        # Initialize AWS Bedrock client
-        session = boto3.Session(profile_name='PrecisionTurn-Dev')
-        self.llm = ChatBedrockConverse(
-            model="us.amazon.nova-lite-v1:0",
-            region_name='us-east-2'
-        )
+        # LangChain is imported here rather than at module level so the
+        # app starts without paying for it until a service is first used
+        from infrastructure.llm.chat_models import create_chat_model
+
+        # Bedrock chat model behind the shared gateway (concurrency limit,
+        # retries, circuit breaker)
+        self.llm = create_chat_model(self.MODEL_ID)
+        # Used instead of the single prompt when PLAN_GENERATION_MODE is sectioned
+        self.generation_mode = PLAN_GENERATION_MODE
+        self.section_generator = SectionedPlanGenerator(self.llm)
+        # Concurrent identical generations share one LLM call and save one plan
+        self.generation_flights = SingleFlight()
+        # Optional cache of generated sections for identical inputs
+        self.generation_cache = create_cache_backend(
+            PLAN_GENERATION_CACHE_URL,
+            namespace='plan-generations',
+            max_entries=PLAN_GENERATION_CACHE_MAX_ENTRIES,
+            default_ttl=PLAN_GENERATION_CACHE_TTL_SECONDS
+        ) if PLAN_GENERATION_CACHE_URL else None
         # Initialize repository
         self.plan_repository = PlanRepository()
+        # Encoded plan responses, invalidated on update/delete
+        self.plan_cache = PlanCache(create_cache_backend(
+            PLAN_CACHE_URL,
+            namespace='plans',
+            max_entries=PLAN_CACHE_MAX_ENTRIES,
+            default_ttl=PLAN_CACHE_TTL_SECONDS
+        ), max_variants=PLAN_CACHE_MAX_VARIANTS)
 
-        # Industry benchmarks remain the same
-        self.industry_benchmarks = {
-            "refinery": {
-                "cost_per_day": 1500000,
-                "safety_incident_rate": 0.5,
-                "typical_duration_ranges": {
-                    "small": {"min": 20, "max": 30},
-                    "medium": {"min": 35, "max": 50},
-                    "large": {"min": 45, "max": 70}
-                }
-            }
-        }
+        # Industry benchmark distributions by plant type and size (versioned data file)
+        self.benchmark_index = get_benchmark_index()
         
     def generate_prompt(self, plan_details: Dict[str, Any]) -> str:
         return f"""Given the following turnaround project details:
@@ -85,31 +123,131 @@ class TurnaroundPlanService:
         
     def analyze_scope(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze if the scope is realistic based on industry benchmarks"""
-        budget = plan_details.get('budget', 0)
-        duration = plan_details.get('duration', 0)
-        daily_cost = budget / duration if duration else 0
-        benchmark_daily = self.industry_benchmarks["refinery"]["cost_per_day"]
-        
+        benchmark = self.benchmark_index.score_one(
+            plan_details.get('plantType'), plan_details.get('budget'), plan_details.get('duration')
+        )
         return {
-            "is_realistic": 0.7 <= daily_cost/benchmark_daily <= 1.3,
-            "benchmark_comparison": daily_cost/benchmark_daily,
-            "recommendations": self._generate_scope_recommendations(daily_cost, benchmark_daily)
+            "is_realistic": benchmark['realistic'],
+            "benchmark_comparison": benchmark['benchmarkComparison'] or 0.0,
+            "recommendations": self._generate_scope_recommendations(benchmark),
+            "benchmark": benchmark
         }
 
-    def _generate_scope_recommendations(self, actual: float, benchmark: float) -> list:
-        if actual < benchmark * 0.7:
-            return [
+    def _generate_scope_recommendations(self, benchmark: Dict[str, Any]) -> list:
+        recommendations = []
+        if not benchmark['plantTypeMatched']:
+            recommendations.append(
+                f"No benchmarks for this plant type; compared against {benchmark['plantType']} figures"
+            )
+        if not benchmark['valid']:
+            return recommendations + ["Budget and duration are needed to compare against benchmarks"]
+
+        low, high = benchmark['costBand']
+        if benchmark['dailyCost'] < low:
+            recommendations += [
                 "Budget may be insufficient for scope",
                 "Consider reducing scope or increasing budget",
                 "Focus on critical path items only"
             ]
-        elif actual > benchmark * 1.3:
-            return [
+        elif benchmark['dailyCost'] > high:
+            recommendations += [
                 "Budget higher than industry average",
                 "Opportunity for scope optimization",
                 "Consider parallel work streams"
             ]
-        return ["Budget aligns with industry benchmarks"]
+        else:
+            recommendations.append("Budget aligns with industry benchmarks")
+
+        shortest, longest = benchmark['durationBand']
+        typical = benchmark['typicalDuration']
+        if benchmark['durationPercentile'] < 10:
+            recommendations.append(
+                f"Duration is shorter than {shortest:.0f} days, unusual for a {benchmark['sizeClass']} turnaround "
+                f"(typically {typical:.0f}); check the schedule is achievable"
+            )
+        elif benchmark['durationPercentile'] > 90:
+            recommendations.append(
+                f"Duration is longer than {longest:.0f} days, unusual for a {benchmark['sizeClass']} turnaround "
+                f"(typically {typical:.0f}); look for work that can run in parallel"
+            )
+        return recommendations
+
+    def _industry_benchmarks(self, scope_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Benchmark figures stored with a plan"""
+        benchmark = scope_analysis['benchmark']
+        return {
+            'cost_per_day': benchmark['benchmarkDailyCost'],
+            'safety_incident_rate': benchmark['safetyIncidentRate'],
+            'plant_type': benchmark['plantType'],
+            'size_class': benchmark['sizeClass'],
+            'version': benchmark['benchmarkVersion']
+        }
+
+    def analyze_portfolio(self, limit: int = PORTFOLIO_MAX_PLANS, filters: Dict[str, Any] = None,
+                          ascending: bool = False) -> Dict[str, Any]:
+        """Score up to limit stored plans against the benchmarks in one pass and rank them.
+
+        Plans are read with the summary projection, page by page, then
+        scored together. Ranked by realism (most realistic first, or least
+        with ascending); plans without a budget or duration come last.
+        """
+        items: List[Dict[str, Any]] = []
+        cursor = None
+        while len(items) < limit:
+            page, cursor = self.plan_repository.list_page(
+                min(limit - len(items), 500), cursor, summary=True, filters=filters
+            )
+            items.extend(page)
+            if not cursor:
+                break
+
+        index = self.benchmark_index
+        details = [item.get('details') or {} for item in items]
+        with stage('plan.score'):
+            scores = index.score(
+                [d.get('plantType') or item.get('plantType') for d, item in zip(details, items)],
+                [d.get('budget') for d in details],
+                [d.get('duration') for d in details]
+            )
+        realism = scores['realism']
+        order = np.argsort(realism if ascending else -realism, kind='stable')
+
+        def number(values, i):
+            value = values[i]
+            return None if np.isnan(value) else round(float(value), 4)
+
+        plans = []
+        for rank, i in enumerate(order, start=1):
+            plans.append({
+                'rank': rank,
+                'id': items[i].get('id'),
+                'title': items[i].get('title'),
+                'status': items[i].get('status'),
+                'plantType': index.plant_types[scores['typeIds'][i]],
+                'plantTypeMatched': bool(scores['matched'][i]),
+                'sizeClass': index.size_classes[scores['sizeIds'][i]],
+                'dailyCost': number(scores['dailyCost'], i),
+                'benchmarkComparison': number(scores['benchmarkComparison'], i),
+                'costPercentile': number(scores['costPercentile'], i),
+                'durationPercentile': number(scores['durationPercentile'], i),
+                'realism': number(realism, i),
+                'realistic': bool(scores['realistic'][i])
+            })
+
+        valid = scores['valid']
+        return {
+            'benchmarkVersion': index.version,
+            'count': len(items),
+            'truncated': bool(cursor),
+            'summary': {
+                'realistic': int(scores['realistic'].sum()),
+                'unrealistic': int((valid & ~scores['realistic']).sum()),
+                'missingInputs': int((~valid).sum()),
+                'unmatchedPlantType': int((~scores['matched']).sum()),
+                'medianRealism': float(np.median(realism[valid])) if valid.any() else None
+            },
+            'plans': plans
+        }
 
     def _build_enhanced_prompt(self, details: Dict[str, Any], scope_analysis: Dict[str, Any]) -> str:
         return f"""
@@ -137,52 +275,13 @@ class TurnaroundPlanService:
         """
 
     def _get_plan_schema(self) -> str:
-        return """
-        {
-            "milestones": [
-                {
-                    "title": string,
-                    "duration": number,
-                    "deliverables": [string],
-                    "dependencies": [string]
-                }
-            ],
-            "resources": {
-                "personnel": [
-                    {
-                        "role": string,
-                        "count": number,
-                        "skills": string
-                    }
-                ],
-                "equipment": [
-                    {
-                        "type": string,
-                        "quantity": number
-                    }
-                ]
-            },
-            "risk_assessment": {
-                "high_risks": [
-                    {
-                        "title": string,
-                        "description": string,
-                        "mitigation": string
-                    }
-                ]
-            },
-            "cost_breakdown": [
-                {
-                    "category": string,
-                    "amount": number,
-                    "details": string
-                }
-            ],
-            "safety_plan": {
-                "required_permits": [string],
-                "safety_protocols": [string]
-            }
-        }
+        sections = ',\n'.join(
+            f'            "{name}": {spec["schema"]}' for name, spec in PLAN_SECTIONS.items()
+        )
+        return f"""
+        {{
+{sections}
+        }}
         """
 
     def generate_plan(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
@@ -214,10 +313,7 @@ class TurnaroundPlanService:
                     **plan_details,
                     "generated_plan": base_plan,
                     "scope_analysis": scope_analysis,
-                    "industry_benchmarks": {
-                        "cost_per_day": self.industry_benchmarks["refinery"]["cost_per_day"],
-                        "safety_incident_rate": self.industry_benchmarks["refinery"]["safety_incident_rate"]
-                    }
+                    "industry_benchmarks": self._industry_benchmarks(scope_analysis)
                 }
             }
             
@@ -252,41 +348,175 @@ class TurnaroundPlanService:
         }
 
 
+    def generation_key(self, plan_details: Dict[str, Any]) -> str:
+        """Fingerprint of everything that determines a generated plan"""
+        return generation_fingerprint(plan_details, self.MODEL_ID, self.generation_mode, self.GENERATION_VERSION)
+
     # Create and save plan
     def create_and_save_plan(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate and save a new plan"""
+        """Generate and save a new plan.
+
+        Calls with the same generation inputs that overlap in time are
+        coalesced: one generates and saves, the others return its plan.
+        """
+        saved, shared = self.generation_flights.do(
+            self.generation_key(plan_details),
+            lambda: self._create_and_save_plan(dict(plan_details))
+        )
+        if shared:
+            logger.info(f"Coalesced duplicate generation into plan {saved['id']}")
+        return saved
+
+    def generate_plan_cached(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
+        """generate_plan_with_ai, answered from the generation cache when the inputs were seen before"""
+        if self.generation_cache is None:
+            return self.generate_plan_with_ai(plan_details)
+
+        key = self.generation_key(plan_details)
+        sections = self.generation_cache.get(key)
+        if sections is not None:
+            logger.info("Plan generation served from cache")
+            # The in-memory backend hands out the stored object itself
+            plan_details.update(copy.deepcopy(sections))
+            return plan_details
+
+        generated_plan = self.generate_plan_with_ai(plan_details)
+        self._cache_generation(key, generated_plan)
+        return generated_plan
+
+    def _cache_generation(self, key: str, generated_plan: Dict[str, Any]) -> None:
+        # Fallback (unstructured) responses are not cached so the next request retries
+        if self.generation_cache is not None and 'milestones' in generated_plan:
+            cached_fields = [*PLAN_SECTIONS, 'generation_warnings']
+            self.generation_cache.set(key, {
+                field: generated_plan[field] for field in cached_fields if field in generated_plan
+            })
+
+    def _create_and_save_plan(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
         try:
             # Generate plan using AI
-            generated_plan = self.generate_plan_with_ai(plan_details)
-            scope_analysis = self.analyze_scope(plan_details)
+            generated_plan = self.generate_plan_cached(plan_details)
+            return self._save_generated_plan(plan_details, generated_plan)
+        except Exception as e:
+            logger.error(f"Error creating and saving plan: {str(e)}")
+            raise
+
+    def _save_generated_plan(self, plan_details: Dict[str, Any], generated_plan: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with stage('plan.scope'):
+                scope_analysis = self.analyze_scope(plan_details)
             
             # Create plan model (which will handle Decimal conversion)
-            plan = PlanModel(
-                title=plan_details['title'],
-                status='draft',
-                details={
-                    **plan_details,
-                    'generated_plan': generated_plan,
-                    'scope_analysis': scope_analysis,
-                    'industry_benchmarks': {
-                        'cost_per_day': self.industry_benchmarks['refinery']['cost_per_day'],
-                        'safety_incident_rate': self.industry_benchmarks['refinery']['safety_incident_rate']
+            with stage('plan.convert'):
+                plan = PlanModel(
+                    title=plan_details['title'],
+                    status='draft',
+                    details={
+                        **plan_details,
+                        'generated_plan': generated_plan,
+                        'scope_analysis': scope_analysis,
+                        'industry_benchmarks': self._industry_benchmarks(scope_analysis)
                     }
-                }
-            )
+                )
         
             # Save to DynamoDB
             saved_plan = self.plan_repository.create(plan)
             return saved_plan.to_dynamodb_item()
         
         except Exception as e:
-            logger.error(f"Error creating and saving plan: {str(e)}")
+            logger.error(f"Error saving plan: {str(e)}")
             raise
 
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """Extract text from a streamed message chunk (plain string or Converse content blocks)"""
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        return ''.join(
+            block.get('text', '') for block in content
+            if isinstance(block, dict) and block.get('type', 'text') == 'text'
+        )
+
+    def stream_plan(self, plan_details: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Generate and save a plan as a stream of (event, data) pairs.
+
+        Emits a 'section' event ({name, value}) as each top-level section
+        of the plan becomes available, then 'plan' with the saved plan and
+        finally 'end' (or 'error' if anything fails). In single mode
+        sections are parsed out of the completion while it streams; in
+        sectioned mode they arrive as their calls finish. The saved plan
+        is authoritative: cross-validation may still adjust sections that
+        were already sent. Nothing is saved if the consumer stops reading.
+        """
+        try:
+            key = self.generation_key(plan_details)
+            cached = self.generation_cache.get(key) if self.generation_cache is not None else None
+            if cached is not None:
+                logger.info("Plan generation served from cache")
+                plan_details.update(copy.deepcopy(cached))
+                for name in PLAN_SECTIONS:
+                    if name in plan_details:
+                        yield 'section', {'name': name, 'value': plan_details[name]}
+                generated_plan = plan_details
+            elif self.generation_mode == 'sectioned':
+                generated_plan = yield from self._stream_sectioned(plan_details)
+                self._cache_generation(key, generated_plan)
+            else:
+                generated_plan = yield from self._stream_single(plan_details)
+                self._cache_generation(key, generated_plan)
+
+            yield 'plan', {'plan': self._save_generated_plan(plan_details, generated_plan)}
+            yield 'end', {'error': None}
+        except Exception as e:
+            logger.error(f"Error in stream_plan: {str(e)}")
+            yield 'error', {'error': str(e)}
+
+    def _stream_single(self, plan_details: Dict[str, Any]):
+        """Stream the single-prompt completion, emitting sections as they close"""
+        parser = StreamingJSONObjectParser()
+        sections: Dict[str, Any] = {}
+        content = []
+        with stage('plan.prompt'):
+            prompt = self.generate_prompt(plan_details)
+        for chunk in self.llm.stream(prompt):
+            text = self._chunk_text(chunk)
+            content.append(text)
+            for name, value in parser.feed(text):
+                if name in PLAN_SECTIONS and name not in sections:
+                    sections[name] = value
+                    yield 'section', {'name': name, 'value': value}
+
+        if not parser.started:
+            return self._format_unstructured_response(''.join(content))
+        # Missing sections get the same empty defaults as in sectioned mode
+        for name in PLAN_SECTIONS:
+            plan_details[name] = sections.get(name, SECTION_DEFAULTS[name]())
+        return plan_details
+
+    def _stream_sectioned(self, plan_details: Dict[str, Any]):
+        """Emit each section as its own call finishes, then merge them like generate_plan_sectioned"""
+        results = {}
+        for name, value, error in self.section_generator.iter_sections(plan_details):
+            results[name] = (value, error)
+            if not error:
+                yield 'section', {'name': name, 'value': value}
+        sections, warnings = self.section_generator.merge(results, plan_details)
+        plan_details.update(sections)
+        if warnings:
+            plan_details['generation_warnings'] = warnings
+        return plan_details
+
     # Generate plan with AI
     def generate_plan_with_ai(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
+        from langchain_core.messages import AIMessage
+
+        if self.generation_mode == 'sectioned':
+            return self.generate_plan_sectioned(plan_details)
+
         try:
-            prompt = self.generate_prompt(plan_details)
+            with stage('plan.prompt'):
+                prompt = self.generate_prompt(plan_details)
             ai_response = self.llm.invoke(prompt)
             
             if isinstance(ai_response, AIMessage):
@@ -300,7 +530,8 @@ class TurnaroundPlanService:
                 end_idx = content.rfind('}') + 1
                 if start_idx != -1 and end_idx != -1:
                     json_str = content[start_idx:end_idx]
-                    generated_plan = json.loads(json_str)
+                    with stage('plan.parse'):
+                        generated_plan = json.loads(json_str)
                     
                     # Add directly to plan details instead of nesting under generated_plan
                     plan_details['milestones'] = generated_plan.get('milestones', [])
@@ -321,38 +552,171 @@ class TurnaroundPlanService:
             raise
 
 
+    def generate_plan_sectioned(self, plan_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate each plan section concurrently and merge them into plan_details"""
+        try:
+            sections, warnings = self.section_generator.generate(plan_details)
+            plan_details.update(sections)
+            if warnings:
+                plan_details['generation_warnings'] = warnings
+            return plan_details
+        except Exception as e:
+            logger.error(f"Error generating sectioned plan: {str(e)}")
+            raise
+
     def get_plan(self, plan_id: str) -> Dict[str, Any]:
         """Retrieve a plan by ID"""
-        plan = self.plan_repository.get(plan_id)
-        return plan.to_dynamodb_item() if plan else None
+        # Served as read: already in DynamoDB item form
+        return self.plan_repository.get(plan_id)
+
+    def get_plan_response(self, plan_id: str, fields: Optional[FieldTree] = None) -> Optional[CachedPlan]:
+        """Encoded plan (or the selected fields of it) and its ETag, served from the plan cache when possible"""
+        cached = self.plan_cache.get(plan_id, fields)
+        if cached is not None:
+            return cached
+        plan = self.get_plan(plan_id)
+        return self.plan_cache.put(plan, fields) if plan else None
 
     def list_plans(self, limit: int = 50) -> list:
         """List all plans"""
         plans = self.plan_repository.list(limit)
         return [plan.to_dynamodb_item() for plan in plans]
 
-    def update_plan(self, plan_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-        current_plan = self.get_plan(plan_id)
-        if current_plan.status in ['approved', 'completed']:
-            raise ValueError("Cannot edit approved or completed plans")
-        
-        # Validate status transition
-        if 'status' in updates:
-            new_status = updates['status']
-            if not self._is_valid_status_transition(current_plan.status, new_status):
-                raise ValueError(f"Invalid status transition from {current_plan.status} to {new_status}")
-        
-        return self.plan_repository.update(plan_id, updates)
-
-    def _is_valid_status_transition(self, current: str, new: str) -> bool:
-        valid_transitions = {
-            'draft': ['approved'],
-            'approved': ['in_progress'],
-            'in_progress': ['completed'],
-            'completed': []
-        }
-        return new in valid_transitions.get(current, [])
+    def list_plans_page(self, limit: int = 50, cursor: str = None, summary: bool = False,
+                        filters: Dict[str, Any] = None, fields: Optional[FieldTree] = None) -> Dict[str, Any]:
+        """List one page of plans; pass nextCursor back as cursor for the next page"""
+        items, next_cursor = self.plan_repository.list_page(limit, cursor, summary, filters)
+        return {'items': select_fields(items, fields), 'nextCursor': next_cursor}
+
+    def update_plan(self, plan_id: str, updates: Dict[str, Any], created_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Partially update a plan with one conditional write.
+
+        Accepts title, status and a details object whose top-level keys are
+        written individually. Content edits are refused for approved or
+        completed plans and status changes must follow the allowed
+        transitions; both rules are enforced by the write's condition, so
+        the plan is never read first. Returns the updated plan, or None if
+        it does not exist.
+        """
+        paths: Dict[str, Any] = {}
+        for key, value in updates.items():
+            if key in self.READ_ONLY_FIELDS:
+                continue
+            if key == 'title':
+                if not isinstance(value, str) or not value.strip():
+                    raise ValueError("title must be a non-empty string")
+                paths['title'] = value
+            elif key == 'status':
+                if value not in self.VALID_STATUS_TRANSITIONS:
+                    raise ValueError(f"Unknown status: {value}")
+                paths['status'] = value
+            elif key == 'details':
+                if not isinstance(value, dict):
+                    raise ValueError("details must be an object")
+                for detail_key, detail_value in value.items():
+                    if not detail_key:
+                        raise ValueError("details keys must be non-empty")
+                    # A tuple path, so a key containing dots stays one map key
+                    paths[('details', detail_key)] = float_to_decimal(detail_value)
+                # Keep the plantType index attribute in step with details
+                if isinstance(value.get('plantType'), str) and value['plantType']:
+                    paths['plantType'] = value['plantType']
+            else:
+                raise ValueError(f"Field cannot be updated: {key}")
+        if not paths:
+            raise ValueError("No updatable fields provided")
+
+        # Statuses the plan may currently be in for this update to apply
+        allowed = [status for status in self.VALID_STATUS_TRANSITIONS if status not in self.LOCKED_STATUSES]
+        if 'status' in paths:
+            new_status = paths['status']
+            sources = [s for s, targets in self.VALID_STATUS_TRANSITIONS.items() if new_status in targets]
+            content_edit = any(path != 'status' for path in paths)
+            allowed = [s for s in sources if not (content_edit and s in self.LOCKED_STATUSES)]
+        if not allowed:
+            raise PlanConflictError(f"Plans cannot move to status {paths['status']}")
+        placeholders = {f':allowed{i}': status for i, status in enumerate(allowed)}
+        condition = (f"#status IN ({', '.join(placeholders)})", {'#status': 'status'}, placeholders)
+        paths['updatedAt'] = datetime.now().isoformat()
+
+        try:
+            updated = self.plan_repository.update(plan_id, paths, created_at=created_at, condition=condition)
+        except PlanConditionError as e:
+            current = e.item.get('status')
+            if 'status' in paths:
+                raise PlanConflictError(f"Invalid status transition from {current} to {paths['status']}")
+            raise PlanConflictError(f"Cannot edit {current} plans")
+        self.plan_cache.invalidate(plan_id)
+        return updated
 
     def delete_plan(self, plan_id: str) -> bool:
         """Delete a plan"""
-        return self.plan_repository.delete(plan_id)
+        deleted = self.plan_repository.delete(plan_id)
+        self.plan_cache.invalidate(plan_id)
+        return deleted
+
+    def _parse_plan_refs(self, refs: List[Any]) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """Split batch input into ordered unique ids and the full keys callers already know.
+
+        Each ref is a plan id, or {"id", "createdAt"} to skip the key lookup.
+        """
+        order: List[str] = []
+        known: Dict[str, Dict[str, str]] = {}
+        for ref in refs:
+            if isinstance(ref, str) and ref:
+                plan_id = ref
+            elif isinstance(ref, dict) and isinstance(ref.get('id'), str) and ref['id']:
+                plan_id = ref['id']
+                if isinstance(ref.get('createdAt'), str) and ref['createdAt']:
+                    known[plan_id] = {'id': plan_id, 'createdAt': ref['createdAt']}
+            else:
+                raise ValueError('Each entry must be a plan id or an object with an id')
+            if plan_id not in order:
+                order.append(plan_id)
+        return order, known
+
+    def batch_get_plans(self, refs: List[Any], fields: Optional[FieldTree] = None) -> List[Dict[str, Any]]:
+        """Fetch many plans in a few BatchGetItem calls; one result per requested id, in order"""
+        order, known = self._parse_plan_refs(refs)
+        resolved = self.plan_repository.resolve_keys([pid for pid in order if pid not in known])
+        keys = list(known.values()) + [versions[0] for versions in resolved.values()]
+
+        found, unprocessed = self.plan_repository.batch_get(keys)
+        unprocessed_ids = {key['id'] for key in unprocessed}
+
+        results = []
+        for plan_id in order:
+            if plan_id in found:
+                results.append({'id': plan_id, 'status': 'ok', 'plan': select_fields(found[plan_id], fields)})
+            elif plan_id in unprocessed_ids:
+                results.append({'id': plan_id, 'status': 'error', 'error': 'Throttled by DynamoDB, retry later'})
+            else:
+                results.append({'id': plan_id, 'status': 'not_found'})
+        return results
+
+    def batch_delete_plans(self, refs: List[Any]) -> List[Dict[str, Any]]:
+        """Delete many plans in a few BatchWriteItem calls; one result per requested id, in order.
+
+        Ids given with a createdAt are deleted by that exact key (DynamoDB
+        does not report whether it existed); bare ids delete every stored
+        version and report not_found when there is none.
+        """
+        order, known = self._parse_plan_refs(refs)
+        resolved = self.plan_repository.resolve_keys(
+            [pid for pid in order if pid not in known], latest_only=False
+        )
+        keys = list(known.values()) + [key for versions in resolved.values() for key in versions]
+
+        unprocessed = self.plan_repository.batch_delete(keys)
+        unprocessed_ids = {key['id'] for key in unprocessed}
+
+        results = []
+        for plan_id in order:
+            if plan_id in unprocessed_ids:
+                results.append({'id': plan_id, 'status': 'error', 'error': 'Throttled by DynamoDB, retry later'})
+            elif plan_id in known or plan_id in resolved:
+                self.plan_cache.invalidate(plan_id)
+                results.append({'id': plan_id, 'status': 'deleted'})
+            else:
+                results.append({'id': plan_id, 'status': 'not_found'})
+        return results
\ No newline at end of file
@@ -1,32 +1,109 @@
 # app.py
 
-from flask import Flask
+import time
+_started = time.perf_counter()
+
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 import logging
 
+from api.routes import health_bp
 from api.routes import plans_bp
 from api.routes import knowledge_bp
+from api.routes.compression import compress_response
+from infrastructure.config import METRICS_ENABLED, AppConfig, DevelopmentConfig
+from infrastructure.llm import gateway_stats
+from infrastructure.logging_config import configure_logging
+from infrastructure.metrics import multiprocess, record_request, registry, server_timing, start_timings, stop_timings
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued; written by a background thread)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
 
-# Register blueprints
-app.register_blueprint(plans_bp, url_prefix='/api/plans')
-app.register_blueprint(knowledge_bp, url_prefix='/api/rag')
+def create_app(config=AppConfig) -> Flask:
+    """Build the Flask app from a config object (a class or module) or a dict.
+
+    Routes and services are shared module state, so apps built here differ
+    only in their Flask settings; services are still built on first use.
+    Production serves the module-level app (app:app) with gunicorn; see
+    gunicorn.conf.py.
+    """
+    app = Flask(__name__)
+    if isinstance(config, dict):
+        app.config.from_object(AppConfig)
+        app.config.update(config)
+    else:
+        app.config.from_object(config)
+    CORS(app, resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}})
+
+    # Register blueprints
+    app.register_blueprint(plans_bp, url_prefix='/api/plans')
+    app.register_blueprint(knowledge_bp, url_prefix='/api/rag')
+    app.register_blueprint(health_bp, url_prefix='/health')
+
+    @app.route('/api/hello', methods=['GET'])
+    def hello_world():
+        return {'message': 'Hello World!'}
+
+    # Per-model call counts, latency, concurrency limit and circuit state
+    @app.route('/api/llm/stats', methods=['GET'])
+    def llm_stats():
+        return gateway_stats()
+
+    if METRICS_ENABLED:
+        _register_metrics(app)
+
+    # Registered after the metrics hook so it runs first and is timed
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.headers.get('Accept-Encoding'))
+
+    @app.errorhandler(Exception)
+    def handle_error(error):
+        logger.error(f"An error occurred: {str(error)}")
+        return {'error': str(error)}, 500
+
+    return app
+
+
+def _register_metrics(app: Flask) -> None:
+    @app.before_request
+    def start_request_timing():
+        g.metrics_started = time.perf_counter()
+        g.metrics_token = start_timings()
+
+    @app.after_request
+    def add_server_timing(response):
+        token = g.pop('metrics_token', None)
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        timing = server_timing(stop_timings(token), elapsed)
+        existing = response.headers.get('Server-Timing')
+        response.headers['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+        # The rule, not the path, so plan ids do not become label values
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        record_request(request.method, route, response.status_code, elapsed)
+        return response
+
+    # Prometheus scrape endpoint: the whole server with METRICS_MULTIPROC_DIR,
+    # otherwise only the worker process that answers
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        body = multiprocess.render() if multiprocess.enabled() else registry.render()
+        return Response(body, mimetype='text/plain; version=0.0.4')
 
-@app.route('/api/hello', methods=['GET'])
-def hello_world():
-    return {'message': 'Hello World!'}
 
-@app.errorhandler(Exception)
-def handle_error(error):
-    logger.error(f"An error occurred: {str(error)}")
-    return {'error': str(error)}, 500
+# Module-level app for asgi.py, the benchmarks and the development server
+app = create_app()
+# Services are built lazily, so this covers imports and app setup only;
+# benchmarks/startup_benchmark.py tracks the full cold start
+app.config['STARTUP_SECONDS'] = time.perf_counter() - _started
+logger.info(f"App initialized in {app.config['STARTUP_SECONDS'] * 1000:.0f} ms")
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8001, debug=True)
\ No newline at end of file
+    # Development only (debugger and reloader); production runs
+    # gunicorn -c gunicorn.conf.py, which serves app:app
+    create_app(DevelopmentConfig).run(host='0.0.0.0', port=8001, debug=True)
@@ -0,0 +1,52 @@
+# asgi.py
+"""ASGI entry point.
+
+    uvicorn asgi:app --port 8001
+
+Plan reads/deletes and knowledge base queries run as coroutines on one
+event loop (api/routes/asgi.py) sharing a pooled async DynamoDB client, so
+a single process keeps many DynamoDB and Bedrock calls in flight. Every
+other route is served by the Flask app through a WSGI adapter.
+"""
+
+from contextlib import asynccontextmanager
+import asyncio
+from asgiref.wsgi import WsgiToAsgi
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+import logging
+
+from app import app as flask_app
+from api.routes.asgi import async_routes
+from api.routes.knowledge import kb_service
+from api.routes.plans import plan_service
+from infrastructure.db.async_dynamodb import AsyncDynamoDBConnection
+from infrastructure.db.repositories.async_plan_repository import AsyncPlanRepository
+from infrastructure.config import CORS_ORIGINS
+from infrastructure.lifecycle import drain
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app):
+    async with AsyncDynamoDBConnection() as connection:
+        app.state.plan_repository = AsyncPlanRepository(connection)
+        logger.info("Async DynamoDB connection opened")
+        # Built here, off the loop, rather than by the first request on it
+        await asyncio.gather(asyncio.to_thread(plan_service.get), asyncio.to_thread(kb_service.get))
+        yield
+        # Let queued plan generations finish before the loop goes away
+        await asyncio.to_thread(drain)
+
+app = Starlette(
+    routes=[*async_routes, Mount('/', app=WsgiToAsgi(flask_app))],
+    middleware=[Middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_methods=['*'],
+        allow_headers=['*']
+    )],
+    lifespan=lifespan
+)
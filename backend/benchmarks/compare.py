@@ -0,0 +1,85 @@
+# benchmarks/compare.py
+"""Compare two benchmark suite result files.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+For every benchmark present in both files, compares its headline metrics
+(route p50/p95 latency and throughput, micro-benchmark median time) and
+marks a change larger than the threshold percentage as a regression or an
+improvement. Exits with status 1 when --fail-on-regression is given and
+anything regressed. Results are printed as JSON.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+# (metric, True when higher is better) per result kind
+HEADLINE_METRICS = {
+    'route': (('p50_ms', False), ('p95_ms', False), ('throughput_rps', True)),
+    'micro': (('median_us', False),)
+}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 10.0) -> Dict[str, Any]:
+    """Per-metric changes between two suite result documents"""
+    metrics = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or before.get('kind') != result.get('kind'):
+            continue
+        for metric, higher_is_better in HEADLINE_METRICS.get(result['kind'], ()):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            better = change > 0 if higher_is_better else change < 0
+            if abs(change) <= threshold:
+                verdict = 'unchanged'
+            else:
+                verdict = 'improved' if better else 'regressed'
+            metrics.append({
+                'benchmark': name, 'metric': metric, 'baseline': old, 'current': new,
+                'change_pct': round(change, 1), 'verdict': verdict
+            })
+
+    environment_changes = {
+        key: {'baseline': baseline['environment'].get(key), 'current': value}
+        for key, value in current['environment'].items()
+        if key not in ('gitCommit', 'gitDirty') and baseline['environment'].get(key) != value
+    }
+    return {
+        'baseline': baseline['environment'].get('gitCommit'),
+        'current': current['environment'].get('gitCommit'),
+        'threshold_pct': threshold,
+        # Results from different machines or parameters are not directly comparable
+        'environment_changes': environment_changes,
+        'params_changed': baseline.get('params') != current.get('params'),
+        'only_in_baseline': sorted(set(baseline['results']) - set(current['results'])),
+        'only_in_current': sorted(set(current['results']) - set(baseline['results'])),
+        'regressions': sum(1 for m in metrics if m['verdict'] == 'regressed'),
+        'improvements': sum(1 for m in metrics if m['verdict'] == 'improved'),
+        'metrics': metrics
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    report = compare(baseline, current, args.threshold)
+    print(json.dumps(report, indent=2))
+    if args.fail_on_regression and report['regressions']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
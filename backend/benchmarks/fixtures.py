@@ -0,0 +1,96 @@
+# benchmarks/fixtures.py
+"""Realistic plan payloads for the offline benchmarks."""
+
+import json
+import random
+from typing import Any, Dict
+
+from infrastructure.db.models.plan import PlanModel
+
+PLANT_TYPES = ['refinery', 'petrochemical', 'chemical', 'lng', 'power']
+
+
+def make_generated_plan(n_milestones: int = 40, seed: int = 0) -> Dict[str, Any]:
+    """A generated_plan body shaped like _get_plan_schema, with float amounts"""
+    rng = random.Random(seed)
+    milestones = []
+    for i in range(n_milestones):
+        predecessors = rng.sample(range(i), k=min(i, rng.randint(0, 3)))
+        milestones.append({
+            'title': f"Phase {i + 1}: {rng.choice(['Isolation', 'Inspection', 'Repair', 'Hydrotest', 'Startup'])}",
+            'duration': rng.randint(1, 12),
+            'deliverables': [f"Deliverable {i + 1}.{j + 1} signed off by area lead" for j in range(4)],
+            'dependencies': [f"Phase {p + 1}" for p in predecessors]
+        })
+    # Dependencies reference titles; rewrite them to the full titles
+    titles = {f"Phase {i + 1}": m['title'] for i, m in enumerate(milestones)}
+    for milestone in milestones:
+        milestone['dependencies'] = [titles[d] for d in milestone['dependencies']]
+
+    return {
+        'milestones': milestones,
+        'resources': {
+            'personnel': [
+                {'role': f"Craft {i}", 'count': rng.randint(2, 40), 'skills': 'Certified welding, rigging and confined space entry'}
+                for i in range(25)
+            ],
+            'equipment': [{'type': f"Equipment {i}", 'quantity': rng.randint(1, 10)} for i in range(25)]
+        },
+        'risk_assessment': {
+            'high_risks': [
+                {
+                    'title': f"Risk {i}",
+                    'description': 'Unexpected corrosion found during inspection extends the repair window ' * 2,
+                    'mitigation': 'Pre-order long-lead materials and stage contingency crews on site'
+                }
+                for i in range(15)
+            ]
+        },
+        'cost_breakdown': [
+            {'category': f"Category {i}", 'amount': round(rng.uniform(1e5, 5e6), 2), 'details': 'Labour, materials and rentals'}
+            for i in range(12)
+        ],
+        'safety_plan': {
+            'required_permits': [f"Permit {i}" for i in range(10)],
+            'safety_protocols': [f"Protocol {i}: gas test before every entry and hourly thereafter" for i in range(15)]
+        }
+    }
+
+
+def make_plan_details(n_milestones: int = 40, seed: int = 0) -> Dict[str, Any]:
+    """plan_details as sent to /generate, enriched the way create_and_save_plan does it"""
+    rng = random.Random(seed)
+    duration = rng.randint(20, 60)
+    budget = duration * rng.randint(1_000_000, 2_000_000)
+    generated = make_generated_plan(n_milestones, seed)
+    details = {
+        'title': f"Turnaround {seed}",
+        'plantType': PLANT_TYPES[seed % len(PLANT_TYPES)],
+        'duration': duration,
+        'budget': budget,
+        'scope': 'Crude unit turnaround including heat exchanger bundle pulls and column tray replacement',
+        'constraints': 'Work must finish before the winter demand peak',
+        **generated,
+        'generated_plan': generated,
+        'scope_analysis': {
+            'is_realistic': True,
+            'benchmark_comparison': budget / duration / 1500000,
+            'recommendations': ['Budget aligns with industry benchmarks']
+        },
+        'industry_benchmarks': {'cost_per_day': 1500000, 'safety_incident_rate': 0.5}
+    }
+    return details
+
+
+def make_plan_model(n_milestones: int = 40, seed: int = 0) -> PlanModel:
+    details = make_plan_details(n_milestones, seed)
+    return PlanModel(title=details['title'], details=details)
+
+
+def make_plan_item(n_milestones: int = 40, seed: int = 0) -> Dict[str, Any]:
+    """A plan as DynamoDB returns it (numbers as Decimal)"""
+    return make_plan_model(n_milestones, seed).to_dynamodb_item()
+
+
+def payload_size(obj: Any) -> int:
+    return len(json.dumps(obj, default=float))
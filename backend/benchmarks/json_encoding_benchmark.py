@@ -0,0 +1,81 @@
+# benchmarks/json_encoding_benchmark.py
+"""Micro-benchmark for plan response encoding.
+
+    python -m benchmarks.json_encoding_benchmark
+
+Compares the per-request CPU cost of the previous plan route path
+(to_dynamodb_item re-converting floats, decimal_to_float copy, then
+json.dumps with DecimalEncoder) with the single-pass dumps_json, using the
+stdlib encoder and, when installed, orjson. Results are printed as JSON.
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import make_plan_model
+from infrastructure.utils import json_helper
+from infrastructure.utils.json_helper import DecimalEncoder, decimal_to_float
+
+
+def legacy_encode(model):
+    item = model.to_dynamodb_item()
+    item['details'] = model._convert_floats_to_decimal(item['details'])
+    return json.dumps(decimal_to_float(item), cls=DecimalEncoder).encode('utf-8')
+
+
+def stdlib_encode(model):
+    item = model.to_dynamodb_item()
+    return json.dumps(item, cls=DecimalEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def fast_encode(model):
+    return json_helper.dumps_json(model.to_dynamodb_item())
+
+
+def measure(fn, payload, number):
+    best = min(timeit.repeat(lambda: fn(payload), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def run(n_milestones: int, list_size: int, number: int) -> dict:
+    single = make_plan_model(n_milestones)
+    page = [make_plan_model(n_milestones, seed) for seed in range(list_size)]
+
+    def per_page(fn):
+        return lambda models: [fn(m) for m in models]
+
+    encoders = {'legacy': legacy_encode, 'single_pass_stdlib': stdlib_encode}
+    if json_helper.orjson is not None:
+        encoders['single_pass_orjson'] = fast_encode
+
+    results = {}
+    for name, fn in encoders.items():
+        results[name] = {
+            'plan_us': measure(fn, single, number),
+            'list_page_us': measure(per_page(fn), page, max(1, number // list_size)),
+            'bytes': len(fn(single))
+        }
+    baseline = results['legacy']
+    for name, result in results.items():
+        result['plan_speedup'] = baseline['plan_us'] / result['plan_us']
+        result['list_page_speedup'] = baseline['list_page_us'] / result['list_page_us']
+
+    return {
+        'benchmark': 'json_encoding',
+        'params': {'milestones': n_milestones, 'list_size': list_size, 'number': number},
+        'results': results
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--milestones', type=int, default=40)
+    parser.add_argument('--list-size', type=int, default=50)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.milestones, args.list_size, args.number), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/llm_gateway_benchmark.py
+"""Exercise the LLM gateway against the fake model.
+
+    python -m benchmarks.llm_gateway_benchmark --threads 32 --calls 10 --capacity 8
+
+Overload: more caller threads than the fake model's capacity, first
+calling the model directly, then through the gateway; reports success
+rate, throttles, retries, latency and where the AIMD limit settled.
+Outage: the model fails every call until it "recovers"; reports how many
+calls the circuit breaker rejected without touching the model and whether
+the half-open probe closed it again. Results are printed as JSON.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from infrastructure.llm import AdaptiveConcurrencyLimiter, CircuitBreaker, LLMGateway
+from infrastructure.llm.chat_models import FakeChatModel, GatewayChatModel
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def hammer(model, threads: int, calls: int) -> dict:
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(calls):
+            started = time.perf_counter()
+            try:
+                model.invoke('ping')
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * calls
+    return {
+        'success_rate': len(latencies) / total,
+        'errors': len(errors),
+        'throughput_per_second': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000
+    }
+
+
+def overload(threads: int, calls: int, capacity: int, latency: float) -> dict:
+    direct = hammer(FakeChatModel(latency_seconds=latency, capacity=capacity), threads, calls)
+
+    gateway = LLMGateway(
+        'fake-overload',
+        limiter=AdaptiveConcurrencyLimiter(initial=4, min_limit=1, max_limit=threads),
+        max_retries=6, backoff_base=latency, backoff_cap=latency * 20
+    )
+    model = GatewayChatModel(model=FakeChatModel(latency_seconds=latency, capacity=capacity), gateway=gateway)
+    gated = hammer(model, threads, calls)
+    return {'direct': direct, 'gateway': {**gated, **gateway.stats()}}
+
+
+def outage(reset_timeout: float) -> dict:
+    fake = FakeChatModel(latency_seconds=0.01, failure_rate=1.0)
+    gateway = LLMGateway(
+        'fake-outage',
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=reset_timeout),
+        max_retries=1, backoff_base=0.01, backoff_cap=0.05
+    )
+    model = GatewayChatModel(model=fake, gateway=gateway)
+
+    outcomes = []
+    for _ in range(20):
+        try:
+            model.invoke('ping')
+            outcomes.append('ok')
+        except Exception as e:
+            outcomes.append(type(e).__name__)
+    state_during = gateway.breaker.state
+
+    fake.failure_rate = 0.0
+    time.sleep(reset_timeout)
+    model.invoke('ping')  # half-open probe
+    return {
+        'outcomes': {name: outcomes.count(name) for name in sorted(set(outcomes))},
+        'state_during_outage': state_during,
+        'state_after_probe': gateway.breaker.state,
+        **{key: value for key, value in gateway.stats().items() if key in ('calls', 'rejected', 'failed')}
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=10)
+    parser.add_argument('--capacity', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--reset-timeout', type=float, default=0.5)
+    args = parser.parse_args()
+    print(json.dumps({
+        'benchmark': 'llm_gateway',
+        'params': vars(args),
+        'overload': overload(args.threads, args.calls, args.capacity, args.latency),
+        'outage': outage(args.reset_timeout)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/plan_generation_benchmark.py
+"""Single-prompt vs sectioned plan generation against the fake model.
+
+    python -m benchmarks.plan_generation_benchmark --runs 5 --seconds-per-token 0.0005
+
+The fake model's latency grows with the length of its response, standing
+in for decode time, and it answers with a realistic plan (limited to the
+sections each prompt asks for). --corrupt-rate truncates that fraction of
+responses to show what one malformed section costs each mode. Results are
+printed as JSON.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from api.services.plangeneration import PLAN_SECTIONS, SectionError, SectionedPlanGenerator, extract_json
+from benchmarks.fixtures import make_generated_plan, make_plan_details
+from infrastructure.llm import LLMGateway
+from infrastructure.llm.chat_models import FakeChatModel, GatewayChatModel
+
+FULL_SCHEMA = '{' + ', '.join(f'"{name}": {spec["schema"]}' for name, spec in PLAN_SECTIONS.items()) + '}'
+
+
+def make_responder(n_milestones: int, corrupt_rate: float, seed: int):
+    plan = make_generated_plan(n_milestones, seed)
+    rng = random.Random(seed)
+
+    def respond(prompt: str) -> str:
+        sections = {name: value for name, value in plan.items() if f'"{name}"' in prompt}
+        text = json.dumps(sections)
+        if rng.random() < corrupt_rate:
+            return text[:len(text) // 2]
+        return text
+
+    return respond
+
+
+def single(model, details) -> bool:
+    prompt = f"Plan for {details['title']}. Format your response exactly according to this schema: {FULL_SCHEMA}"
+    try:
+        plan = extract_json(model.invoke(prompt).content)
+    except SectionError:
+        return False
+    return all(name in plan for name in PLAN_SECTIONS)
+
+
+def sectioned(model, details) -> bool:
+    plan, warnings = SectionedPlanGenerator(model).generate(details)
+    return not any(warning.startswith('Section') for warning in warnings)
+
+
+def run(runs: int, n_milestones: int, seconds_per_token: float, latency: float, corrupt_rate: float) -> dict:
+    results = {}
+    for name, generate in (('single', single), ('sectioned', sectioned)):
+        timings, complete = [], 0
+        for seed in range(runs):
+            fake = FakeChatModel(
+                latency_seconds=latency,
+                seconds_per_token=seconds_per_token,
+                response=make_responder(n_milestones, corrupt_rate, seed)
+            )
+            model = GatewayChatModel(model=fake, gateway=LLMGateway(f'fake-{name}-{seed}'))
+            details = make_plan_details(n_milestones, seed)
+            started = time.perf_counter()
+            complete += generate(model, details)
+            timings.append(time.perf_counter() - started)
+        results[name] = {
+            'mean_seconds': statistics.fmean(timings),
+            'max_seconds': max(timings),
+            'complete_plans': complete / runs
+        }
+    results['speedup'] = results['single']['mean_seconds'] / results['sectioned']['mean_seconds']
+    return {
+        'benchmark': 'plan_generation',
+        'params': {
+            'runs': runs, 'milestones': n_milestones, 'seconds_per_token': seconds_per_token,
+            'latency': latency, 'corrupt_rate': corrupt_rate
+        },
+        'results': results
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--milestones', type=int, default=20)
+    parser.add_argument('--seconds-per-token', type=float, default=0.0005)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--corrupt-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.milestones, args.seconds_per_token, args.latency, args.corrupt_rate), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/retrieval_benchmark.py
+"""Offline benchmark for the local vector retriever.
+
+    python -m benchmarks.retrieval_benchmark --docs 20000 --queries 200
+
+Builds a synthetic turnaround corpus in a temporary index using the
+hashing embedding stand-in, then reports load throughput, brute-force and
+IVF query latency, and IVF recall@k against brute force. Results are
+printed as JSON.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from infrastructure.retrieval import HashingEmbeddings, LocalVectorIndex
+
+VOCABULARY = (
+    "hot work permit gas test confined space entry isolation lockout tagout heat exchanger "
+    "bundle pull catalyst change crude unit vacuum column tray inspection scaffolding crane lift "
+    "flare header blind list pressure test hydrotest welding procedure NDT radiography corrosion "
+    "piping reformer furnace tube replacement rotating equipment compressor overhaul pump seal "
+    "valve recertification relief valve shutdown startup purge nitrogen steam out decontamination "
+    "contractor mobilization critical path schedule budget contingency risk mitigation"
+).split()
+
+
+def synthetic_corpus(n_docs: int, seed: int = 0, n_topics: int = 32):
+    # Each document mostly draws from one topic's vocabulary so the corpus
+    # has the cluster structure real procedure documents have
+    topic_rng = random.Random(1234)
+    topics = [topic_rng.sample(VOCABULARY, 12) for _ in range(n_topics)]
+    rng = random.Random(seed)
+    for i in range(n_docs):
+        topic = topics[rng.randrange(n_topics)]
+        words = [
+            rng.choice(topic) if rng.random() < 0.8 else rng.choice(VOCABULARY)
+            for _ in range(rng.randint(40, 120))
+        ]
+        yield ' '.join(words), {'source': f"synthetic/{i // 50}.md", 'chunk': i % 50}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(samples):
+    return {
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000
+    }
+
+
+def run(n_docs: int, n_queries: int, k: int, dim: int, nprobe: int, batch_size: int) -> dict:
+    embeddings = HashingEmbeddings(dim=dim)
+    with tempfile.TemporaryDirectory() as path:
+        index = LocalVectorIndex(path, dim)
+
+        started = time.perf_counter()
+        texts, metadatas = [], []
+        for text, metadata in synthetic_corpus(n_docs):
+            texts.append(text)
+            metadatas.append(metadata)
+            if len(texts) == batch_size:
+                index.add(np.asarray(embeddings.embed_documents(texts)),
+                          [{'page_content': t, 'metadata': m} for t, m in zip(texts, metadatas)])
+                texts, metadatas = [], []
+        if texts:
+            index.add(np.asarray(embeddings.embed_documents(texts)),
+                      [{'page_content': t, 'metadata': m} for t, m in zip(texts, metadatas)])
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.build_ivf()
+        ivf_build_seconds = time.perf_counter() - started
+
+        # Embed queries up front so only search time is measured
+        queries = [np.asarray(embeddings.embed_query(text)) for text, _ in synthetic_corpus(n_queries, seed=1)]
+
+        brute_times, ivf_times, recalls = [], [], []
+        for query in queries:
+            started = time.perf_counter()
+            exact = index.search(query, k=k)
+            brute_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            approximate = index.search(query, k=k, nprobe=nprobe)
+            ivf_times.append(time.perf_counter() - started)
+
+            exact_rows = {row for row, _ in exact}
+            recalls.append(len(exact_rows & {row for row, _ in approximate}) / len(exact_rows))
+
+        reopened_started = time.perf_counter()
+        LocalVectorIndex.open(path)
+        reopen_seconds = time.perf_counter() - reopened_started
+
+    return {
+        'benchmark': 'retrieval',
+        'params': {'docs': n_docs, 'queries': n_queries, 'k': k, 'dim': dim, 'nprobe': nprobe},
+        'load_docs_per_second': n_docs / load_seconds,
+        'ivf_build_seconds': ivf_build_seconds,
+        'reopen_seconds': reopen_seconds,
+        'brute_force': latency_summary(brute_times),
+        'ivf': {**latency_summary(ivf_times), 'recall_at_k': statistics.fmean(recalls)}
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=4)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--nprobe', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+    print(json.dumps(run(args.docs, args.queries, args.k, args.dim, args.nprobe, args.batch_size), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/startup_benchmark.py
+"""Cold start benchmark.
+
+    python -m benchmarks.startup_benchmark --runs 5
+
+Starts fresh interpreters the way a container or serverless cold start
+does and reports, per run, the time to import the app, to serve the first
+/api/hello request, and to build each service on first use. The slowest
+imports from one `python -X importtime` run are listed as well. Results
+are printed as JSON.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line
+CHILD = """
+import json, logging, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.app.test_client().get('/api/hello')
+first_request = time.perf_counter()
+logging.disable(logging.CRITICAL)
+from api.routes.plans import plan_service
+from api.routes.knowledge import kb_service
+services = {}
+if BUILD_SERVICES:
+    for name, service in (('plan_service', plan_service), ('kb_service', kb_service)):
+        try:
+            service.get()
+            services[name] = service.build_seconds
+        except Exception as e:
+            services[name] = f"failed: {e}"
+print(json.dumps({
+    'import_seconds': imported - started,
+    'first_request_seconds': first_request - imported,
+    'services': services
+}))
+"""
+
+
+def run_child(build_services: bool) -> dict:
+    code = CHILD.replace('BUILD_SERVICES', str(build_services))
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list:
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append({'module': module.strip(), 'self_ms': int(self_us) / 1000,
+                     'cumulative_ms': int(cumulative_us) / 1000})
+    return sorted(rows, key=lambda row: row['self_ms'], reverse=True)[:top]
+
+
+def run(runs: int, build_services: bool, top: int) -> dict:
+    samples = [run_child(build_services) for _ in range(runs)]
+
+    def summary(values):
+        return {'mean_ms': statistics.fmean(values) * 1000, 'min_ms': min(values) * 1000}
+
+    services = {}
+    for name in samples[0]['services']:
+        timings = [s['services'][name] for s in samples if isinstance(s['services'][name], float)]
+        services[name] = summary(timings) if timings else samples[0]['services'][name]
+
+    return {
+        'benchmark': 'startup',
+        'params': {'runs': runs, 'build_services': build_services},
+        'import_app': summary([s['import_seconds'] for s in samples]),
+        'first_request': summary([s['first_request_seconds'] for s in samples]),
+        'service_build': services,
+        'slowest_imports': slowest_imports(top)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-services', action='store_true', help='skip building the services')
+    parser.add_argument('--top', type=int, default=10, help='number of slowest imports to list')
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, not args.no_services, args.top), indent=2))
+
+
+if __name__ == '__main__':
+    main()
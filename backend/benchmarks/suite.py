@@ -0,0 +1,544 @@
+# benchmarks/suite.py
+"""Offline benchmark suite for the backend hot paths.
+
+    python -m benchmarks.suite --output results.json [--compare baseline.json]
+
+Runs without AWS: DynamoDB is moto's in-process stand-in (pip install
+moto) or, with --dynamodb-endpoint, DynamoDB Local; Bedrock chat calls go
+to FakeChatModel with --llm-latency seconds per call; the knowledge base
+is a temporary local vector index over a synthetic corpus with hashing
+embeddings. moto serializes items in pure Python and is far slower than
+DynamoDB for large plans, which is why the stored plans default to small
+ones; route results are only comparable between runs on the same stand-in.
+
+Every route of the plans and knowledge blueprints is exercised end to end
+through the Flask app (routing, services, cache, DynamoDB and encoding):
+--requests sequential requests give the latency distribution, then the
+same number again from --concurrency threads give throughput. Plan
+generation is timed until its job finishes and streams until their last
+event. Micro-benchmarks cover decimal_to_float,
+PlanModel._convert_floats_to_decimal, KnowledgeBaseService.format_answer,
+response encoding and JSON extraction from a large plan response.
+
+Results are printed as JSON (and written to --output) with the git
+commit, interpreter and parameters they were measured with, so runs can
+be compared with benchmarks.compare or directly with --compare.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.compare import compare
+
+# Nothing under api/ or infrastructure/ may be imported at module level:
+# configure_environment has to run before infrastructure.config is loaded
+SCHEMA_VERSION = 1
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_POLL_SECONDS = 0.002
+DISPOSABLE_MILESTONES = 5
+ROUTE_ENDPOINTS = ('plans.', 'knowledge.')
+
+QUESTIONS = [
+    'What permits are needed for hot work inside a vessel?',
+    'How often must the atmosphere be gas tested during confined space entry?',
+    'What is the isolation procedure for a heat exchanger bundle pull?',
+    'Which checks are required before a hydrotest?',
+    'How do we recertify relief valves during the shutdown?'
+]
+
+
+def configure_environment(llm_latency: float, index_path: str, dynamodb_endpoint: Optional[str] = None) -> None:
+    """Point the app at offline stand-ins; must run before the app is imported,
+    since infrastructure.config reads the environment at import time"""
+    os.environ.update({
+        'DYNAMODB_ENDPOINT_URL': dynamodb_endpoint or '',
+        'AWS_DEFAULT_REGION': os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'LLM_PROVIDER': 'fake',
+        'LLM_FAKE_LATENCY_SECONDS': str(llm_latency),
+        'LLM_FAKE_THROTTLE_RATE': '0',
+        'RAG_RETRIEVER': 'local',
+        'RAG_EMBEDDINGS': 'hashing',
+        'LOCAL_INDEX_PATH': index_path,
+        # Generation results must not be served from cache between iterations
+        'PLAN_GENERATION_CACHE_URL': ''
+    })
+
+
+def environment_info(dynamodb_endpoint: Optional[str] = None) -> Dict[str, Any]:
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    import numpy
+    if dynamodb_endpoint:
+        dynamodb = 'endpoint'
+    else:
+        import moto
+        dynamodb = f"moto {moto.__version__}"
+    try:
+        import orjson
+        orjson_version = orjson.__version__
+    except ImportError:
+        orjson_version = None
+    return {
+        'gitCommit': git('rev-parse', 'HEAD'),
+        'gitDirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpuCount': os.cpu_count(),
+        'numpy': numpy.__version__,
+        # Route latencies include the stand-in's own cost, so they only compare across the same one
+        'dynamodb': dynamodb,
+        'orjson': orjson_version
+    }
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000
+    }
+
+
+class RouteCase:
+    """One route scenario: build(i) returns the i-th request as a dict of
+    test client arguments; finish(client, response) completes work the
+    route hands off (e.g. polls a job) and returns the final status code;
+    setup() runs once before the case is measured"""
+
+    def __init__(self, name: str, route: str, build: Callable[[int], Dict[str, Any]],
+                 expect: tuple = (200,), finish: Optional[Callable] = None,
+                 setup: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.route = route
+        self.build = build
+        self.expect = expect
+        self.finish = finish
+        self.setup = setup
+
+    def call(self, client, request: Dict[str, Any]) -> bool:
+        request = dict(request)
+        method = request.pop('method', 'GET')
+        response = client.open(method=method, **request)
+        # Reading the body drains streamed responses
+        response.get_data()
+        status = self.finish(client, response) if self.finish else response.status_code
+        return status in self.expect
+
+
+def wait_for_job(client, response) -> int:
+    if response.status_code != 202:
+        return response.status_code
+    location = response.headers['Location']
+    while True:
+        job = client.get(location).get_json()
+        if job['status'] == 'succeeded':
+            return 200
+        if job['status'] == 'failed':
+            return 500
+        time.sleep(JOB_POLL_SECONDS)
+
+
+def seed_plans(count: int, n_milestones: int, prefix: str) -> List[Dict[str, Any]]:
+    """Store plans straight through the repository; returns their id, createdAt and milestone titles"""
+    from benchmarks.fixtures import make_plan_model
+    from infrastructure.db.repositories.plan_repository import PlanRepository
+
+    repository = PlanRepository()
+    plans = []
+    for seed in range(count):
+        model = make_plan_model(n_milestones, seed)
+        model.title = f"{prefix} {seed}"
+        repository.create(model)
+        plans.append({
+            'id': model.id,
+            'createdAt': model.created_at,
+            'milestones': [m['title'] for m in model.details['milestones']]
+        })
+    return plans
+
+
+def seed_knowledge_base(n_docs: int) -> None:
+    from benchmarks.retrieval_benchmark import synthetic_corpus
+    from infrastructure.retrieval import create_local_retriever
+
+    retriever = create_local_retriever()
+    texts, metadatas = zip(*synthetic_corpus(n_docs))
+    retriever.add_texts(list(texts), list(metadatas))
+    retriever.index.flush()
+
+
+def route_cases(args, plans: List[Dict[str, Any]]) -> List[RouteCase]:
+    from benchmarks.fixtures import PLANT_TYPES
+
+    n = len(plans)
+    batch = max(1, min(args.batch_size, n))
+    disposable = {}
+
+    def seed_disposable(name, count):
+        # Deletes consume their plans, so they are stored just before the case
+        # runs and never inflate the table the other cases read
+        def setup():
+            disposable[name] = seed_plans(count, DISPOSABLE_MILESTONES, f"Disposable {name}")
+        return setup
+
+    def details(i):
+        return {
+            'title': f"Benchmark turnaround {i}",
+            'plantType': PLANT_TYPES[i % len(PLANT_TYPES)],
+            'duration': 30 + i % 20,
+            'budget': 45_000_000 + 100_000 * i,
+            'scope': 'Crude unit turnaround including heat exchanger bundle pulls and column tray replacement'
+        }
+
+    def plan(i):
+        return plans[i % n]
+
+    def etag_for(plan_id):
+        from api.routes.plans import plan_service
+        return plan_service.get_plan_response(plan_id).etag
+
+    etags = {}
+
+    def not_modified(i):
+        plan_id = plan(i)['id']
+        if plan_id not in etags:
+            etags[plan_id] = etag_for(plan_id)
+        return {'path': f"/api/plans/{plan_id}", 'headers': {'If-None-Match': f'"{etags[plan_id]}"'}}
+
+    def prime_answer_cache():
+        from api.routes.knowledge import kb_service
+        for question in QUESTIONS:
+            kb_service.query(question)
+
+    def batch_refs(i):
+        return [{'id': p['id'], 'createdAt': p['createdAt']} for p in (plan(i * batch + j) for j in range(batch))]
+
+    return [
+        RouteCase('plans.generate', 'POST /api/plans/generate',
+                  lambda i: {'method': 'POST', 'path': '/api/plans/generate', 'json': details(i)},
+                  finish=wait_for_job),
+        RouteCase('plans.generate_stream', 'POST /api/plans/generate/stream',
+                  lambda i: {'method': 'POST', 'path': '/api/plans/generate/stream', 'json': details(i)}),
+        RouteCase('plans.job_stats', 'GET /api/plans/jobs',
+                  lambda i: {'path': '/api/plans/jobs'}),
+        # A job id that is not (or no longer) held answers 404, which is the cheap path
+        RouteCase('plans.job_missing', 'GET /api/plans/jobs/<job_id>',
+                  lambda i: {'path': f"/api/plans/jobs/missing-{i}"}, expect=(404,)),
+        RouteCase('plans.list_full', 'GET /api/plans/',
+                  lambda i: {'path': '/api/plans/', 'query_string': {'limit': args.page_size}}),
+        RouteCase('plans.list_summary', 'GET /api/plans/',
+                  lambda i: {'path': '/api/plans/', 'query_string': {'limit': args.page_size, 'view': 'summary'}}),
+        RouteCase('plans.list_filtered', 'GET /api/plans/',
+                  lambda i: {'path': '/api/plans/', 'query_string': {
+                      'limit': args.page_size, 'view': 'summary', 'plantType': PLANT_TYPES[i % len(PLANT_TYPES)]
+                  }}),
+        RouteCase('plans.portfolio_analysis', 'GET /api/plans/portfolio/analysis',
+                  lambda i: {'path': '/api/plans/portfolio/analysis'}),
+        RouteCase('plans.get', 'GET /api/plans/<plan_id>',
+                  lambda i: {'path': f"/api/plans/{plan(i)['id']}"}),
+        RouteCase('plans.get_not_modified', 'GET /api/plans/<plan_id>', not_modified, expect=(304,)),
+        RouteCase('plans.schedule', 'GET /api/plans/<plan_id>/schedule',
+                  lambda i: {'path': f"/api/plans/{plan(i)['id']}/schedule"}),
+        RouteCase('plans.schedule_what_if', 'POST /api/plans/<plan_id>/schedule/what-if',
+                  lambda i: {'method': 'POST', 'path': f"/api/plans/{plan(i)['id']}/schedule/what-if", 'json': {
+                      'changes': [{'milestone': plan(i)['milestones'][i % len(plan(i)['milestones'])],
+                                   'duration': 1 + i % 15}]
+                  }}),
+        RouteCase('plans.simulate', 'POST /api/plans/<plan_id>/simulate',
+                  lambda i: {'method': 'POST', 'path': f"/api/plans/{plan(i)['id']}/simulate",
+                             'json': {'iterations': args.simulation_iterations, 'seed': i}}),
+        RouteCase('plans.update', 'PATCH /api/plans/<plan_id>',
+                  lambda i: {'method': 'PATCH', 'path': f"/api/plans/{plan(i)['id']}", 'json': {
+                      'createdAt': plan(i)['createdAt'], 'details': {'constraints': f"Revision {i}"}
+                  }}),
+        RouteCase('plans.batch_get', 'POST /api/plans/batch-get',
+                  lambda i: {'method': 'POST', 'path': '/api/plans/batch-get', 'json': {'ids': batch_refs(i)}}),
+        RouteCase('plans.batch_delete', 'POST /api/plans/batch-delete',
+                  lambda i: {'method': 'POST', 'path': '/api/plans/batch-delete', 'json': {'ids': [
+                      {'id': p['id'], 'createdAt': p['createdAt']}
+                      for p in disposable['batch_delete'][i * batch:(i + 1) * batch]
+                  ]}}, setup=seed_disposable('batch_delete', args.total_requests * batch)),
+        RouteCase('plans.delete', 'DELETE /api/plans/<plan_id>',
+                  lambda i: {'method': 'DELETE', 'path': f"/api/plans/{disposable['delete'][i]['id']}"},
+                  setup=seed_disposable('delete', args.total_requests)),
+        # Distinct questions miss the answer cache and run retrieval and the model
+        RouteCase('rag.query', 'POST /api/rag/query',
+                  lambda i: {'method': 'POST', 'path': '/api/rag/query',
+                             'json': {'question': f"{QUESTIONS[i % len(QUESTIONS)]} (variant {i})"}}),
+        RouteCase('rag.query_cached', 'POST /api/rag/query',
+                  lambda i: {'method': 'POST', 'path': '/api/rag/query',
+                             'json': {'question': QUESTIONS[i % len(QUESTIONS)]}},
+                  setup=prime_answer_cache),
+        RouteCase('rag.stream', 'POST /api/rag/stream',
+                  lambda i: {'method': 'POST', 'path': '/api/rag/stream',
+                             'json': {'question': f"{QUESTIONS[i % len(QUESTIONS)]} (streamed {i})"}}),
+        RouteCase('rag.stream_get', 'GET /api/rag/stream',
+                  lambda i: {'path': '/api/rag/stream',
+                             'query_string': {'question': f"{QUESTIONS[i % len(QUESTIONS)]} (get {i})"}}),
+        # A checklist of distinct questions per request, answered concurrently
+        RouteCase('rag.batch', 'POST /api/rag/batch',
+                  lambda i: {'method': 'POST', 'path': '/api/rag/batch',
+                             'json': {'questions': [f"{question} (batch {i})" for question in QUESTIONS]}}),
+        RouteCase('rag.cache_stats', 'GET /api/rag/cache',
+                  lambda i: {'path': '/api/rag/cache'}),
+        RouteCase('rag.cache_invalidate', 'POST /api/rag/cache/invalidate',
+                  lambda i: {'method': 'POST', 'path': '/api/rag/cache/invalidate'}),
+    ]
+
+
+def measure_route(app, case: RouteCase, warmup: int, requests: int, concurrency: int) -> Dict[str, Any]:
+    if case.setup:
+        case.setup()
+    client = app.test_client()
+    errors = 0
+    index = 0
+    for _ in range(warmup):
+        errors += not case.call(client, case.build(index))
+        index += 1
+
+    # Requests are built up front so only the route itself is timed
+    sequential = [case.build(index + i) for i in range(requests)]
+    index += requests
+    samples = []
+    for request in sequential:
+        started = time.perf_counter()
+        errors += not case.call(client, request)
+        samples.append(time.perf_counter() - started)
+
+    concurrent = [case.build(index + i) for i in range(requests)]
+    clients = [app.test_client() for _ in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = list(pool.map(lambda pair: case.call(clients[pair[0] % concurrency], pair[1]), enumerate(concurrent)))
+    elapsed = time.perf_counter() - started
+    errors += ok.count(False)
+
+    return {
+        'kind': 'route',
+        'route': case.route,
+        'requests': requests,
+        'concurrency': concurrency,
+        **latency_summary(samples),
+        'throughput_rps': requests / elapsed,
+        'errors': errors
+    }
+
+
+def route_coverage(app, cases: List[RouteCase]) -> Dict[str, List[str]]:
+    """Every plans/knowledge route as 'METHOD rule', and those no case exercises"""
+    routes = sorted(
+        f"{method} {rule.rule}"
+        for rule in app.url_map.iter_rules() if rule.endpoint.startswith(ROUTE_ENDPOINTS)
+        for method in rule.methods - {'HEAD', 'OPTIONS'}
+    )
+    covered = {case.route for case in cases}
+    return {'routes': routes, 'uncovered': [route for route in routes if route not in covered]}
+
+
+def run_routes(args) -> Dict[str, Any]:
+    if args.dynamodb_endpoint:
+        stand_in = contextlib.nullcontext()
+    else:
+        from moto import mock_aws
+        stand_in = mock_aws()
+
+    with stand_in:
+        from app import app
+        from infrastructure.db.dynamodb import DynamoDBConnection
+        from infrastructure.db.setup_tables import ensure_plans_table
+
+        ensure_plans_table(DynamoDBConnection().dynamodb.meta.client)
+        seed_knowledge_base(args.documents)
+        plans = seed_plans(args.plans, args.milestones, 'Benchmark plan')
+        cases = route_cases(args, plans)
+        if args.only:
+            cases = [case for case in cases if any(case.name.startswith(prefix) for prefix in args.only)]
+        results = {}
+        for case in cases:
+            print(f"Measuring {case.name}", file=sys.stderr)
+            results[f"route:{case.name}"] = measure_route(app, case, args.warmup, args.requests, args.concurrency)
+        return {'results': results, 'coverage': route_coverage(app, cases)}
+
+
+def measure_micro(fn: Callable[[], Any], repeat: int, min_seconds: float) -> Dict[str, Any]:
+    """Per-call time over `repeat` rounds, each looping long enough to time reliably"""
+    timer = timeit.Timer(fn)
+    loops = 1
+    while timer.timeit(loops) < min_seconds:
+        loops *= 2
+    rounds = [t / loops * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        'kind': 'micro',
+        'loops': loops,
+        'repeat': repeat,
+        'min_us': min(rounds),
+        'median_us': statistics.median(rounds),
+        'max_us': max(rounds)
+    }
+
+
+def answer_text(n_points: int, seed: int = 0) -> str:
+    """A long knowledge base answer with the headers, lists and emphasis format_answer handles"""
+    from benchmarks.retrieval_benchmark import synthetic_corpus
+
+    rng = random.Random(seed)
+    words = list(synthetic_corpus(1, seed))[0][0].split()
+    lines = ['Based on the retrieved procedures, the requirements are:', '']
+    for i in range(n_points):
+        lines.append(f"{i + 1}. {' '.join(rng.sample(words, 8)).capitalize()}")
+        lines.append(f"**{' '.join(rng.sample(words, 3))}**")
+        lines.append(f"* {' '.join(rng.sample(words, 10))}")
+        lines.append(f"{' '.join(rng.sample(words, 6)).capitalize()}:")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def run_micro(args) -> Dict[str, Any]:
+    from api.services import KnowledgeBaseService
+    from api.services.plangeneration import extract_json
+    from benchmarks.fixtures import make_generated_plan, make_plan_details, make_plan_item, make_plan_model
+    from infrastructure.utils import StreamingJSONObjectParser
+    from infrastructure.utils.json_helper import decimal_to_float, dumps_json
+
+    item = make_plan_item(args.micro_milestones)
+    details = make_plan_details(args.micro_milestones)
+    model = make_plan_model(args.micro_milestones)
+    # format_answer only depends on format_line, so skip building the retriever and model
+    kb_service = KnowledgeBaseService.__new__(KnowledgeBaseService)
+    answer = answer_text(args.answer_points)
+    llm_response = (
+        "Here is the turnaround plan you asked for.\n```json\n"
+        + json.dumps(make_generated_plan(args.micro_milestones), indent=2)
+        + "\n```\nLet me know if any section needs more detail."
+    )
+    chunks = [llm_response[i:i + 16] for i in range(0, len(llm_response), 16)]
+
+    def stream_parse():
+        parser = StreamingJSONObjectParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+
+    benchmarks = {
+        'decimal_to_float': lambda: decimal_to_float(item),
+        'convert_floats_to_decimal': lambda: model._convert_floats_to_decimal(details),
+        'format_answer': lambda: kb_service.format_answer(answer),
+        'dumps_json': lambda: dumps_json(item),
+        'extract_json': lambda: extract_json(llm_response),
+        'stream_parse_json': stream_parse
+    }
+    sizes = {
+        'decimal_to_float': len(dumps_json(item)),
+        'convert_floats_to_decimal': len(json.dumps(details)),
+        'format_answer': len(answer),
+        'dumps_json': len(dumps_json(item)),
+        'extract_json': len(llm_response),
+        'stream_parse_json': len(llm_response)
+    }
+    return {
+        f"micro:{name}": {**measure_micro(fn, args.repeat, args.min_seconds), 'input_bytes': sizes[name]}
+        for name, fn in benchmarks.items()
+        if not args.only or any(f"micro.{name}".startswith(prefix) for prefix in args.only)
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    params = {
+        key: value for key, value in vars(args).items()
+        if key not in ('output', 'compare', 'threshold', 'fail_on_regression', 'total_requests')
+    }
+    report = {
+        'suite': 'backend',
+        'schemaVersion': SCHEMA_VERSION,
+        'createdAt': datetime.now(timezone.utc).isoformat(),
+        'environment': environment_info(args.dynamodb_endpoint),
+        'params': params,
+        'results': {}
+    }
+    if not args.skip_routes:
+        routes = run_routes(args)
+        report['results'].update(routes['results'])
+        report['coverage'] = routes['coverage']
+    if not args.skip_micro:
+        report['results'].update(run_micro(args))
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=10, help='timed requests per route, per phase')
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='seconds per fake model call')
+    parser.add_argument('--plans', type=int, default=50, help='plans stored before the routes run')
+    parser.add_argument('--milestones', type=int, default=10, help='milestones per stored plan')
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=10, help='ids per batch-get/batch-delete')
+    parser.add_argument('--simulation-iterations', type=int, default=2000)
+    parser.add_argument('--documents', type=int, default=2000, help='knowledge base chunks')
+    parser.add_argument('--dynamodb-endpoint',
+                        help='use this DynamoDB (e.g. a fresh DynamoDB Local) instead of moto')
+    parser.add_argument('--micro-milestones', type=int, default=200, help='milestones in the micro-benchmark plan')
+    parser.add_argument('--answer-points', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='minimum time per micro-benchmark round')
+    parser.add_argument('--only', nargs='*', help="benchmark name prefixes, e.g. plans.get rag micro.extract")
+    parser.add_argument('--skip-routes', action='store_true')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--output', help='also write the results to this file')
+    parser.add_argument('--compare', help='baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent change counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+    args.total_requests = args.warmup + 2 * args.requests
+
+    index_dir = tempfile.TemporaryDirectory(prefix='benchmark-index-')
+    configure_environment(args.llm_latency, index_dir.name, args.dynamodb_endpoint)
+    try:
+        report = run(args)
+    finally:
+        index_dir.cleanup()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = compare(json.load(f), report, args.threshold)
+    print(json.dumps(report, indent=2))
+    if args.fail_on_regression and report.get('comparison', {}).get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# gunicorn.conf.py
+"""Production serving profile.
+
+    gunicorn -c gunicorn.conf.py
+
+Pre-fork workers (WEB_WORKERS), each running WEB_THREADS threads. Requests spend most of their time waiting on Bedrock
+and DynamoDB, so threads keep a worker busy while it waits and workers
+spread the CPU-bound parts (JSON, scoring, retrieval) across cores.
+
+The app is imported once in the master (preload_app) and every worker
+then builds its own AWS clients and logging thread after fork. On
+SIGTERM a worker stops reporting ready but keeps serving while queued and
+running plan generations finish (up to SHUTDOWN_DRAIN_SECONDS, and for at
+least SHUTDOWN_NOTICE_SECONDS), and only then stops accepting requests.
+
+Several workers need shared state. A plan generation runs in the worker
+that accepted it, so its job record (JOB_STORE_URL) and the
+Idempotency-Key records (IDEMPOTENCY_CACHE_URL) must live in Redis or
+DynamoDB for a poll or retry that lands on another worker, or arrives
+after the worker was recycled, to find them. The plan cache
+(PLAN_CACHE_URL) must be shared too: an update or delete only
+invalidates the cache it runs against, so other workers would keep
+serving the old plan, and 304s for it, until the entry expired. With any
+of them left on memory:// the server runs a single worker, and asking for
+more is refused at startup.
+
+Metrics are kept per worker too. Set METRICS_MULTIPROC_DIR so that
+/metrics, whichever worker answers it, reports every worker's counts;
+without it a scrape through the shared port sees one arbitrary worker.
+"""
+
+import os
+
+from infrastructure.cache import is_process_local
+from infrastructure.config import (
+    IDEMPOTENCY_CACHE_URL, JOB_STORE_URL, PLAN_CACHE_URL, SHUTDOWN_DRAIN_SECONDS, SHUTDOWN_NOTICE_SECONDS,
+    WEB_BIND, WEB_THREADS, WEB_TIMEOUT_SECONDS, WEB_WORKERS
+)
+
+_local_stores = [
+    name for name, url in (
+        ('JOB_STORE_URL', JOB_STORE_URL),
+        ('IDEMPOTENCY_CACHE_URL', IDEMPOTENCY_CACHE_URL),
+        ('PLAN_CACHE_URL', PLAN_CACHE_URL)
+    )
+    if is_process_local(url)
+]
+if WEB_WORKERS > 1 and _local_stores:
+    raise RuntimeError(
+        f"WEB_WORKERS={WEB_WORKERS} needs shared job records, idempotency records and plan cache, "
+        f"but {', '.join(_local_stores)} {'is' if len(_local_stores) == 1 else 'are'} memory://"
+    )
+
+wsgi_app = 'app:app'
+bind = WEB_BIND
+workers = WEB_WORKERS or (1 if _local_stores else os.cpu_count() or 1)
+worker_class = 'gthread'
+threads = WEB_THREADS
+timeout = WEB_TIMEOUT_SECONDS
+# Drain and notice time plus a margin for requests still in flight
+graceful_timeout = int(SHUTDOWN_DRAIN_SECONDS + SHUTDOWN_NOTICE_SECONDS) + 10
+keepalive = 5
+preload_app = True
+# Recycle workers now and then so memory growth cannot accumulate;
+# jitter keeps them from restarting together
+max_requests = 10000
+max_requests_jitter = 1000
+accesslog = '-'
+
+
+def on_starting(server):
+    # Snapshots left by a previous run would be counted again
+    from infrastructure.metrics import multiprocess
+    multiprocess.clear()
+
+
+def post_fork(server, worker):
+    from infrastructure.lifecycle import after_fork
+    after_fork()
+
+
+def post_worker_init(worker):
+    # gunicorn's own SIGTERM handler stops accepting requests at once, so
+    # the load balancer would never see the worker draining. Replace it:
+    # drain first, while serving, then hand over to gunicorn's exit
+    import signal
+    from infrastructure.lifecycle import begin_drain
+
+    def handle_term(signum, frame):
+        begin_drain(lambda: worker.handle_exit(signum, frame), SHUTDOWN_DRAIN_SECONDS)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def worker_exit(server, worker):
+    # Exits without SIGTERM (max_requests recycling) still finish their
+    # jobs; after a signal the drain has already run and this returns
+    from infrastructure.lifecycle import drain
+    from infrastructure.metrics import multiprocess
+    drain(SHUTDOWN_DRAIN_SECONDS)
+    multiprocess.stop()
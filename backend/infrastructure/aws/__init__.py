@@ -0,0 +1 @@
+from .clients import AWSClientRegistry, aws_clients, get_client, get_resource, get_session
\ No newline at end of file
@@ -0,0 +1,109 @@
+# infrastructure/aws/clients.py
+
+import threading
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from infrastructure.config import AWS_PROFILE, AWS_REGION
+from infrastructure.metrics import instrument_session
+
+logger = logging.getLogger(__name__)
+
+
+class AWSClientRegistry:
+    """Process-wide boto3 session plus the clients and resources built from it.
+
+    Creating a session loads credentials and botocore's service models, and
+    each client carries its own connection pool, so everything here is
+    built once on first use and shared. Clients are thread-safe; creation
+    is serialized because sessions are not. Call reset() in a forked child
+    so it does not reuse the parent's sockets.
+    """
+
+    def __init__(self, profile_name: Optional[str] = AWS_PROFILE, region_name: str = AWS_REGION):
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self._lock = threading.RLock()
+        self._session: Optional[boto3.Session] = None
+        self._clients: Dict[Tuple, Any] = {}
+        self._resources: Dict[Tuple, Any] = {}
+
+    def session(self) -> boto3.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    # An empty AWS_PROFILE falls back to the default credential chain
+                    session = boto3.Session(profile_name=self.profile_name or None)
+                    # Before any client exists, so every client inherits the hooks
+                    instrument_session(session)
+                    self._session = session
+        return self._session
+
+    def client(self, service_name: str, region_name: Optional[str] = None,
+               endpoint_url: Optional[str] = None, max_pool_connections: Optional[int] = None,
+               max_attempts: Optional[int] = None):
+        key = (service_name, region_name or self.region_name, endpoint_url, max_pool_connections, max_attempts)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    logger.info(f"Creating {service_name} client")
+                    config = {}
+                    if max_pool_connections:
+                        config['max_pool_connections'] = max_pool_connections
+                    if max_attempts:
+                        config['retries'] = {'max_attempts': max_attempts, 'mode': 'standard'}
+                    client = self.session().client(
+                        service_name,
+                        region_name=key[1],
+                        endpoint_url=endpoint_url,
+                        config=Config(**config) if config else None
+                    )
+                    self._clients[key] = client
+        return client
+
+    def resource(self, service_name: str, region_name: Optional[str] = None,
+                 endpoint_url: Optional[str] = None):
+        key = (service_name, region_name or self.region_name, endpoint_url)
+        resource = self._resources.get(key)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(key)
+                if resource is None:
+                    logger.info(f"Creating {service_name} resource")
+                    resource = self.session().resource(service_name, region_name=key[1], endpoint_url=endpoint_url)
+                    self._resources[key] = resource
+        return resource
+
+    def reset(self) -> None:
+        """Forget every session, client and resource; the next call rebuilds them"""
+        with self._lock:
+            self._session = None
+            self._clients.clear()
+            self._resources.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'session': self._session is not None,
+            'clients': sorted({key[0] for key in self._clients}),
+            'resources': sorted({key[0] for key in self._resources})
+        }
+
+
+aws_clients = AWSClientRegistry()
+
+
+def get_session() -> boto3.Session:
+    return aws_clients.session()
+
+
+def get_client(service_name: str, **kwargs):
+    return aws_clients.client(service_name, **kwargs)
+
+
+def get_resource(service_name: str, **kwargs):
+    return aws_clients.resource(service_name, **kwargs)
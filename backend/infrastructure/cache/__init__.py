@@ -0,0 +1,2 @@
+from .backends import CacheBackend, DynamoDBCacheBackend, InMemoryCacheBackend, RedisCacheBackend, create_cache_backend, is_process_local
+from .plan_cache import CachedPlan, PlanCache
\ No newline at end of file
@@ -0,0 +1,286 @@
+# infrastructure/cache/backends.py
+
+import json
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Base class for key/value caches with per-entry TTL and hit/miss counters.
+
+    Values must be JSON-serializable so that every backend, including the
+    shared ones, can store them.
+    """
+
+    def __init__(self, namespace: str, default_ttl: Optional[int] = None):
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        value = self._get(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value; ttl (seconds) falls back to the backend default"""
+        self._set(key, value, ttl if ttl is not None else self.default_ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value only if the key is absent (or expired), atomically
+        across every process sharing the backend; returns whether it was stored"""
+        return self._add(key, value, ttl if ttl is not None else self.default_ttl)
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, prefix: str = '') -> int:
+        """Remove every entry whose key starts with prefix; returns the count removed"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self).__name__,
+                'namespace': self.namespace,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def _add(self, key: str, value: Any, ttl: Optional[int]) -> bool:
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local LRU cache bounded by entry count"""
+
+    def __init__(self, namespace: str, max_entries: int = 1024, default_ttl: Optional[int] = None):
+        super().__init__(namespace, default_ttl)
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple[Optional[float], Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _add(self, key: str, value: Any, ttl: Optional[int]) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str = '') -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update({
+                'size': len(self._entries),
+                'maxEntries': self.max_entries,
+                'evictions': self.evictions
+            })
+        return stats
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by all workers through Redis.
+
+    Entries expire through Redis key TTLs. Size-bounded LRU eviction is
+    enforced by the server and should be configured with
+    maxmemory / maxmemory-policy allkeys-lru.
+    """
+
+    def __init__(self, url: str, namespace: str, default_ttl: Optional[int] = None):
+        super().__init__(namespace, default_ttl)
+        # Imported lazily so the in-memory backend works without redis installed
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            # A cache outage should degrade to a miss, not fail the request
+            logger.error(f"Redis cache get failed: {str(e)}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        try:
+            self.client.set(self._key(key), json.dumps(value), ex=ttl or None)
+        except Exception as e:
+            logger.error(f"Redis cache set failed: {str(e)}")
+
+    def _add(self, key: str, value: Any, ttl: Optional[int]) -> bool:
+        try:
+            return bool(self.client.set(self._key(key), json.dumps(value), ex=ttl or None, nx=True))
+        except Exception as e:
+            # Treated as stored: the caller goes ahead rather than waiting on a claim nobody holds
+            logger.error(f"Redis cache add failed: {str(e)}")
+            return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def clear(self, prefix: str = '') -> int:
+        removed = 0
+        batch = []
+        for key in self.client.scan_iter(match=f"{self._key(prefix)}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                removed += self.client.delete(*batch)
+                batch = []
+        if batch:
+            removed += self.client.delete(*batch)
+        return removed
+
+
+class DynamoDBCacheBackend(CacheBackend):
+    """Durable cache in a DynamoDB table, for entries worth keeping across deploys.
+
+    Items are {key, value (JSON string), expiresAt (epoch seconds)}; the
+    table's TTL attribute should be expiresAt. TTL deletion is lazy, so
+    expiry is also checked on read. Create the table with
+    python -m infrastructure.db.setup_tables --cache-table.
+    """
+
+    def __init__(self, table_name: str, namespace: str, default_ttl: Optional[int] = None):
+        super().__init__(namespace, default_ttl)
+        # Imported lazily to keep the cache package free of the data layer
+        from infrastructure.db.dynamodb import DynamoDBConnection
+        self.table = DynamoDBConnection().get_table(table_name)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _get(self, key: str) -> Optional[Any]:
+        try:
+            item = self.table.get_item(Key={'key': self._key(key)}).get('Item')
+        except Exception as e:
+            logger.error(f"DynamoDB cache get failed: {str(e)}")
+            return None
+        if item is None or ('expiresAt' in item and item['expiresAt'] <= time.time()):
+            return None
+        return json.loads(item['value'])
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        item = {'key': self._key(key), 'value': json.dumps(value)}
+        if ttl:
+            item['expiresAt'] = int(time.time() + ttl)
+        try:
+            self.table.put_item(Item=item)
+        except Exception as e:
+            logger.error(f"DynamoDB cache set failed: {str(e)}")
+
+    def _add(self, key: str, value: Any, ttl: Optional[int]) -> bool:
+        item = {'key': self._key(key), 'value': json.dumps(value)}
+        if ttl:
+            item['expiresAt'] = int(time.time() + ttl)
+        try:
+            # An item past its expiresAt but not yet deleted by TTL counts as absent
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(#key) OR expiresAt <= :now',
+                ExpressionAttributeNames={'#key': 'key'},
+                ExpressionAttributeValues={':now': int(time.time())}
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+        except Exception as e:
+            logger.error(f"DynamoDB cache add failed: {str(e)}")
+            return True
+
+    def delete(self, key: str) -> None:
+        self.table.delete_item(Key={'key': self._key(key)})
+
+    def clear(self, prefix: str = '') -> int:
+        kwargs: Dict[str, Any] = {
+            'ProjectionExpression': '#key',
+            'FilterExpression': 'begins_with(#key, :prefix)',
+            'ExpressionAttributeNames': {'#key': 'key'},
+            'ExpressionAttributeValues': {':prefix': self._key(prefix)}
+        }
+        removed = 0
+        with self.table.batch_writer() as batch:
+            while True:
+                response = self.table.scan(**kwargs)
+                for item in response.get('Items', []):
+                    batch.delete_item(Key={'key': item['key']})
+                    removed += 1
+                if 'LastEvaluatedKey' not in response:
+                    return removed
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def is_process_local(url: str) -> bool:
+    """Whether a cache URL names a store that each process keeps to itself"""
+    return url.startswith('memory://')
+
+
+def create_cache_backend(url: str, namespace: str, max_entries: int = 1024,
+                         default_ttl: Optional[int] = None) -> CacheBackend:
+    """Build a cache backend from a URL: memory://, redis[s]://host:port/db or dynamodb://TableName"""
+    if is_process_local(url):
+        return InMemoryCacheBackend(namespace, max_entries=max_entries, default_ttl=default_ttl)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisCacheBackend(url, namespace, default_ttl=default_ttl)
+    if url.startswith('dynamodb://'):
+        return DynamoDBCacheBackend(url[len('dynamodb://'):], namespace, default_ttl=default_ttl)
+    raise ValueError(f"Unsupported cache URL: {url}")
@@ -0,0 +1,95 @@
+# infrastructure/cache/plan_cache.py
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from infrastructure.cache.backends import CacheBackend
+from infrastructure.utils.fieldsets import FieldTree, fields_key, select_fields
+from infrastructure.utils.json_helper import dumps_json
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPlan:
+    """An encoded plan response body together with its strong ETag"""
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+
+class PlanCache:
+    """Read-through cache of encoded plan responses.
+
+    Entries hold the JSON bytes the route sends, so a hit costs neither a
+    DynamoDB read nor an encode. Writers must call invalidate() after
+    changing or deleting a plan. A read racing an update can re-cache the
+    old version, which the backend TTL bounds.
+
+    Sparse fieldset responses (?fields=) are cached alongside the full body
+    in the same entry, so invalidate() drops them together; each has its
+    own ETag. Only max_variants distinct selections are kept per plan.
+    """
+
+    def __init__(self, backend: CacheBackend, max_variants: int = 8):
+        self.backend = backend
+        self.max_variants = max_variants
+
+    @staticmethod
+    def make_etag(item: Dict[str, Any]) -> str:
+        """Strong validator: changes whenever the plan's updatedAt changes"""
+        version = f"{item['id']}:{item.get('createdAt', '')}:{item.get('updatedAt', '')}"
+        return hashlib.sha1(version.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def variant_etag(etag: str, key: str) -> str:
+        """ETag of a sparse fieldset response: differs per selection and per plan version"""
+        return hashlib.sha1(f"{etag}:{key}".encode('utf-8')).hexdigest()
+
+    def get(self, plan_id: str, fields: Optional[FieldTree] = None) -> Optional[CachedPlan]:
+        entry = self.backend.get(plan_id)
+        if entry is None:
+            return None
+        if not fields:
+            return CachedPlan(entry['body'].encode('utf-8'), entry['etag'])
+
+        key = fields_key(fields)
+        body = entry.get('variants', {}).get(key)
+        if body is None:
+            # Pruned from the cached full body, then kept for the next request
+            item = json.loads(entry['body'])
+            return self._add_variant(entry, item, fields, key)
+        return CachedPlan(body.encode('utf-8'), self.variant_etag(entry['etag'], key))
+
+    def put(self, item: Dict[str, Any], fields: Optional[FieldTree] = None) -> CachedPlan:
+        """Encode a plan item once and cache the result; with fields, returns that selection"""
+        cached = CachedPlan(dumps_json(item), self.make_etag(item))
+        entry = {'body': cached.body.decode('utf-8'), 'etag': cached.etag}
+        if fields:
+            return self._add_variant(entry, item, fields, fields_key(fields), store=True)
+        self.backend.set(item['id'], entry)
+        return cached
+
+    def _add_variant(self, entry: Dict[str, Any], item: Dict[str, Any], fields: FieldTree,
+                     key: str, store: bool = False) -> CachedPlan:
+        body = dumps_json(select_fields(item, fields))
+        variants = entry.get('variants', {})
+        if len(variants) < self.max_variants:
+            # A new dict, so a concurrent reader of the old entry is unaffected
+            entry = {**entry, 'variants': {**variants, key: body.decode('utf-8')}}
+            store = True
+        if store:
+            self.backend.set(item['id'], entry)
+        return CachedPlan(body, self.variant_etag(entry['etag'], key))
+
+    def invalidate(self, plan_id: str) -> None:
+        try:
+            self.backend.delete(plan_id)
+        except Exception as e:
+            # The TTL still bounds staleness if the shared backend is unreachable
+            logger.error(f"Failed to invalidate cached plan {plan_id}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
@@ -9,7 +9,175 @@ load_dotenv()
 AWS_PROFILE = os.getenv('AWS_PROFILE', 'PrecisionTurn-Dev')
 AWS_REGION = os.getenv('AWS_REGION', 'us-east-2')
 
+# DynamoDB endpoint override, e.g. http://localhost:8000 for DynamoDB Local
+DYNAMODB_ENDPOINT_URL = os.getenv('DYNAMODB_ENDPOINT_URL') or None
+# HTTP connections the asyncio client keeps open, i.e. DynamoDB calls in flight per process
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.getenv('DYNAMODB_MAX_POOL_CONNECTIONS', '64'))
+
 # DynamoDB Tables
 DYNAMODB_TABLES = {
-    'PLANS': 'TurnaroundPlans'
-}
\ No newline at end of file
+    'PLANS': 'TurnaroundPlans',
+    'GENERATION_CACHE': 'PlanGenerationCache'
+}
+
+# Global secondary indexes per table, in the order the query planner prefers them
+DYNAMODB_INDEXES = {
+    'PLANS': {
+        'plantType-createdAt-index': {'partition_key': 'plantType', 'sort_key': 'createdAt'},
+        'status-createdAt-index': {'partition_key': 'status', 'sort_key': 'createdAt'}
+    }
+}
+
+# Plan generation job queue
+PLAN_JOB_WORKERS = int(os.getenv('PLAN_JOB_WORKERS', '4'))
+PLAN_JOB_QUEUE_SIZE = int(os.getenv('PLAN_JOB_QUEUE_SIZE', '32'))
+PLAN_JOB_RESULT_TTL_SECONDS = int(os.getenv('PLAN_JOB_RESULT_TTL_SECONDS', '3600'))
+# Where job records are shared so any server worker can answer a poll
+# (redis:// or dynamodb://); memory:// keeps them in the worker that ran the job
+JOB_STORE_URL = os.getenv('JOB_STORE_URL', 'memory://')
+
+# Knowledge base
+KNOWLEDGE_BASE_ID = os.getenv('KNOWLEDGE_BASE_ID', 'TVZXIOTZ7U')
+
+# Knowledge base answer cache (memory:// or redis://host:port/db)
+RAG_CACHE_URL = os.getenv('RAG_CACHE_URL', 'memory://')
+RAG_CACHE_TTL_SECONDS = int(os.getenv('RAG_CACHE_TTL_SECONDS', '21600'))
+RAG_CACHE_MAX_ENTRIES = int(os.getenv('RAG_CACHE_MAX_ENTRIES', '1024'))
+
+# POST /api/rag/batch: questions per request, and how many retrievals and
+# answer generations one request runs at once (generations also count
+# against the LLM gateway's per-model limit)
+RAG_BATCH_MAX_QUESTIONS = int(os.getenv('RAG_BATCH_MAX_QUESTIONS', '50'))
+RAG_BATCH_RETRIEVAL_CONCURRENCY = int(os.getenv('RAG_BATCH_RETRIEVAL_CONCURRENCY', '16'))
+RAG_BATCH_GENERATION_CONCURRENCY = int(os.getenv('RAG_BATCH_GENERATION_CONCURRENCY', '8'))
+
+# Knowledge base retrieval (bedrock = Bedrock Knowledge Bases, local = in-process vector index)
+RAG_RETRIEVER = os.getenv('RAG_RETRIEVER', 'bedrock')
+RAG_TOP_K = int(os.getenv('RAG_TOP_K', '4'))
+RAG_EMBEDDINGS = os.getenv('RAG_EMBEDDINGS', 'bedrock')
+RAG_EMBEDDING_MODEL = os.getenv('RAG_EMBEDDING_MODEL', 'amazon.titan-embed-text-v2:0')
+RAG_EMBEDDING_DIM = int(os.getenv('RAG_EMBEDDING_DIM', '1024'))
+LOCAL_INDEX_PATH = os.getenv('LOCAL_INDEX_PATH', 'data/vector_index')
+# 0 searches the whole matrix; >0 probes that many IVF lists
+LOCAL_INDEX_NPROBE = int(os.getenv('LOCAL_INDEX_NPROBE', '0'))
+
+# Read-through cache of encoded plan responses. Several workers need a
+# shared (redis://) backend so invalidations reach every worker; with
+# memory:// gunicorn runs a single worker.
+PLAN_CACHE_URL = os.getenv('PLAN_CACHE_URL', 'memory://')
+PLAN_CACHE_TTL_SECONDS = int(os.getenv('PLAN_CACHE_TTL_SECONDS', '300'))
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv('PLAN_CACHE_MAX_ENTRIES', '512'))
+# Distinct ?fields= selections cached per plan next to the full body
+PLAN_CACHE_MAX_VARIANTS = int(os.getenv('PLAN_CACHE_MAX_VARIANTS', '8'))
+
+# Plan generation: single (one prompt for the whole plan) or sectioned
+# (one concurrent prompt per plan section, each validated and retried alone)
+PLAN_GENERATION_MODE = os.getenv('PLAN_GENERATION_MODE', 'single')
+PLAN_SECTION_MAX_ATTEMPTS = int(os.getenv('PLAN_SECTION_MAX_ATTEMPTS', '3'))
+
+# Cache of generated plan bodies keyed on a hash of the generation inputs.
+# Empty disables it; memory://, redis://... or dynamodb://PlanGenerationCache
+PLAN_GENERATION_CACHE_URL = os.getenv('PLAN_GENERATION_CACHE_URL', '')
+PLAN_GENERATION_CACHE_TTL_SECONDS = int(os.getenv('PLAN_GENERATION_CACHE_TTL_SECONDS', '604800'))
+PLAN_GENERATION_CACHE_MAX_ENTRIES = int(os.getenv('PLAN_GENERATION_CACHE_MAX_ENTRIES', '256'))
+
+# Milestone schedules kept built per plan version for /schedule and what-if calls
+SCHEDULE_CACHE_MAX_ENTRIES = int(os.getenv('SCHEDULE_CACHE_MAX_ENTRIES', '128'))
+
+# Monte Carlo schedule/cost simulation (POST /api/plans/<id>/simulate)
+SIMULATION_DEFAULT_ITERATIONS = int(os.getenv('SIMULATION_DEFAULT_ITERATIONS', '10000'))
+SIMULATION_MAX_ITERATIONS = int(os.getenv('SIMULATION_MAX_ITERATIONS', '200000'))
+# Iterations sampled and propagated together; bounds memory at about
+# 3 * activities * batch * 8 bytes
+SIMULATION_BATCH_SIZE = int(os.getenv('SIMULATION_BATCH_SIZE', '8192'))
+
+# Versioned industry benchmark data used to score plan scope
+INDUSTRY_BENCHMARKS_PATH = os.getenv(
+    'INDUSTRY_BENCHMARKS_PATH',
+    os.path.join(os.path.dirname(__file__), 'data', 'industry_benchmarks.json')
+)
+# Most plans GET /api/plans/portfolio/analysis reads and scores in one call
+PORTFOLIO_MAX_PLANS = int(os.getenv('PORTFOLIO_MAX_PLANS', '2000'))
+
+# Idempotency-Key records for POST /api/plans/generate (shared backend for several workers)
+IDEMPOTENCY_CACHE_URL = os.getenv('IDEMPOTENCY_CACHE_URL', 'memory://')
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+
+# LLM provider (bedrock, or fake for offline runs with injected latency/throttling)
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'bedrock')
+LLM_FAKE_LATENCY_SECONDS = float(os.getenv('LLM_FAKE_LATENCY_SECONDS', '0.2'))
+LLM_FAKE_THROTTLE_RATE = float(os.getenv('LLM_FAKE_THROTTLE_RATE', '0'))
+# Concurrent calls the fake accepts before throttling; 0 = unlimited
+LLM_FAKE_CAPACITY = int(os.getenv('LLM_FAKE_CAPACITY', '0'))
+
+# LLM gateway: AIMD concurrency limit per model, retries and circuit breaker
+LLM_INITIAL_CONCURRENCY = int(os.getenv('LLM_INITIAL_CONCURRENCY', '4'))
+LLM_MIN_CONCURRENCY = int(os.getenv('LLM_MIN_CONCURRENCY', '1'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '32'))
+LLM_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv('LLM_ACQUIRE_TIMEOUT_SECONDS', '30'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '4'))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', '0.5'))
+LLM_BACKOFF_CAP_SECONDS = float(os.getenv('LLM_BACKOFF_CAP_SECONDS', '8'))
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', '5'))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv('LLM_BREAKER_RESET_SECONDS', '30'))
+
+# Per-stage timing histograms, AWS call/capacity/retry counters and LLM
+# token counts on /metrics, plus Server-Timing response headers. Off by
+# default; when off, instrumentation points are no-ops
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+# With several server workers each keeps its own metrics. Set a directory
+# (local to the host, emptied at server start) and every worker writes a
+# snapshot there every METRICS_FLUSH_SECONDS, so /metrics on any worker
+# reports the whole server. Unset, /metrics covers the answering worker only
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+
+# Logging: records are queued and written by a background thread.
+# LOG_FORMAT is text or json; messages longer than LOG_MAX_MESSAGE_CHARS
+# are cut. LOG_SAMPLE_RATES keeps only a fraction of DEBUG/INFO records
+# from high-volume loggers ("logger.prefix=0.1,other=0.5"); warnings and
+# errors are never sampled. A full queue drops records instead of blocking
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_MAX_MESSAGE_CHARS = int(os.getenv('LOG_MAX_MESSAGE_CHARS', '2000'))
+LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', 'infrastructure.db.repositories=0.1')
+
+# Production serving (gunicorn.conf.py). Each worker runs WEB_THREADS
+# request threads, which mostly wait on Bedrock and DynamoDB, so throughput
+# scales with cores and threads. WEB_WORKERS=0 means one per core when
+# JOB_STORE_URL, IDEMPOTENCY_CACHE_URL and PLAN_CACHE_URL are shared,
+# otherwise a single worker
+WEB_BIND = os.getenv('WEB_BIND', '0.0.0.0:8001')
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', '0'))
+WEB_THREADS = int(os.getenv('WEB_THREADS', '16'))
+# Longest a request may run; covers a streamed plan generation
+WEB_TIMEOUT_SECONDS = int(os.getenv('WEB_TIMEOUT_SECONDS', '180'))
+# On shutdown, how long queued and running plan generations get to finish
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv('SHUTDOWN_DRAIN_SECONDS', '120'))
+# On shutdown, the least time /health/ready reports draining while the
+# worker still serves; cover the load balancer's probe interval times its
+# unhealthy threshold so traffic moves away before the worker stops
+SHUTDOWN_NOTICE_SECONDS = float(os.getenv('SHUTDOWN_NOTICE_SECONDS', '10'))
+# How long /health/ready reuses its DynamoDB check
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv('HEALTH_CHECK_CACHE_SECONDS', '5'))
+CORS_ORIGINS = [origin.strip() for origin in os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')]
+
+# JSON responses at least COMPRESSION_MIN_BYTES long are sent with brotli
+# (when the brotli package is installed) or gzip, whichever the client
+# accepts; levels favour encode speed over the last few percent of size
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+
+
+class AppConfig:
+    """Flask settings applied by create_app(); the defaults are for production"""
+    DEBUG = False
+    TESTING = False
+    CORS_ORIGINS = CORS_ORIGINS
+
+
+class DevelopmentConfig(AppConfig):
+    DEBUG = True
@@ -0,0 +1 @@
+from .benchmark_index import BenchmarkIndex, get_benchmark_index
\ No newline at end of file
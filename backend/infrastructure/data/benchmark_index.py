@@ -0,0 +1,187 @@
+# infrastructure/data/benchmark_index.py
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from infrastructure.config import INDUSTRY_BENCHMARKS_PATH
+
+logger = logging.getLogger(__name__)
+
+# A plan is realistic when both its cost per day and its duration fall in
+# the benchmark's p10-p90 band for its plant type and size
+REALISTIC_BAND = (10.0, 90.0)
+
+
+class BenchmarkIndex:
+    """Industry benchmark distributions precomputed into lookup arrays.
+
+    Loaded from a versioned JSON file (see industry_benchmarks.json) into
+    arrays indexed [plant type, size class, percentile], so any number of
+    plans is scored with a handful of array operations. Plant types are
+    matched case-insensitively and through aliases; unknown types are
+    scored against fallbackPlantType and flagged rather than raising.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = str(data['version'])
+        self.currency = data.get('currency', 'USD')
+        self.percentiles = np.array(data['percentiles'], dtype=float)
+        self.size_classes: List[str] = list(data['sizeClasses'])
+        self.plant_types: List[str] = list(data['plantTypes'])
+        self.display_names = [data['plantTypes'][name].get('displayName', name) for name in self.plant_types]
+        self._ids = {name.lower(): i for i, name in enumerate(self.plant_types)}
+        for alias, name in (data.get('aliases') or {}).items():
+            self._ids[alias.lower()] = self._ids[name.lower()]
+        self.fallback_id = self._ids[data['fallbackPlantType'].lower()]
+
+        shape = (len(self.plant_types), len(self.size_classes), len(self.percentiles))
+        self.cost_per_day = np.empty(shape)
+        self.duration_days = np.empty(shape)
+        self.size_bounds = np.empty((len(self.plant_types), len(self.size_classes) - 1))
+        self.safety_incident_rate = np.empty(len(self.plant_types))
+        for t, name in enumerate(self.plant_types):
+            entry = data['plantTypes'][name]
+            self.size_bounds[t] = entry['budgetSizeBounds']
+            self.safety_incident_rate[t] = entry['safetyIncidentRate']
+            for s, size in enumerate(self.size_classes):
+                self.cost_per_day[t, s] = entry['sizes'][size]['costPerDay']
+                self.duration_days[t, s] = entry['sizes'][size]['durationDays']
+        if np.any(np.diff(self.cost_per_day, axis=2) <= 0) or np.any(np.diff(self.duration_days, axis=2) <= 0):
+            raise ValueError(f"Benchmark percentiles must increase (version {self.version})")
+
+    @classmethod
+    def load(cls, path: str = INDUSTRY_BENCHMARKS_PATH) -> 'BenchmarkIndex':
+        with open(path) as f:
+            index = cls(json.load(f))
+        logger.info(f"Loaded industry benchmarks version {index.version} "
+                    f"({len(index.plant_types)} plant types) from {path}")
+        return index
+
+    def plant_type_ids(self, plant_types: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """(benchmark row per plan, whether the plan's own type was found)"""
+        ids = np.array([
+            self._ids.get(str(plant_type).strip().lower(), -1) if plant_type else -1
+            for plant_type in plant_types
+        ], dtype=np.intp)
+        matched = ids >= 0
+        return np.where(matched, ids, self.fallback_id), matched
+
+    def _percentile_rank(self, values: np.ndarray, grids: np.ndarray) -> np.ndarray:
+        """Where each value falls in its own row of percentile values, as 0-100.
+
+        Linear between tabulated percentiles; below the first and above the
+        last it is extrapolated linearly towards 0 and 100.
+        """
+        pct = self.percentiles
+        last = len(pct) - 1
+        k = (values[:, None] >= grids).sum(axis=1)
+        lo = np.take_along_axis(grids, np.clip(k - 1, 0, last)[:, None], axis=1)[:, 0]
+        hi = np.take_along_axis(grids, np.clip(k, 0, last)[:, None], axis=1)[:, 0]
+        inner = pct[np.clip(k - 1, 0, last)] + np.divide(
+            (values - lo) * (pct[np.clip(k, 0, last)] - pct[np.clip(k - 1, 0, last)]), hi - lo,
+            out=np.zeros_like(values), where=hi > lo
+        )
+        first, top = grids[:, 0], grids[:, last]
+        below = pct[0] * np.clip(values / first, 0, 1)
+        spread = top - grids[:, last // 2]
+        above = pct[last] + (100 - pct[last]) * np.clip(
+            np.divide(values - top, spread, out=np.ones_like(values), where=spread > 0), 0, 1
+        )
+        return np.where(k == 0, below, np.where(k > last, above, inner))
+
+    def score(self, plant_types: Sequence[Any], budgets: Sequence[Any],
+              durations: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """Score many plans at once; every result is an array aligned with the inputs.
+
+        Missing or non-positive budgets/durations yield NaN ranks and
+        realism and are never realistic.
+        """
+        type_ids, matched = self.plant_type_ids(plant_types)
+        budgets = np.array([_to_float(b) for b in budgets])
+        durations = np.array([_to_float(d) for d in durations])
+        valid = (budgets > 0) & (durations > 0)
+        safe_budgets = np.where(valid, budgets, 1.0)
+        safe_durations = np.where(valid, durations, 1.0)
+
+        size_ids = (safe_budgets[:, None] >= self.size_bounds[type_ids]).sum(axis=1)
+        cost_grid = self.cost_per_day[type_ids, size_ids]
+        duration_grid = self.duration_days[type_ids, size_ids]
+        daily_cost = safe_budgets / safe_durations
+
+        cost_rank = self._percentile_rank(daily_cost, cost_grid)
+        duration_rank = self._percentile_rank(safe_durations, duration_grid)
+        median = len(self.percentiles) // 2
+        low, high = REALISTIC_BAND
+        # 1 at the benchmark median, 0 at either extreme of whichever measure is further out
+        realism = 1 - np.maximum(np.abs(cost_rank - 50), np.abs(duration_rank - 50)) / 50
+        realistic = valid & (cost_rank >= low) & (cost_rank <= high) & \
+            (duration_rank >= low) & (duration_rank <= high)
+
+        nan = np.full(len(type_ids), np.nan)
+        return {
+            'typeIds': type_ids,
+            'matched': matched,
+            'sizeIds': size_ids,
+            'valid': valid,
+            'dailyCost': np.where(valid, daily_cost, nan),
+            'benchmarkDailyCost': cost_grid[:, median],
+            'benchmarkComparison': np.where(valid, daily_cost / cost_grid[:, median], nan),
+            'costPercentile': np.where(valid, cost_rank, nan),
+            'durationPercentile': np.where(valid, duration_rank, nan),
+            'typicalDuration': duration_grid[:, median],
+            'costBand': cost_grid[:, [0, -1]],
+            'durationBand': duration_grid[:, [0, -1]],
+            'realism': np.where(valid, realism, nan),
+            'realistic': realistic
+        }
+
+    def score_one(self, plant_type: Any, budget: Any, duration: Any) -> Dict[str, Any]:
+        """score() for a single plan, as plain Python values"""
+        scores = self.score([plant_type], [budget], [duration])
+        t, s = int(scores['typeIds'][0]), int(scores['sizeIds'][0])
+        return {
+            'benchmarkVersion': self.version,
+            'plantType': self.plant_types[t],
+            'plantTypeMatched': bool(scores['matched'][0]),
+            'sizeClass': self.size_classes[s],
+            'valid': bool(scores['valid'][0]),
+            'dailyCost': _nullable(scores['dailyCost'][0]),
+            'benchmarkDailyCost': float(scores['benchmarkDailyCost'][0]),
+            'benchmarkComparison': _nullable(scores['benchmarkComparison'][0]),
+            'costPercentile': _nullable(scores['costPercentile'][0]),
+            'durationPercentile': _nullable(scores['durationPercentile'][0]),
+            'typicalDuration': float(scores['typicalDuration'][0]),
+            'costBand': [float(v) for v in scores['costBand'][0]],
+            'durationBand': [float(v) for v in scores['durationBand'][0]],
+            'realism': _nullable(scores['realism'][0]),
+            'realistic': bool(scores['realistic'][0]),
+            'safetyIncidentRate': float(self.safety_incident_rate[t])
+        }
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+_index: Optional[BenchmarkIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_benchmark_index() -> BenchmarkIndex:
+    """The process-wide index, loaded from INDUSTRY_BENCHMARKS_PATH on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = BenchmarkIndex.load()
+        return _index
@@ -0,0 +1,76 @@
+# infrastructure/db/async_dynamodb.py
+import aioboto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from contextlib import AsyncExitStack
+import logging
+from typing import Dict, List, Optional
+from infrastructure.config import AWS_PROFILE, AWS_REGION, DYNAMODB_ENDPOINT_URL, DYNAMODB_MAX_POOL_CONNECTIONS
+from infrastructure.metrics import instrument_session
+
+logger = logging.getLogger(__name__)
+
+class AsyncDynamoDBConnection:
+    """asyncio DynamoDB resource over one pooled HTTP connection set.
+
+    Open it once per event loop (the ASGI lifespan does this) and share it;
+    every coroutine using it multiplexes over the same connection pool, so
+    up to max_pool_connections requests are in flight at once.
+    """
+
+    def __init__(self, max_pool_connections: int = DYNAMODB_MAX_POOL_CONNECTIONS,
+                 endpoint_url: Optional[str] = DYNAMODB_ENDPOINT_URL):
+        # An empty AWS_PROFILE falls back to the default credential chain
+        self.session = aioboto3.Session(profile_name=AWS_PROFILE or None)
+        instrument_session(self.session)
+        self.max_pool_connections = max_pool_connections
+        self.endpoint_url = endpoint_url
+        self.dynamodb = None
+        self._stack: Optional[AsyncExitStack] = None
+
+    async def open(self) -> 'AsyncDynamoDBConnection':
+        if self.dynamodb is not None:
+            return self
+        try:
+            self._stack = AsyncExitStack()
+            self.dynamodb = await self._stack.enter_async_context(self.session.resource(
+                'dynamodb',
+                region_name=AWS_REGION,
+                endpoint_url=self.endpoint_url,
+                config=Config(max_pool_connections=self.max_pool_connections)
+            ))
+            return self
+        except Exception as e:
+            logger.error(f"Failed to open async DynamoDB connection: {str(e)}")
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        stack, self._stack, self.dynamodb = self._stack, None, None
+        if stack is not None:
+            await stack.aclose()
+
+    async def __aenter__(self) -> 'AsyncDynamoDBConnection':
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_table(self, table_name: str):
+        """Get DynamoDB table by name"""
+        if self.dynamodb is None:
+            raise RuntimeError('AsyncDynamoDBConnection is not open')
+        return await self.dynamodb.Table(table_name)
+
+    async def execute_transaction(self, operations: List[Dict]):
+        """Execute a DynamoDB transaction (TransactWriteItems, up to 100 operations)"""
+        if self.dynamodb is None:
+            raise RuntimeError('AsyncDynamoDBConnection is not open')
+        try:
+            # The resource's client serializes plain Python values like Table does
+            return await self.dynamodb.meta.client.transact_write_items(
+                TransactItems=operations
+            )
+        except ClientError as e:
+            logger.error(f"Transaction failed: {str(e)}")
+            raise
@@ -1,9 +1,9 @@
 # infrastructure/db/dynamodb.py
-import boto3
 from botocore.exceptions import ClientError
 import logging
 from typing import Dict, List, Optional
-from infrastructure.config import AWS_PROFILE, AWS_REGION
+from infrastructure.aws import get_resource, get_session
+from infrastructure.config import DYNAMODB_ENDPOINT_URL
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +20,9 @@ class DynamoDBConnection:
     def _initialize(self):
         """Initialize DynamoDB connection"""
         try:
-            self.session = boto3.Session(profile_name=AWS_PROFILE)
-            self.dynamodb = self.session.resource('dynamodb', region_name=AWS_REGION)
+            # Shared with the rest of the process through the client registry
+            self.session = get_session()
+            self.dynamodb = get_resource('dynamodb', endpoint_url=DYNAMODB_ENDPOINT_URL)
         except Exception as e:
             logger.error(f"Failed to initialize DynamoDB connection: {str(e)}")
             raise
@@ -30,10 +31,10 @@ class DynamoDBConnection:
         """Get DynamoDB table by name"""
         return self.dynamodb.Table(table_name)
 
-    async def execute_transaction(self, operations: List[Dict]):
-        """Execute a DynamoDB transaction"""
+    def execute_transaction(self, operations: List[Dict]):
+        """Execute a DynamoDB transaction (blocking; see AsyncDynamoDBConnection for asyncio)"""
         try:
-            return await self.dynamodb.meta.client.transact_write_items(
+            return self.dynamodb.meta.client.transact_write_items(
                 TransactItems=operations
             )
         except ClientError as e:
@@ -3,8 +3,7 @@
 from typing import Dict, Any, Optional
 from datetime import datetime
 import uuid
-from decimal import Decimal
-from infrastructure.utils.json_helper import decimal_to_float
+from infrastructure.utils.json_helper import decimal_to_float, float_to_decimal
 
 class PlanModel:
     """Represents a Turnaround Plan in DynamoDB"""
@@ -25,13 +24,7 @@ class PlanModel:
 
     def _convert_floats_to_decimal(self, obj: Any) -> Any:
         """Recursively convert float values to Decimal"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._convert_floats_to_decimal(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_floats_to_decimal(item) for item in obj]
-        return obj
+        return float_to_decimal(obj)
 
     def to_dynamodb_item(self) -> Dict[str, Any]:
         """Convert to DynamoDB item format"""
@@ -39,10 +32,16 @@ class PlanModel:
             'id': self.id,
             'title': self.title,
             'status': self.status,
-            'details': self._convert_floats_to_decimal(self.details),
+            # Already converted in __init__ / update, so no second pass here
+            'details': self.details,
             'createdAt': self.created_at,
             'updatedAt': self.updated_at
         }
+        # Top-level copy of the plant type keys the plantType GSI; omitted
+        # when unknown so the plan simply stays out of that (sparse) index
+        plant_type = self.details.get('plantType')
+        if isinstance(plant_type, str) and plant_type:
+            dynamodb_item['plantType'] = plant_type
         return dynamodb_item
 
     def to_json(self) -> Dict[str, Any]:
@@ -52,12 +51,17 @@ class PlanModel:
     @classmethod
     def from_dynamodb_item(cls, item: Dict[str, Any]) -> 'PlanModel':
         """Create PlanModel from DynamoDB item"""
-        return cls(
+        plan = cls(
             title=item['title'],
             status=item['status'],
             details=item['details'],
             plan_id=item['id']
         )
+        # Keep the stored timestamps; createdAt is part of the table key and
+        # updatedAt is the plan version (ETag)
+        plan.created_at = item.get('createdAt', plan.created_at)
+        plan.updated_at = item.get('updatedAt', plan.updated_at)
+        return plan
 
     def update(self, updates: Dict[str, Any]) -> None:
         """Update plan attributes"""
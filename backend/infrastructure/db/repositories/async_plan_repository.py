@@ -0,0 +1,176 @@
+# infrastructure/db/repositories/async_plan_repository.py
+
+from typing import List, Optional, Dict, Any, Tuple
+from infrastructure.db.async_dynamodb import AsyncDynamoDBConnection
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import (
+    PlanConditionError, _deserialize_item, _chunks, encode_cursor, decode_cursor,
+    list_request, update_request
+)
+from infrastructure.config import DYNAMODB_TABLES, DYNAMODB_INDEXES
+from botocore.exceptions import ClientError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB limit on operations in one TransactWriteItems call
+TRANSACTION_SIZE = 100
+
+class AsyncPlanRepository:
+    """asyncio counterpart of PlanRepository over an AsyncDynamoDBConnection.
+
+    Builds the same query and update requests as the blocking repository,
+    so filters, cursors and conditions behave identically.
+    """
+
+    def __init__(self, db: AsyncDynamoDBConnection):
+        self.db = db
+        self.table_name = DYNAMODB_TABLES['PLANS']
+        self.indexes = DYNAMODB_INDEXES['PLANS']
+        self._table = None
+
+    async def table(self):
+        if self._table is None:
+            self._table = await self.db.get_table(self.table_name)
+        return self._table
+
+    async def create(self, plan: PlanModel) -> PlanModel:
+        """Save a new plan; refuses to overwrite an existing version"""
+        try:
+            item = plan.to_dynamodb_item()
+            logger.info(f"Saving plan {item['id']} to DynamoDB")
+            table = await self.table()
+            await table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(#id)',
+                ExpressionAttributeNames={'#id': 'id'}
+            )
+            return plan
+        except ClientError as e:
+            logger.error(f"ClientError in create: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to save plan: {str(e)}")
+            raise
+
+    async def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Latest version of a plan as a raw item"""
+        try:
+            table = await self.table()
+            response = await table.query(
+                KeyConditionExpression='id = :id',
+                ExpressionAttributeValues={':id': plan_id},
+                Limit=1,
+                ScanIndexForward=False  # Latest first
+            )
+            items = response.get('Items', [])
+            return items[0] if items else None
+        except Exception as e:
+            logger.error(f"Failed to retrieve plan: {str(e)}")
+            raise
+
+    async def list_page(self, limit: int = 50, cursor: Optional[str] = None, summary: bool = False,
+                        filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of raw plan items; see PlanRepository.list_page"""
+        try:
+            operation, request = list_request(self.indexes, filters or {}, summary)
+            table = await self.table()
+            read = table.query if operation == 'query' else table.scan
+
+            items: List[Dict[str, Any]] = []
+            start_key = decode_cursor(cursor)
+            while True:
+                kwargs: Dict[str, Any] = {**request, 'Limit': limit - len(items)}
+                if start_key:
+                    kwargs['ExclusiveStartKey'] = start_key
+
+                response = await read(**kwargs)
+                items.extend(response.get('Items', []))
+                start_key = response.get('LastEvaluatedKey')
+                if not start_key or len(items) >= limit:
+                    break
+
+            return items, encode_cursor(start_key)
+        except ValueError:
+            raise
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ValidationException' and cursor:
+                # Most likely a cursor issued for a different set of filters
+                raise ValueError('Invalid cursor for these filters')
+            logger.error(f"ClientError in list_page: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to list plans: {str(e)}")
+            raise
+
+    async def version_keys(self, plan_id: str) -> List[Dict[str, str]]:
+        """Primary keys of every stored version of a plan, newest first"""
+        table = await self.table()
+        kwargs: Dict[str, Any] = {
+            'KeyConditionExpression': '#id = :id',
+            'ProjectionExpression': '#id, #createdAt',
+            'ExpressionAttributeNames': {'#id': 'id', '#createdAt': 'createdAt'},
+            'ExpressionAttributeValues': {':id': plan_id},
+            'ScanIndexForward': False
+        }
+        keys: List[Dict[str, str]] = []
+        while True:
+            response = await table.query(**kwargs)
+            keys.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return keys
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    async def update(self, plan_id: str, updates: Dict[str, Any], created_at: Optional[str] = None,
+                     condition: Optional[Tuple[str, Dict[str, str], Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Apply a partial update with a single conditional UpdateItem; see PlanRepository.update"""
+        try:
+            if created_at is None:
+                versions = await self.version_keys(plan_id)
+                if not versions:
+                    return None
+                created_at = versions[0]['createdAt']
+
+            table = await self.table()
+            response = await table.update_item(**update_request(plan_id, created_at, updates, condition))
+            return response.get('Attributes')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                logger.error(f"ClientError in update: {str(e)}")
+                raise
+            old_item = e.response.get('Item')
+            if not old_item:
+                return None
+            raise PlanConditionError(plan_id, _deserialize_item(old_item))
+        except Exception as e:
+            logger.error(f"Failed to update plan: {str(e)}")
+            raise
+
+    async def transact_write(self, operations: List[Dict[str, Any]]) -> None:
+        """Run TransactWriteItems operations (Put / Update / Delete / ConditionCheck) atomically.
+
+        TableName may be omitted from each operation; it defaults to the
+        plans table.
+        """
+        # Copied, so the caller's operations are left as they were given
+        await self.db.execute_transaction([
+            {kind: {'TableName': self.table_name, **request} for kind, request in operation.items()}
+            for operation in operations
+        ])
+
+    async def delete(self, plan_id: str) -> bool:
+        """Delete every version of a plan in one transaction"""
+        try:
+            keys = await self.version_keys(plan_id)
+            if not keys:
+                logger.info(f"Plan {plan_id} not found")
+                return False
+            # Plans rarely have more than a few versions; beyond the
+            # transaction limit each chunk is atomic on its own
+            for chunk in _chunks(keys, TRANSACTION_SIZE):
+                await self.transact_write([{'Delete': {'Key': key}} for key in chunk])
+            logger.info(f"Deleted {len(keys)} versions of plan {plan_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete plan: {str(e)}")
+            raise
@@ -1,24 +1,221 @@
 # infrastructure/db/repositories/plan_repository.py
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from infrastructure.db.dynamodb import DynamoDBConnection
 from infrastructure.db.models.plan import PlanModel
-from infrastructure.config import DYNAMODB_TABLES
+from infrastructure.config import DYNAMODB_TABLES, DYNAMODB_INDEXES
+from infrastructure.logging_config import summarize_plan
+from infrastructure.metrics import stage
+from infrastructure.utils.json_helper import DecimalEncoder
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import json
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# Attributes fetched for list views (summary mode); everything else in details is skipped
+SUMMARY_PROJECTION = (
+    '#id, #title, #status, #createdAt, #updatedAt, #details.#budget, #details.#duration, #details.#plantType'
+)
+SUMMARY_ATTRIBUTE_NAMES = {
+    '#id': 'id',
+    '#title': 'title',
+    '#status': 'status',
+    '#createdAt': 'createdAt',
+    '#updatedAt': 'updatedAt',
+    '#details': 'details',
+    '#budget': 'budget',
+    '#duration': 'duration',
+    '#plantType': 'plantType'
+}
+
+# DynamoDB per-request limits for BatchGetItem / BatchWriteItem
+BATCH_GET_SIZE = 100
+BATCH_WRITE_SIZE = 25
+BATCH_MAX_RETRIES = 6
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+BATCH_BACKOFF_CAP_SECONDS = 2.0
+# Concurrent KeyConditionExpression lookups when callers only know plan ids
+KEY_LOOKUP_CONCURRENCY = 16
+
+class PlanConditionError(Exception):
+    """A conditional write was rejected; item holds the plan as stored"""
+
+    def __init__(self, plan_id: str, item: Dict[str, Any]):
+        super().__init__(f"Condition check failed for plan {plan_id}")
+        self.plan_id = plan_id
+        self.item = item
+
+def _deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a low-level (typed) item, as returned in error responses, to Python values"""
+    deserializer = TypeDeserializer()
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+def _backoff(attempt: int) -> None:
+    """Sleep with exponential backoff and full jitter"""
+    time.sleep(random.uniform(0, min(BATCH_BACKOFF_CAP_SECONDS, BATCH_BACKOFF_BASE_SECONDS * 2 ** attempt)))
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Wrap a DynamoDB LastEvaluatedKey in an opaque, URL-safe cursor"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, cls=DecimalEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, dict):
+        raise ValueError('Invalid cursor')
+    return key
+
+def plan_query(indexes: Dict[str, Dict[str, str]], filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Choose how to serve a filtered listing.
+
+    Returns ('query', kwargs) for the first of indexes whose partition key
+    has an equality filter, with any createdAt range pushed into the key
+    condition when it is the index sort key, or ('scan', kwargs) when no
+    index fits. Remaining filters become a
+    FilterExpression either way.
+    """
+    equality = {
+        attr: filters[attr] for attr in ('status', 'plantType')
+        if filters.get(attr) is not None
+    }
+    date_range = {bound: filters[bound] for bound in ('from', 'to') if filters.get(bound)}
+
+    names: Dict[str, str] = {}
+    values: Dict[str, Any] = {}
+    key_conditions: List[str] = []
+    filter_conditions: List[str] = []
+
+    def range_conditions(attr: str) -> List[str]:
+        if date_range:
+            names[f'#{attr}'] = attr
+        if 'from' in date_range and 'to' in date_range:
+            values[':from'], values[':to'] = date_range['from'], date_range['to']
+            return [f'#{attr} BETWEEN :from AND :to']
+        if 'from' in date_range:
+            values[':from'] = date_range['from']
+            return [f'#{attr} >= :from']
+        if 'to' in date_range:
+            values[':to'] = date_range['to']
+            return [f'#{attr} <= :to']
+        return []
+
+    index_name = next(
+        (name for name, keys in indexes.items() if keys['partition_key'] in equality),
+        None
+    )
+    if index_name:
+        keys = indexes[index_name]
+        partition_key = keys['partition_key']
+        names[f'#{partition_key}'] = partition_key
+        values[f':{partition_key}'] = equality.pop(partition_key)
+        key_conditions.append(f'#{partition_key} = :{partition_key}')
+        if keys.get('sort_key') == 'createdAt':
+            key_conditions.extend(range_conditions('createdAt'))
+        else:
+            filter_conditions.extend(range_conditions('createdAt'))
+    else:
+        filter_conditions.extend(range_conditions('createdAt'))
+
+    for attr, value in equality.items():
+        names[f'#{attr}'] = attr
+        values[f':{attr}'] = value
+        filter_conditions.append(f'#{attr} = :{attr}')
+
+    request: Dict[str, Any] = {'ExpressionAttributeNames': names}
+    if values:
+        request['ExpressionAttributeValues'] = values
+    if filter_conditions:
+        request['FilterExpression'] = ' AND '.join(filter_conditions)
+    if index_name:
+        request['IndexName'] = index_name
+        request['KeyConditionExpression'] = ' AND '.join(key_conditions)
+        request['ScanIndexForward'] = False  # Newest first
+        return 'query', request
+    if filter_conditions:
+        logger.info(f"No index fits filters {sorted(filters)}; falling back to scan")
+    return 'scan', request
+
+def list_request(indexes: Dict[str, Dict[str, str]], filters: Dict[str, Any],
+                 summary: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """plan_query plus the summary-mode projection, ready for query/scan"""
+    operation, request = plan_query(indexes, filters)
+    names = request.setdefault('ExpressionAttributeNames', {})
+    if summary:
+        request['ProjectionExpression'] = SUMMARY_PROJECTION
+        names.update(SUMMARY_ATTRIBUTE_NAMES)
+    if not names:
+        del request['ExpressionAttributeNames']
+    return operation, request
+
+def update_request(plan_id: str, created_at: str, updates: Dict[Union[str, Tuple[str, ...]], Any],
+                   condition: Optional[Tuple[str, Dict[str, str], Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """UpdateItem arguments writing only the given attribute paths.
+
+    updates maps paths to values. A path is an attribute name ('title') or
+    a tuple of segments (('details', 'scope')); each segment is used as a
+    name verbatim, so map keys may contain dots. condition is an optional
+    (expression, names, values) guard ANDed with the item existing.
+    """
+    names: Dict[str, str] = {'#id': 'id'}
+    values: Dict[str, Any] = {}
+    assignments = []
+    for i, (path, value) in enumerate(updates.items()):
+        placeholders = []
+        segments = (path,) if isinstance(path, str) else path
+        for j, segment in enumerate(segments):
+            names[f'#p{i}_{j}'] = segment
+            placeholders.append(f'#p{i}_{j}')
+        values[f':v{i}'] = value
+        assignments.append(f"{'.'.join(placeholders)} = :v{i}")
+
+    condition_expression = 'attribute_exists(#id)'
+    if condition:
+        expression, condition_names, condition_values = condition
+        condition_expression += f' AND ({expression})'
+        names.update(condition_names)
+        values.update(condition_values)
+
+    return {
+        'Key': {'id': plan_id, 'createdAt': created_at},
+        'UpdateExpression': 'SET ' + ', '.join(assignments),
+        'ConditionExpression': condition_expression,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ReturnValues': 'ALL_NEW',
+        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+    }
+
 class PlanRepository:
     def __init__(self):
         self.db = DynamoDBConnection()
         self.table = self.db.get_table(DYNAMODB_TABLES['PLANS'])
+        self.indexes = DYNAMODB_INDEXES['PLANS']
 
     def create(self, plan: PlanModel) -> PlanModel:
         """Save a new plan to DynamoDB"""
         try:
-            item = plan.to_dynamodb_item()
-            logger.info(f"Saving plan to DynamoDB: {item}")
+            with stage('plan.serialize'):
+                item = plan.to_dynamodb_item()
+            logger.info("Saving plan to DynamoDB: %s", summarize_plan(item))
             self.table.put_item(Item=item)
             return plan
         except ClientError as e:
@@ -28,8 +225,8 @@ class PlanRepository:
             logger.error(f"Failed to save plan: {str(e)}")
             raise
 
-    def get(self, plan_id: str) -> Optional[PlanModel]:
-        """Retrieve latest version of a plan by ID"""
+    def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Latest version of a plan as a raw item"""
         try:
             logger.info(f"Fetching plan with ID: {plan_id}")
             response = self.table.query(
@@ -40,65 +237,201 @@ class PlanRepository:
             )
             
             items = response.get('Items', [])
-            return PlanModel.from_dynamodb_item(items[0]) if items else None
-            
+            return items[0] if items else None
+
         except Exception as e:
             logger.error(f"Failed to retrieve plan: {str(e)}")
             raise
 
     def list(self, limit: int = 50) -> List[PlanModel]:
         """List all plans"""
+        items, _ = self.list_page(limit)
+        return [PlanModel.from_dynamodb_item(item) for item in items]
+
+    def list_page(self, limit: int = 50, cursor: Optional[str] = None, summary: bool = False,
+                  filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of raw plan items and the cursor for the next page.
+
+        filters may hold status, plantType and a createdAt range (from / to).
+        The query planner serves them from a secondary index when one fits and
+        falls back to a filtered scan otherwise. Filtered reads (and scans that
+        hit the 1 MB page size) can return fewer than Limit items, so keep
+        reading until the page is full or the table ends. In summary mode
+        only the list-view attributes are read.
+        """
         try:
-            response = self.table.scan(Limit=limit)
-            return [PlanModel.from_dynamodb_item(item) for item in response.get('Items', [])]
+            operation, request = list_request(self.indexes, filters or {}, summary)
+            read = self.table.query if operation == 'query' else self.table.scan
+
+            items: List[Dict[str, Any]] = []
+            start_key = decode_cursor(cursor)
+            while True:
+                kwargs: Dict[str, Any] = {**request, 'Limit': limit - len(items)}
+                if start_key:
+                    kwargs['ExclusiveStartKey'] = start_key
+
+                response = read(**kwargs)
+                items.extend(response.get('Items', []))
+                start_key = response.get('LastEvaluatedKey')
+                if not start_key or len(items) >= limit:
+                    break
+
+            return items, encode_cursor(start_key)
+        except ValueError:
+            raise
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ValidationException' and cursor:
+                # Most likely a cursor issued for a different set of filters
+                raise ValueError('Invalid cursor for these filters')
+            logger.error(f"ClientError in list_page: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Failed to list plans: {str(e)}")
             raise
 
-    def update(self, plan_id: str, updates: Dict[str, Any]) -> Optional[PlanModel]:
-        """Update a plan"""
+    def plan_query(self, filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        return plan_query(self.indexes, filters)
+
+    def update(self, plan_id: str, updates: Dict[str, Any], created_at: Optional[str] = None,
+               condition: Optional[Tuple[str, Dict[str, str], Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Apply a partial update with a single conditional UpdateItem.
+
+        updates maps attribute paths ('title', ('details', 'scope'), ...) to new
+        values; only those paths are written. condition is an optional
+        (expression, names, values) guard ANDed with the item existing.
+        created_at completes the table key; without it the key is looked up
+        with a keys-only query. Returns the updated item, or None when the
+        plan does not exist. A failed condition raises PlanConditionError
+        carrying the item as it was.
+        """
         try:
-            plan = self.get(plan_id)
-            if not plan:
+            if created_at is None:
+                versions = self.resolve_keys([plan_id]).get(plan_id)
+                if not versions:
+                    return None
+                created_at = versions[0]['createdAt']
+
+            response = self.table.update_item(**update_request(plan_id, created_at, updates, condition))
+            return response.get('Attributes')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                logger.error(f"ClientError in update: {str(e)}")
+                raise
+            old_item = e.response.get('Item')
+            if not old_item:
                 return None
-                
-            plan.update(updates)
-            item = plan.to_dynamodb_item()
-            self.table.put_item(Item=item)
-            return plan
+            raise PlanConditionError(plan_id, _deserialize_item(old_item))
         except Exception as e:
             logger.error(f"Failed to update plan: {str(e)}")
             raise
 
     def delete(self, plan_id: str) -> bool:
-        """Delete a plan"""
+        """Delete every version of a plan, like the async DELETE and batch delete"""
         try:
             logger.info(f"Starting delete operation for plan {plan_id}")
-            
-            # First get the plan to retrieve its createdAt
-            response = self.table.query(
-                KeyConditionExpression='id = :id',
-                ExpressionAttributeValues={':id': plan_id}
-            )
-            
-            if not response['Items']:
+            keys = self.resolve_keys([plan_id], latest_only=False).get(plan_id)
+            if not keys:
                 logger.info(f"Plan {plan_id} not found")
                 return False
-                
-            plan_item = response['Items'][0]
-            logger.info(f"Found plan to delete: {plan_item}")
-            
-            # Delete using both primary key attributes
-            delete_response = self.table.delete_item(
-                Key={
-                    'id': plan_id,
-                    'createdAt': plan_item['createdAt']  # Use the exact createdAt from the item
-                }
-            )
-            
-            logger.info(f"Delete response: {delete_response}")
+
+            failed = self.batch_delete(keys)
+            if failed:
+                raise RuntimeError(f"{len(failed)} of {len(keys)} versions of plan {plan_id} were not deleted")
+            logger.info(f"Deleted {len(keys)} versions of plan {plan_id}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Failed to delete plan: {str(e)}")
+            raise
+
+    def resolve_keys(self, plan_ids: List[str], latest_only: bool = True) -> Dict[str, List[Dict[str, str]]]:
+        """Find the primary keys (id + createdAt) stored for each plan id.
+
+        Batch operations need full keys, so ids without a known createdAt are
+        looked up with concurrent keys-only queries. Ids with no items are
+        absent from the result.
+        """
+        # Clients are thread-safe, resources are not. The resource's client
+        # still (de)serializes plain Python values, like Table does.
+        client = self.db.dynamodb.meta.client
+        table_name = self.table.name
+
+        def lookup(plan_id: str) -> Tuple[str, List[Dict[str, str]]]:
+            kwargs: Dict[str, Any] = {
+                'TableName': table_name,
+                'KeyConditionExpression': '#id = :id',
+                'ProjectionExpression': '#id, #createdAt',
+                'ExpressionAttributeNames': {'#id': 'id', '#createdAt': 'createdAt'},
+                'ExpressionAttributeValues': {':id': plan_id},
+                'ScanIndexForward': False  # Latest first
+            }
+            if latest_only:
+                kwargs['Limit'] = 1
+            keys = []
+            while True:
+                response = client.query(**kwargs)
+                keys.extend(
+                    {'id': item['id'], 'createdAt': item['createdAt']}
+                    for item in response.get('Items', [])
+                )
+                if latest_only or 'LastEvaluatedKey' not in response:
+                    return plan_id, keys
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        if not plan_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(KEY_LOOKUP_CONCURRENCY, len(plan_ids))) as pool:
+            return {plan_id: keys for plan_id, keys in pool.map(lookup, plan_ids) if keys}
+
+    def batch_get(self, keys: List[Dict[str, str]]) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, str]]]:
+        """Fetch plans by full key with BatchGetItem.
+
+        Returns the items found (by id) and the keys DynamoDB still left
+        unprocessed after all retries.
+        """
+        table_name = self.table.name
+        found: Dict[str, Dict[str, Any]] = {}
+        failed: List[Dict[str, str]] = []
+        try:
+            for chunk in _chunks(keys, BATCH_GET_SIZE):
+                pending = {table_name: {'Keys': chunk}}
+                for attempt in range(BATCH_MAX_RETRIES + 1):
+                    response = self.db.dynamodb.batch_get_item(RequestItems=pending)
+                    for item in response.get('Responses', {}).get(table_name, []):
+                        found[item['id']] = item
+                    pending = response.get('UnprocessedKeys') or {}
+                    if not pending:
+                        break
+                    if attempt < BATCH_MAX_RETRIES:
+                        _backoff(attempt)
+                if pending:
+                    failed.extend(pending[table_name]['Keys'])
+            if failed:
+                logger.error(f"batch_get left {len(failed)} keys unprocessed after retries")
+            return found, failed
+        except Exception as e:
+            logger.error(f"Failed to batch get plans: {str(e)}")
+            raise
+
+    def batch_delete(self, keys: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Delete plans by full key with BatchWriteItem; returns keys left unprocessed"""
+        table_name = self.table.name
+        failed: List[Dict[str, str]] = []
+        try:
+            for chunk in _chunks(keys, BATCH_WRITE_SIZE):
+                pending = {table_name: [{'DeleteRequest': {'Key': key}} for key in chunk]}
+                for attempt in range(BATCH_MAX_RETRIES + 1):
+                    response = self.db.dynamodb.batch_write_item(RequestItems=pending)
+                    pending = response.get('UnprocessedItems') or {}
+                    if not pending:
+                        break
+                    if attempt < BATCH_MAX_RETRIES:
+                        _backoff(attempt)
+                if pending:
+                    failed.extend(request['DeleteRequest']['Key'] for request in pending[table_name])
+            if failed:
+                logger.error(f"batch_delete left {len(failed)} keys unprocessed after retries")
+            return failed
+        except Exception as e:
+            logger.error(f"Failed to batch delete plans: {str(e)}")
             raise
\ No newline at end of file
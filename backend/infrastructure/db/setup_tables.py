@@ -0,0 +1,157 @@
+# infrastructure/db/setup_tables.py
+"""Create the plans table and its secondary indexes.
+
+    DYNAMODB_ENDPOINT_URL=http://localhost:8000 python -m infrastructure.db.setup_tables --backfill
+
+Works against AWS or a local DynamoDB stand-in. The table definition comes
+from dynamodb-setup.json and the indexes from DYNAMODB_INDEXES in
+infrastructure/config.py; indexes missing from an existing table are added.
+--backfill copies details.plantType to the top-level attribute the
+plantType index is keyed on, for plans written before it existed.
+--cache-table also creates the table behind dynamodb:// cache URLs.
+"""
+
+import argparse
+import json
+import os
+import time
+import logging
+from typing import Any, Dict, List
+
+from infrastructure.config import DYNAMODB_TABLES, DYNAMODB_INDEXES
+from infrastructure.db.dynamodb import DynamoDBConnection
+
+logger = logging.getLogger(__name__)
+
+SETUP_FILE = os.path.join(os.path.dirname(__file__), 'dynamodb-setup.json')
+
+
+def index_definitions(table_key: str) -> List[Dict[str, Any]]:
+    """GlobalSecondaryIndexes entries for the indexes declared in config"""
+    definitions = []
+    for name, keys in DYNAMODB_INDEXES.get(table_key, {}).items():
+        key_schema = [{'AttributeName': keys['partition_key'], 'KeyType': 'HASH'}]
+        if keys.get('sort_key'):
+            key_schema.append({'AttributeName': keys['sort_key'], 'KeyType': 'RANGE'})
+        definitions.append({
+            'IndexName': name,
+            'KeySchema': key_schema,
+            'Projection': {'ProjectionType': 'ALL'}
+        })
+    return definitions
+
+
+def attribute_definitions(table_key: str, base: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    defined = {attr['AttributeName'] for attr in base}
+    attributes = list(base)
+    for keys in DYNAMODB_INDEXES.get(table_key, {}).values():
+        for attr in (keys['partition_key'], keys.get('sort_key')):
+            if attr and attr not in defined:
+                attributes.append({'AttributeName': attr, 'AttributeType': 'S'})
+                defined.add(attr)
+    return attributes
+
+
+def wait_until_active(client, table_name: str) -> None:
+    while True:
+        table = client.describe_table(TableName=table_name)['Table']
+        statuses = [table['TableStatus']] + [
+            index['IndexStatus'] for index in table.get('GlobalSecondaryIndexes', [])
+        ]
+        if all(status == 'ACTIVE' for status in statuses):
+            return
+        time.sleep(2)
+
+
+def ensure_plans_table(client) -> None:
+    with open(SETUP_FILE) as f:
+        spec = json.load(f)
+    spec['TableName'] = DYNAMODB_TABLES['PLANS']
+    spec['AttributeDefinitions'] = attribute_definitions('PLANS', spec['AttributeDefinitions'])
+    spec['GlobalSecondaryIndexes'] = index_definitions('PLANS')
+
+    existing = client.list_tables()['TableNames']
+    if spec['TableName'] not in existing:
+        logger.info(f"Creating table {spec['TableName']}")
+        client.create_table(**spec)
+        wait_until_active(client, spec['TableName'])
+        return
+
+    table = client.describe_table(TableName=spec['TableName'])['Table']
+    present = {index['IndexName'] for index in table.get('GlobalSecondaryIndexes', [])}
+    for index in spec['GlobalSecondaryIndexes']:
+        if index['IndexName'] in present:
+            continue
+        # DynamoDB only allows one index creation per UpdateTable call
+        logger.info(f"Adding index {index['IndexName']} to {spec['TableName']}")
+        client.update_table(
+            TableName=spec['TableName'],
+            AttributeDefinitions=spec['AttributeDefinitions'],
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+        wait_until_active(client, spec['TableName'])
+
+
+def ensure_cache_table(client, table_name: str = DYNAMODB_TABLES['GENERATION_CACHE']) -> None:
+    """Key/value table for DynamoDBCacheBackend, with TTL on expiresAt"""
+    if table_name in client.list_tables()['TableNames']:
+        return
+    logger.info(f"Creating table {table_name}")
+    client.create_table(
+        TableName=table_name,
+        AttributeDefinitions=[{'AttributeName': 'key', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'key', 'KeyType': 'HASH'}],
+        BillingMode='PAY_PER_REQUEST',
+        Tags=[{'Key': 'Project', 'Value': 'PrecisionTurn'}]
+    )
+    wait_until_active(client, table_name)
+    client.update_time_to_live(
+        TableName=table_name,
+        TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expiresAt'}
+    )
+
+
+def backfill_plant_type(table) -> int:
+    updated = 0
+    kwargs: Dict[str, Any] = {
+        'ProjectionExpression': '#id, #createdAt, #plantType, #details.#plantType',
+        'ExpressionAttributeNames': {
+            '#id': 'id', '#createdAt': 'createdAt', '#plantType': 'plantType', '#details': 'details'
+        }
+    }
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get('Items', []):
+            plant_type = item.get('details', {}).get('plantType')
+            if item.get('plantType') or not isinstance(plant_type, str) or not plant_type:
+                continue
+            table.update_item(
+                Key={'id': item['id'], 'createdAt': item['createdAt']},
+                UpdateExpression='SET #plantType = :plantType',
+                ExpressionAttributeNames={'#plantType': 'plantType'},
+                ExpressionAttributeValues={':plantType': plant_type}
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            return updated
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backfill', action='store_true', help='copy details.plantType to the top level')
+    parser.add_argument('--cache-table', action='store_true', help='create the generation cache table')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    connection = DynamoDBConnection()
+    ensure_plans_table(connection.dynamodb.meta.client)
+    if args.cache_table:
+        ensure_cache_table(connection.dynamodb.meta.client)
+    if args.backfill:
+        updated = backfill_plant_type(connection.get_table(DYNAMODB_TABLES['PLANS']))
+        logger.info(f"Backfilled plantType on {updated} plans")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+from .job_queue import Job, JobQueue, QueueFullError
\ No newline at end of file
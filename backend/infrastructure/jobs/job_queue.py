@@ -0,0 +1,319 @@
+# infrastructure/jobs/job_queue.py
+
+import queue
+import threading
+import time
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from infrastructure.cache.backends import CacheBackend
+from infrastructure.metrics import start_timings, stop_timings
+from infrastructure.utils.json_helper import decimal_to_float
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a queue that is at capacity"""
+
+
+class Job:
+    """A unit of background work and its lifecycle timestamps"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    def __init__(self, fn: Callable[..., Any], args: tuple = (), kwargs: Dict[str, Any] = None,
+                 key: Optional[str] = None):
+        self.id = str(uuid.uuid4())
+        # Identifies equivalent work; see JobQueue.submit_unique
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.status = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        # Monotonic clock for wait/run durations, wall clock for display
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # (stage, seconds) recorded while the job ran, when metrics are enabled
+        self.timings: List[Tuple[str, float]] = []
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (Job.SUCCEEDED, Job.FAILED)
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent in the queue before a worker picked the job up"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        """Seconds spent executing"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable format"""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'createdAt': self.created_at,
+            'waitTime': self.wait_time,
+            'runTime': self.run_time,
+            'result': self.result,
+            'error': self.error
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """to_dict plus the stage timings, in the form kept by a shared job store"""
+        return {**decimal_to_float(self.to_dict()), 'timings': [list(timing) for timing in self.timings]}
+
+
+class JobQueue:
+    """Bounded FIFO queue drained by a fixed pool of worker threads.
+
+    Workers are started lazily on the first submit so that importing the
+    module (or forking a server worker) does not spawn threads.
+
+    Jobs run in the process that accepted them. With a store (a shared
+    cache backend) every job's record is also written there as it moves
+    through the queue, so any process can report on it (see record) and
+    submit_unique coalesces identical work across processes.
+    """
+
+    def __init__(self, name: str, max_workers: int = 4, max_queue_size: int = 32,
+                 result_ttl: int = 3600, store: Optional[CacheBackend] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.store = store
+        self.max_queue_size = max_queue_size
+        # Bounded by _submit rather than by the queue itself, so the stop
+        # sentinels shutdown() enqueues always fit and never block
+        self._queue: 'queue.Queue[Optional[Job]]' = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        # key -> unfinished job, for submit_unique
+        self._active: Dict[str, Job] = {}
+        # Reentrant: submit_unique holds it while calling _submit
+        self._lock = threading.RLock()
+        self._workers: List[threading.Thread] = []
+        self._running = 0
+        # Set by shutdown; later submissions are rejected
+        self._closed = False
+        self._stats = {
+            'submitted': 0,
+            'rejected': 0,
+            'coalesced': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'total_run_time': 0.0,
+            'max_run_time': 0.0
+        }
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Enqueue fn(*args, **kwargs) and return its Job immediately"""
+        return self._submit(Job(fn, args, kwargs))
+
+    def submit_unique(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Dict[str, Any], bool]:
+        """Like submit, but while a job with the same key is queued or running
+        (in any process sharing the store) that job is returned instead of a
+        new one. Returns (job record, created); see record."""
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                self._stats['coalesced'] += 1
+                logger.info(f"Coalesced submission into job {existing.id} on '{self.name}'")
+                return existing.to_record(), False
+            if self.store is None:
+                return self._submit(Job(fn, args, kwargs, key=key)).to_record(), True
+
+        job = Job(fn, args, kwargs, key=key)
+        # Published before claiming the key, so a process that loses the
+        # claim always finds the winner's record
+        self._publish(job)
+        if not self.store.add(self._claim_key(key), job.id, ttl=self.result_ttl):
+            owner = self.store.get(self._claim_key(key))
+            existing = self.store.get(owner) if owner else None
+            if existing and existing['status'] in (Job.QUEUED, Job.RUNNING):
+                self.store.delete(job.id)
+                with self._lock:
+                    self._stats['coalesced'] += 1
+                logger.info(f"Coalesced submission into job {owner} on '{self.name}' (shared)")
+                return existing, False
+            # The claim outlived its job (finished, expired or lost with its process)
+            self.store.set(self._claim_key(key), job.id, ttl=self.result_ttl)
+        try:
+            return self._submit(job).to_record(), True
+        except QueueFullError:
+            self.store.delete(self._claim_key(key))
+            self.store.delete(job.id)
+            raise
+
+    def _submit(self, job: Job) -> Job:
+        with self._lock:
+            if self._closed:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"Job queue '{self.name}' is shutting down")
+            self._ensure_workers()
+            self._evict_expired()
+            if self._queue.qsize() >= self.max_queue_size:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"Job queue '{self.name}' is full")
+            self._queue.put_nowait(job)
+            self._jobs[job.id] = job
+            if job.key is not None:
+                self._active[job.key] = job
+            self._stats['submitted'] += 1
+        self._publish(job)
+        logger.info(f"Queued job {job.id} on '{self.name}' (depth={self._queue.qsize()})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job held by this process by ID"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def record(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's to_record form, from this process or else from the store;
+        None when neither knows it (or its result has expired)"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_record()
+        return self.store.get(job_id) if self.store is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, worker utilisation and timing totals"""
+        with self._lock:
+            stats = dict(self._stats)
+            completed = stats['succeeded'] + stats['failed']
+            return {
+                'name': self.name,
+                'depth': self._queue.qsize(),
+                'capacity': self.max_queue_size,
+                'workers': self.max_workers,
+                'running': self._running,
+                'submitted': stats['submitted'],
+                'rejected': stats['rejected'],
+                'coalesced': stats['coalesced'],
+                'succeeded': stats['succeeded'],
+                'failed': stats['failed'],
+                'avgWaitTime': stats['total_wait_time'] / completed if completed else 0.0,
+                'maxWaitTime': stats['max_wait_time'],
+                'avgRunTime': stats['total_run_time'] / completed if completed else 0.0,
+                'maxRunTime': stats['max_run_time']
+            }
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop the workers once the queued and running jobs have finished.
+
+        New submissions are rejected from here on. With a timeout, jobs
+        still running when it expires are abandoned (the workers are
+        daemon threads).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers = []
+        for _ in workers:
+            self._queue.put_nowait(None)
+        if wait:
+            for worker in workers:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                worker.join(remaining)
+
+    def _publish(self, job: Job) -> None:
+        if self.store is not None:
+            self.store.set(job.id, job.to_record(), ttl=self.result_ttl)
+
+    def _claim_key(self, key: str) -> str:
+        return f"active:{key}"
+
+    def _ensure_workers(self) -> None:
+        # Caller holds self._lock
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"{self.name}-worker-{len(self._workers)}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _evict_expired(self) -> None:
+        # Caller holds self._lock. Finished jobs are kept for result_ttl seconds
+        # so clients have time to poll for the result.
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        with self._lock:
+            job.status = Job.RUNNING
+            job.started_at = time.monotonic()
+            self._running += 1
+        self._publish(job)
+        token = start_timings()
+        try:
+            result = job.fn(*job.args, **job.kwargs)
+            status, error = Job.SUCCEEDED, None
+        except Exception as e:
+            logger.error(f"Job {job.id} on '{self.name}' failed: {str(e)}")
+            result, status, error = None, Job.FAILED, str(e)
+        finally:
+            job.timings = stop_timings(token)
+
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.finished_at = time.monotonic()
+            job.status = status
+            self._running -= 1
+            # Drop references to the inputs once the job is done
+            job.args, job.kwargs = (), {}
+            if job.key is not None and self._active.get(job.key) is job:
+                del self._active[job.key]
+
+            self._stats[status] += 1
+            self._stats['total_wait_time'] += job.wait_time
+            self._stats['max_wait_time'] = max(self._stats['max_wait_time'], job.wait_time)
+            self._stats['total_run_time'] += job.run_time
+            self._stats['max_run_time'] = max(self._stats['max_run_time'], job.run_time)
+        self._publish(job)
+        if self.store is not None and job.key is not None:
+            claim_key = self._claim_key(job.key)
+            if self.store.get(claim_key) == job.id:
+                self.store.delete(claim_key)
+        logger.info(
+            f"Job {job.id} on '{self.name}' {status} "
+            f"(wait={job.wait_time:.3f}s, run={job.run_time:.3f}s)"
+        )
@@ -0,0 +1,79 @@
+# infrastructure/lifecycle.py
+
+import threading
+import time
+import logging
+from typing import Callable, List
+
+from infrastructure.aws import aws_clients
+from infrastructure.config import SHUTDOWN_DRAIN_SECONDS, SHUTDOWN_NOTICE_SECONDS
+from infrastructure.db.dynamodb import DynamoDBConnection
+from infrastructure.logging_config import configure_logging
+from infrastructure.metrics import multiprocess
+
+logger = logging.getLogger(__name__)
+
+_draining = threading.Event()
+# Called with the seconds left before the drain deadline
+_drain_hooks: List[Callable[[float], None]] = []
+
+
+def register_drain_hook(hook: Callable[[float], None]) -> None:
+    """Run hook(timeout) when the process drains, e.g. to finish background jobs"""
+    _drain_hooks.append(hook)
+
+
+def is_draining() -> bool:
+    return _draining.is_set()
+
+
+def drain(timeout: float = SHUTDOWN_DRAIN_SECONDS) -> None:
+    """Stop reporting ready and let registered work finish, within timeout seconds.
+
+    /health/ready fails from the first moment. Blocks the caller; see
+    begin_drain for draining while requests are still being served.
+    """
+    if _draining.is_set():
+        return
+    _draining.set()
+    started = time.monotonic()
+    logger.info(f"Draining (up to {timeout:.0f}s)")
+    for hook in _drain_hooks:
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        try:
+            hook(remaining)
+        except Exception as e:
+            logger.error(f"Drain hook failed: {str(e)}")
+    logger.info(f"Drained in {time.monotonic() - started:.1f}s")
+
+
+def begin_drain(stop: Callable[[], None], timeout: float = SHUTDOWN_DRAIN_SECONDS,
+                notice: float = SHUTDOWN_NOTICE_SECONDS) -> None:
+    """Drain on a background thread, then call stop to end the server.
+
+    For a shutdown signal: readiness fails at once, while the server keeps
+    answering requests (job polls among them) until the registered work has
+    finished, and for at least notice seconds so the load balancer sees the
+    change before the worker stops accepting connections.
+    """
+    def run():
+        started = time.monotonic()
+        drain(timeout)
+        time.sleep(max(0.0, notice - (time.monotonic() - started)))
+        stop()
+
+    threading.Thread(target=run, name='drain', daemon=True).start()
+
+
+def after_fork() -> None:
+    """Give a forked worker its own AWS clients and logging thread.
+
+    Sockets and threads do not survive fork usefully: anything the parent
+    created (with gunicorn's preload_app) is dropped here and rebuilt on
+    first use in the worker.
+    """
+    aws_clients.reset()
+    DynamoDBConnection._instance = None
+    _draining.clear()
+    configure_logging()
+    multiprocess.start()
@@ -0,0 +1 @@
+from .gateway import AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyTimeoutError, LLMGateway, classify_error, gateway_stats, get_gateway
\ No newline at end of file
@@ -0,0 +1,218 @@
+# infrastructure/llm/chat_models.py
+"""LangChain chat models routed through the LLM gateway.
+
+Imported lazily by the services (LangChain is heavy), which is why the
+package __init__ does not re-export this module.
+"""
+
+import json
+import random
+import threading
+import time
+import logging
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from botocore.exceptions import ClientError
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from infrastructure.aws import get_client
+from infrastructure.config import (
+    AWS_REGION, LLM_PROVIDER, LLM_FAKE_LATENCY_SECONDS, LLM_FAKE_THROTTLE_RATE, LLM_FAKE_CAPACITY
+)
+from infrastructure.llm.gateway import LLMGateway, get_gateway
+from infrastructure.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayChatModel(BaseChatModel):
+    """Wraps a chat model so every invoke, stream and async call goes through an LLMGateway.
+
+    Drop-in for the wrapped model, including inside chains such as
+    RetrievalQA.
+    """
+
+    model: BaseChatModel
+    gateway: LLMGateway
+
+    model_config = {'arbitrary_types_allowed': True}
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway-{self.model._llm_type}"
+
+    def _record_usage(self, message: BaseMessage) -> None:
+        # Bedrock reports token counts on the message (the last chunk when streaming)
+        usage = getattr(message, 'usage_metadata', None)
+        if usage:
+            self.gateway.metrics.record_usage(usage.get('input_tokens', 0), usage.get('output_tokens', 0))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        with stage('llm'):
+            result = self.gateway.call(
+                lambda: self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            )
+        for generation in result.generations:
+            self._record_usage(generation.message)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        with stage('llm'):
+            result = await self.gateway.acall(
+                lambda: self.model._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            )
+        for generation in result.generations:
+            self._record_usage(generation.message)
+        return result
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for chunk in self.gateway.stream(
+            lambda: self.model._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        ):
+            self._record_usage(chunk.message)
+            yield chunk
+
+
+# Canned plan returned by the fake model when a prompt asks for plan JSON
+FAKE_PLAN = {
+    'milestones': [
+        {'title': 'Planning', 'duration': 5, 'deliverables': ['Work packs issued'], 'dependencies': []},
+        {'title': 'Shutdown', 'duration': 3, 'deliverables': ['Unit isolated'], 'dependencies': ['Planning']},
+        {'title': 'Execution', 'duration': 20, 'deliverables': ['Repairs complete'], 'dependencies': ['Shutdown']},
+        {'title': 'Startup', 'duration': 4, 'deliverables': ['Unit online'], 'dependencies': ['Execution']}
+    ],
+    'resources': {
+        'personnel': [{'role': 'Mechanical fitter', 'count': 12, 'skills': 'Flange management'}],
+        'equipment': [{'type': 'Mobile crane', 'quantity': 1}]
+    },
+    'risk_assessment': {
+        'high_risks': [{'title': 'Scope growth', 'description': 'Inspection finds', 'mitigation': 'Contingency'}]
+    },
+    'cost_breakdown': [{'category': 'Labour', 'amount': 1000000, 'details': 'Contractor crews'}],
+    'safety_plan': {'required_permits': ['Hot work'], 'safety_protocols': ['Gas testing']}
+}
+FAKE_ANSWER = "Based on the retrieved procedures:\n1. Isolate the equipment\n2. Gas test before entry"
+
+
+def _default_response(prompt: str) -> str:
+    """Plan JSON limited to the sections the prompt's schema asks for, else a RAG answer"""
+    sections = {name: value for name, value in FAKE_PLAN.items() if f'"{name}"' in prompt}
+    return json.dumps(sections) if sections else FAKE_ANSWER
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline stand-in for Bedrock with injectable latency and throttling.
+
+    Throttles raise the same ThrottlingException ClientError Bedrock does:
+    at random with throttle_rate, and whenever more than capacity calls are
+    in flight (capacity 0 = unlimited). Latency is latency_seconds plus
+    seconds_per_token for each word of the response, so longer outputs take
+    longer as they would when decoded; streamed calls spend the per-word
+    time between chunks, as a real model's tokens arrive. response is a
+    string or a function of the prompt text.
+    """
+
+    latency_seconds: float = LLM_FAKE_LATENCY_SECONDS
+    seconds_per_token: float = 0.0
+    throttle_rate: float = LLM_FAKE_THROTTLE_RATE
+    failure_rate: float = 0.0
+    capacity: int = LLM_FAKE_CAPACITY
+    response: Union[str, Callable[[str], str]] = _default_response
+    stream_chunk_words: int = 4
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _in_flight: int = PrivateAttr(default=0)
+    _random: random.Random = PrivateAttr(default_factory=random.Random)
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake'
+
+    @staticmethod
+    def _error(code: str, status: int) -> ClientError:
+        return ClientError(
+            {'Error': {'Code': code, 'Message': 'Injected by FakeChatModel'},
+             'ResponseMetadata': {'HTTPStatusCode': status}},
+            'Converse'
+        )
+
+    def _respond(self, messages: List[BaseMessage], decode: bool = True) -> str:
+        """Simulate one model call: admission, latency, then the response text.
+
+        decode=False leaves the per-word decode time to the caller.
+        """
+        with self._lock:
+            self._in_flight += 1
+            over_capacity = self.capacity and self._in_flight > self.capacity
+            roll = self._random.random()
+        try:
+            if over_capacity or roll < self.throttle_rate:
+                time.sleep(self.latency_seconds / 10)
+                raise self._error('ThrottlingException', 429)
+            if roll < self.throttle_rate + self.failure_rate:
+                raise self._error('ServiceUnavailableException', 503)
+            prompt = '\n'.join(str(message.content) for message in messages)
+            text = self.response(prompt) if callable(self.response) else self.response
+            time.sleep(self.latency_seconds + (self.seconds_per_token * len(text.split()) if decode else 0))
+            return text
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    @staticmethod
+    def _usage(messages: List[BaseMessage], text: str) -> dict:
+        """Token counts in Bedrock's usage_metadata shape, approximated by words"""
+        input_tokens = sum(len(str(message.content).split()) for message in messages)
+        output_tokens = len(text.split())
+        return {'input_tokens': input_tokens, 'output_tokens': output_tokens,
+                'total_tokens': input_tokens + output_tokens}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        text = self._respond(messages)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        response = self._respond(messages, decode=False)
+        words = response.split(' ')
+        for start in range(0, len(words), self.stream_chunk_words):
+            if self.seconds_per_token:
+                time.sleep(self.seconds_per_token * len(words[start:start + self.stream_chunk_words]))
+            text = ' '.join(words[start:start + self.stream_chunk_words])
+            last = start + self.stream_chunk_words >= len(words)
+            if not last:
+                text += ' '
+            # Like Bedrock, usage arrives with the final chunk
+            usage = self._usage(messages, response) if last else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+def create_chat_model(model_id: str, provider: str = LLM_PROVIDER,
+                      gateway: Optional[LLMGateway] = None, **kwargs: Any) -> GatewayChatModel:
+    """Chat model for model_id (bedrock or fake, per LLM_PROVIDER) behind its shared gateway"""
+    if provider == 'fake':
+        model = FakeChatModel(**kwargs)
+    elif provider == 'bedrock':
+        from langchain_aws import ChatBedrockConverse
+        model = ChatBedrockConverse(
+            model=model_id,
+            region_name=AWS_REGION,
+            # The gateway owns retries; botocore's own would hide throttling from it
+            client=get_client('bedrock-runtime', max_attempts=1),
+            **kwargs
+        )
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    return GatewayChatModel(model=model, gateway=gateway or get_gateway(model_id))
@@ -0,0 +1,417 @@
+# infrastructure/llm/gateway.py
+
+import asyncio
+import random
+import threading
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from botocore.exceptions import ClientError, ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError
+
+from infrastructure.config import (
+    LLM_INITIAL_CONCURRENCY, LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY, LLM_ACQUIRE_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_CAP_SECONDS,
+    LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS
+)
+from infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = (
+    'ThrottlingException', 'TooManyRequestsException', 'ProvisionedThroughputExceededException'
+)
+TRANSIENT_ERROR_CODES = (
+    'ServiceUnavailableException', 'InternalServerException', 'ModelNotReadyException',
+    'ModelTimeoutException'
+)
+
+
+class CircuitOpenError(Exception):
+    """The model endpoint is failing; calls are rejected until it recovers"""
+
+
+class ConcurrencyTimeoutError(Exception):
+    """No concurrency slot became free within the acquire timeout"""
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """'throttled', 'transient' (both retried) or None for errors retrying cannot fix"""
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code', '')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        if code in THROTTLING_ERROR_CODES or status == 429:
+            return 'throttled'
+        if code in TRANSIENT_ERROR_CODES or status >= 500:
+            return 'transient'
+        return None
+    if isinstance(error, (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError)):
+        return 'transient'
+    return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit.
+
+    Each success raises the limit by 1/limit (about +1 per window of limit
+    calls); a throttle multiplies it by decrease_factor. Only throttles of
+    calls admitted since the last decrease count, so one burst of rejected
+    in-flight calls shrinks the limit once rather than once per call.
+    """
+
+    def __init__(self, initial: int = LLM_INITIAL_CONCURRENCY, min_limit: int = LLM_MIN_CONCURRENCY,
+                 max_limit: int = LLM_MAX_CONCURRENCY, decrease_factor: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+        # (loop, future) of coroutines waiting in acquire_async; release wakes them
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def try_acquire(self) -> Optional[int]:
+        """Take a slot if one is free; returns a token for release(), or None"""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return self._epoch
+            return None
+
+    def acquire(self, timeout: float = LLM_ACQUIRE_TIMEOUT_SECONDS) -> Optional[int]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return self._epoch
+
+    async def acquire_async(self, timeout: float = LLM_ACQUIRE_TIMEOUT_SECONDS) -> Optional[int]:
+        """acquire() for coroutines: waits on a future that release() resolves,
+        so a waiting call holds no thread"""
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return self._epoch
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, token: int, throttled: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                if token == self._epoch:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._epoch += 1
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        # Like notify_all: every waiter re-checks for a slot
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # Its loop has closed; nobody is waiting on it any more
+                pass
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold consecutive failures; after
+    reset_timeout one probe call is let through (half-open) and its outcome
+    closes or re-opens the circuit."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = LLM_BREAKER_RESET_SECONDS, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probes = 0
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    return False
+                self._probes += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.error(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def abandon(self) -> None:
+        """A half-open probe never reached the endpoint; let another call probe"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+
+class ModelMetrics:
+    """Call counters, token usage and latency for one model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def record_usage(self, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.succeeded += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'throttled': self.throttled,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'inputTokens': self.input_tokens,
+                'outputTokens': self.output_tokens,
+                'avgLatency': self.latency_total / self.succeeded if self.succeeded else 0.0,
+                'maxLatency': self.latency_max
+            }
+
+
+class LLMGateway:
+    """Admission control for calls to one model.
+
+    Every call passes the circuit breaker, waits for a slot under the AIMD
+    limit, and is retried with full-jitter exponential backoff when the
+    model throttles or fails transiently. Errors retrying cannot fix (bad
+    requests) are raised at once and count as the endpoint being healthy.
+    """
+
+    def __init__(self, model_id: str, limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE_SECONDS, backoff_cap: float = LLM_BACKOFF_CAP_SECONDS,
+                 acquire_timeout: float = LLM_ACQUIRE_TIMEOUT_SECONDS):
+        self.model_id = model_id
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.acquire_timeout = acquire_timeout
+        self.metrics = ModelMetrics()
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _admit(self) -> None:
+        self.metrics.increment('calls')
+        if not self.breaker.allow():
+            self.metrics.increment('rejected')
+            raise CircuitOpenError(f"Circuit open for {self.model_id}")
+
+    def _acquired(self, token: Optional[int]) -> int:
+        if token is None:
+            self.metrics.increment('timeouts')
+            self.breaker.abandon()
+            raise ConcurrencyTimeoutError(f"No {self.model_id} slot free after {self.acquire_timeout}s")
+        return token
+
+    def _failed(self, token: int, error: Exception, attempt: int) -> bool:
+        """Release the slot after a failed attempt; True when the call should be retried"""
+        kind = classify_error(error)
+        self.limiter.release(token, throttled=kind == 'throttled')
+        if kind == 'throttled':
+            self.metrics.increment('throttled')
+        if kind is None:
+            self.breaker.record_success()
+            self.metrics.increment('failed')
+            return False
+        if attempt >= self.max_retries:
+            self.breaker.record_failure()
+            self.metrics.increment('failed')
+            logger.error(f"{self.model_id} call failed after {attempt + 1} attempts: {str(error)}")
+            return False
+        self.metrics.increment('retries')
+        return True
+
+    def _succeeded(self, token: int, started: float) -> None:
+        self.limiter.release(token)
+        self.breaker.record_success()
+        self.metrics.record_success(time.perf_counter() - started)
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        self._admit()
+        for attempt in range(self.max_retries + 1):
+            token = self._acquired(self.limiter.acquire(self.acquire_timeout))
+            started = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._failed(token, e, attempt):
+                    raise
+                time.sleep(self._backoff_seconds(attempt))
+                continue
+            self._succeeded(token, started)
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._admit()
+        for attempt in range(self.max_retries + 1):
+            token = self._acquired(await self.limiter.acquire_async(self.acquire_timeout))
+            started = time.perf_counter()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self._failed(token, e, attempt):
+                    raise
+                await asyncio.sleep(self._backoff_seconds(attempt))
+                continue
+            self._succeeded(token, started)
+            return result
+
+    def stream(self, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """Gate a streaming call. Attempts are retried until the first chunk
+        arrives; after that a failure is raised to the consumer. The slot is
+        held until the stream ends."""
+        self._admit()
+        for attempt in range(self.max_retries + 1):
+            token = self._acquired(self.limiter.acquire(self.acquire_timeout))
+            started = time.perf_counter()
+            try:
+                chunks = iter(fn())
+                first = next(chunks, None)
+            except Exception as e:
+                if not self._failed(token, e, attempt):
+                    raise
+                time.sleep(self._backoff_seconds(attempt))
+                continue
+            break
+
+        try:
+            if first is not None:
+                yield first
+            yield from chunks
+        except GeneratorExit:
+            # Consumer stopped early (e.g. client disconnected); not a model
+            # failure, and the chunks it did get show the endpoint is healthy
+            # (this also settles a half-open probe)
+            self.limiter.release(token)
+            self.breaker.record_success()
+            raise
+        except Exception as e:
+            self._failed(token, e, self.max_retries)
+            raise
+        self._succeeded(token, started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics.to_dict(),
+            'concurrencyLimit': round(self.limiter.limit, 2),
+            'inFlight': self.limiter.in_flight,
+            'circuit': self.breaker.state
+        }
+
+
+_gateways: Dict[str, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(model_id: str) -> LLMGateway:
+    """The process-wide gateway for a model, shared by every service calling it"""
+    with _gateways_lock:
+        if model_id not in _gateways:
+            _gateways[model_id] = LLMGateway(model_id)
+        return _gateways[model_id]
+
+
+def gateway_stats() -> Dict[str, Dict[str, Any]]:
+    with _gateways_lock:
+        return {model_id: gateway.stats() for model_id, gateway in _gateways.items()}
+
+
+
+def _stat_samples(key: str):
+    return lambda: [({'model': model_id}, stats[key]) for model_id, stats in gateway_stats().items()]
+
+
+# Read from the gateways' own counters when /metrics is scraped
+for _name, _key, _documentation in (
+    ('llm_calls_total', 'calls', 'Model calls admitted or rejected by the gateway'),
+    ('llm_failed_total', 'failed', 'Model calls that failed after retries'),
+    ('llm_throttled_total', 'throttled', 'Attempts the model throttled'),
+    ('llm_retries_total', 'retries', 'Attempts retried by the gateway'),
+    ('llm_rejected_total', 'rejected', 'Calls rejected by an open circuit'),
+    ('llm_input_tokens_total', 'inputTokens', 'Prompt tokens the model reported'),
+    ('llm_output_tokens_total', 'outputTokens', 'Completion tokens the model reported'),
+):
+    registry.register_collector(_name, 'counter', _documentation, _stat_samples(_key))
+registry.register_collector(
+    'llm_concurrency_limit', 'gauge', 'Current AIMD concurrency limit', _stat_samples('concurrencyLimit')
+)
+registry.register_collector('llm_in_flight', 'gauge', 'Model calls in flight', _stat_samples('inFlight'))
\ No newline at end of file
@@ -0,0 +1,242 @@
+# infrastructure/logging_config.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from infrastructure.config import (
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_MAX_MESSAGE_CHARS,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_RATES
+)
+from infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TEXT_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def _truncate(text: str, limit: int) -> str:
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+
+class _Truncated:
+    __slots__ = ('value', 'limit')
+
+    def __init__(self, value: Any, limit: int = 200):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return _truncate(str(self.value), self.limit)
+
+
+class _PlanSummary:
+    __slots__ = ('item',)
+
+    def __init__(self, item: Dict[str, Any]):
+        self.item = item
+
+    def __str__(self) -> str:
+        item = self.item or {}
+        details = item.get('details') or {}
+        milestones = details.get('milestones') if isinstance(details, dict) else None
+        summary = f"id={item.get('id')} title={_truncate(str(item.get('title', '')), 80)!r}"
+        if item.get('status'):
+            summary += f" status={item['status']}"
+        if isinstance(details, dict):
+            summary += f" detailKeys={len(details)}"
+        if isinstance(milestones, list):
+            summary += f" milestones={len(milestones)}"
+        return summary
+
+
+def truncated(value: Any, limit: int = 200) -> _Truncated:
+    """Log argument rendered as str(value) cut to limit characters.
+
+    The conversion happens when the record is formatted, on the logging
+    thread, and not at all if the record is filtered out or sampled away.
+    """
+    return _Truncated(value, limit)
+
+
+def summarize_plan(item: Dict[str, Any]) -> _PlanSummary:
+    """Log argument describing a plan item by id, title and size, never its details.
+
+    Accepts a DynamoDB item or a JSON plan; like truncated, nothing is
+    computed unless the record is actually written.
+    """
+    return _PlanSummary(item)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"name=0.1,other=0.5" -> {'name': 0.1, 'other': 0.5}; malformed entries are skipped"""
+    rates = {}
+    for entry in (spec or '').split(','):
+        name, _, rate = entry.strip().partition('=')
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            if entry.strip():
+                logger.warning(f"Ignoring malformed log sample rate {entry.strip()!r}")
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records per logger name prefix.
+
+    The most specific prefix wins, so "infrastructure.db=0.1" can be
+    overridden for one module. WARNING and above always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        # Logger names are few, so the prefix lookup is done once per name
+        self._by_logger: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + '.')]
+            rate = self.rates[max(matches, key=len)] if matches else 1.0
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StructuredFormatter(logging.Formatter):
+    """Text or JSON lines with the message truncated to max_chars.
+
+    In JSON mode, fields passed through extra= become keys of the record,
+    so logger.info("Plan saved", extra={'planId': plan_id}) stays queryable.
+    """
+
+    def __init__(self, json_output: bool = False, max_chars: int = LOG_MAX_MESSAGE_CHARS):
+        super().__init__(TEXT_FORMAT)
+        self.json_output = json_output
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = _truncate(record.getMessage(), self.max_chars)
+        if not self.json_output:
+            text = self.formatMessage(record)
+            if record.exc_info:
+                text += '\n' + self.formatException(record.exc_info)
+            return text
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.message,
+            'thread': record.threadName
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hand records to the logging thread without formatting or waiting.
+
+    The stock QueueHandler formats each message on the calling thread so
+    it can be pickled; the listener runs in this process, so records are
+    queued as they are and formatted (args included) on the logging thread.
+    Arguments should therefore not be mutated after the call. When the
+    queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_configured_pid: Optional[int] = None
+
+
+def configure_logging(level: str = LOG_LEVEL, json_output: Optional[bool] = None,
+                      sample_rates: Optional[Dict[str, float]] = None) -> None:
+    """Route all logging through a bounded queue drained by a background thread.
+
+    Replaces the root logger's handlers. Request threads only filter,
+    sample and enqueue; formatting and the write to stderr happen on the
+    listener thread. Calling it again in the same process does nothing; in
+    a forked worker (whose copy of the listener thread is gone) it starts
+    a new listener.
+    """
+    global _handler, _listener, _configured_pid
+    with _lock:
+        if _configured_pid == os.getpid():
+            return
+        if json_output is None:
+            json_output = LOG_FORMAT == 'json'
+        if sample_rates is None:
+            sample_rates = parse_sample_rates(LOG_SAMPLE_RATES)
+
+        output = logging.StreamHandler()
+        output.setFormatter(StructuredFormatter(json_output))
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(sample_rates))
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        listener = QueueListener(log_queue, output, respect_handler_level=True)
+        listener.start()
+        if _configured_pid is None:
+            atexit.register(stop_logging)
+        _handler, _listener, _configured_pid = handler, listener, os.getpid()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the logging thread"""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None and _configured_pid == os.getpid():
+        listener.stop()
+
+
+def _dropped_samples():
+    if _handler is not None:
+        yield {}, _handler.dropped
+
+
+registry.register_collector(
+    'log_records_dropped_total', 'counter', 'Log records dropped because the logging queue was full',
+    _dropped_samples
+)
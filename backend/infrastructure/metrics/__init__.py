@@ -0,0 +1,3 @@
+from .registry import Counter, Histogram, MetricsRegistry, registry
+from .timing import record_request, record_stage, server_timing, stage, start_timings, stop_timings
+from .aws import instrument_session
\ No newline at end of file
@@ -0,0 +1,74 @@
+# infrastructure/metrics/aws.py
+
+import logging
+import time
+
+from infrastructure.config import METRICS_ENABLED
+from infrastructure.metrics.registry import registry
+from infrastructure.metrics.timing import record_stage
+
+logger = logging.getLogger(__name__)
+
+AWS_RETRIES = registry.counter(
+    'aws_retries_total', 'Retries botocore made before an AWS call returned', ('service', 'operation')
+)
+AWS_ERRORS = registry.counter(
+    'aws_errors_total', 'AWS calls that returned an error, by error code', ('service', 'operation', 'code')
+)
+DYNAMODB_CAPACITY = registry.counter(
+    'dynamodb_consumed_capacity_units_total', 'Capacity units DynamoDB reported consuming',
+    ('table', 'operation')
+)
+
+
+def _return_consumed_capacity(params, model, **kwargs) -> None:
+    # Only asked for when metrics are on; costs nothing extra on DynamoDB's side
+    if 'ReturnConsumedCapacity' in model.input_shape.members:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _call_started(context, **kwargs) -> None:
+    context['metrics_started'] = time.perf_counter()
+
+
+def _call_finished(parsed, model, context, **kwargs) -> None:
+    started = context.get('metrics_started')
+    service = model.service_model.service_name
+    operation = model.name
+    if started is not None:
+        # Includes botocore's own retries and backoff
+        record_stage(f"{service}.{operation}", time.perf_counter() - started)
+
+    retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+    if retries:
+        AWS_RETRIES.inc(retries, service=service, operation=operation)
+    code = parsed.get('Error', {}).get('Code')
+    if code:
+        AWS_ERRORS.inc(service=service, operation=operation, code=code)
+
+    consumed = parsed.get('ConsumedCapacity')
+    if consumed:
+        # A dict for single-table calls, a list per table for batch/transact calls
+        for entry in consumed if isinstance(consumed, list) else [consumed]:
+            DYNAMODB_CAPACITY.inc(
+                entry.get('CapacityUnits', 0), table=entry.get('TableName', ''), operation=operation
+            )
+
+
+def instrument_session(session) -> None:
+    """Time every AWS call made by clients created from session afterwards.
+
+    Registers botocore event hooks rather than wrapping call sites, so
+    repositories, caches and retrievers are all covered. Each call is
+    recorded as a stage named service.Operation, along with the retries
+    botocore made and, for DynamoDB, the capacity it consumed. Does nothing
+    when metrics are disabled. Works for aioboto3 sessions too.
+    """
+    if not METRICS_ENABLED:
+        return
+    events = session.events
+    # unique_id makes instrumenting the same session twice harmless
+    events.register('provide-client-params.dynamodb', _return_consumed_capacity,
+                    unique_id='metrics-consumed-capacity')
+    events.register('before-call', _call_started, unique_id='metrics-call-started')
+    events.register('after-call', _call_finished, unique_id='metrics-call-finished')
@@ -0,0 +1,103 @@
+# infrastructure/metrics/multiprocess.py
+
+import glob
+import json
+import os
+import threading
+import logging
+from typing import Optional
+
+from infrastructure.config import METRICS_FLUSH_SECONDS, METRICS_MULTIPROC_DIR
+from .registry import registry, render_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Wakes the flush thread early on stop
+_stop = threading.Event()
+_flusher: Optional[threading.Thread] = None
+
+
+def enabled() -> bool:
+    return bool(METRICS_MULTIPROC_DIR)
+
+
+def _path(pid: int) -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"{pid}.json")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def flush() -> None:
+    """Write this process's snapshot where the other workers can read it"""
+    path = _path(os.getpid())
+    try:
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(registry.snapshot(), f)
+        # Atomic, so a reader never sees a partial file
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logger.error(f"Metrics flush failed: {str(e)}")
+
+
+def start() -> None:
+    """Flush this process's metrics every METRICS_FLUSH_SECONDS (call after fork)"""
+    global _flusher
+    if not enabled():
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    _stop.clear()
+
+    def run():
+        while not _stop.wait(METRICS_FLUSH_SECONDS):
+            flush()
+
+    _flusher = threading.Thread(target=run, name='metrics-flush', daemon=True)
+    _flusher.start()
+
+
+def stop() -> None:
+    """Final flush on exit, so the worker's counts outlive it"""
+    if not enabled():
+        return
+    _stop.set()
+    flush()
+
+
+def clear() -> None:
+    """Remove every snapshot; the server master calls this before starting workers"""
+    if not enabled():
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(METRICS_MULTIPROC_DIR, '*.json*')):
+        os.remove(path)
+
+
+def render() -> str:
+    """Exposition covering every worker: this process live, the others from
+    their last flush. Exited workers still count towards counters and
+    histograms, so totals never go backwards; their gauges are dropped."""
+    snapshots = [registry.snapshot()]
+    for path in glob.glob(os.path.join(METRICS_MULTIPROC_DIR, '*.json')):
+        try:
+            pid = int(os.path.basename(path)[:-len('.json')])
+            if pid == os.getpid():
+                continue
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Skipping metrics snapshot {path}: {str(e)}")
+            continue
+        if not _alive(pid):
+            snapshot['collectors'] = [
+                collector for collector in snapshot['collectors'] if collector['kind'] != 'gauge'
+            ]
+        snapshots.append(snapshot)
+    return render_snapshots(snapshots, per_process_gauges=True)
@@ -0,0 +1,237 @@
+# infrastructure/metrics/registry.py
+
+import bisect
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'precisionturn_'
+# Seconds; spans cache hits (sub-millisecond) to full plan generations (minutes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# (labels, value) pairs a collector reports for one metric
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def series(self) -> List[Tuple[Tuple, float]]:
+        """(label values, count) for every series"""
+        with self._lock:
+            return list(self._values.items())
+
+
+class Histogram:
+    """Bucketed observations per label combination, Prometheus-style.
+
+    Counts are kept per bucket and made cumulative when rendered, so an
+    observation is one bisect plus three additions under the lock.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, **labels: Any) -> Optional[Dict[str, Any]]:
+        """sum/count (and per-bucket counts) of one series, or None if never observed"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return None
+            return {'buckets': list(series[0]), 'sum': series[1], 'count': series[2]}
+
+    def series(self) -> List[Tuple[Tuple, list]]:
+        """(label values, [per-bucket counts, sum, count]) for every series"""
+        with self._lock:
+            return [(key, [list(counts), total, count]) for key, (counts, total, count) in self._series.items()]
+
+
+class MetricsRegistry:
+    """Named counters and histograms plus collectors read at scrape time.
+
+    Collectors expose state that is already tracked elsewhere (LLM gateway
+    counters, job queue stats) without double-counting on the hot path:
+    they are only called when /metrics is rendered.
+    """
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Samples]]] = []
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        full_name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {full_name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, name: str, kind: str, documentation: str, collect: Callable[[], Samples]) -> None:
+        """Report name (a counter or gauge) from collect() whenever metrics are rendered"""
+        with self._lock:
+            self._collectors.append((self.prefix + name, kind, documentation, collect))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Every metric and collector's current values as JSON-serializable data"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+            collectors = list(self._collectors)
+        snapshot: Dict[str, Any] = {'pid': os.getpid(), 'metrics': [], 'collectors': []}
+        for metric in metrics:
+            entry = {
+                'name': metric.name,
+                'kind': metric.kind,
+                'documentation': metric.documentation,
+                'labelnames': list(metric.labelnames),
+                'series': [[list(key), value] for key, value in metric.series()]
+            }
+            if metric.kind == 'histogram':
+                entry['buckets'] = list(metric.buckets)
+            snapshot['metrics'].append(entry)
+        for name, kind, documentation, collect in collectors:
+            try:
+                samples = [[dict(labels), value] for labels, value in collect()]
+            except Exception as e:
+                logger.error(f"Metrics collector {name} failed: {str(e)}")
+                continue
+            snapshot['collectors'].append({
+                'name': name, 'kind': kind, 'documentation': documentation, 'samples': samples
+            })
+        return snapshot
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        return render_snapshots([self.snapshot()])
+
+
+def _add_series(total: list, series: list) -> list:
+    # Histogram [counts, sum, count] values add element by element
+    return [[a + b for a, b in zip(total[0], series[0])], total[1] + series[1], total[2] + series[2]]
+
+
+def render_snapshots(snapshots: List[Dict[str, Any]], per_process_gauges: bool = False) -> str:
+    """Render registry snapshots (see MetricsRegistry.snapshot) as one exposition.
+
+    Counters and histograms are summed across snapshots. Gauges cannot
+    be, so with per_process_gauges each process's value gets a pid label.
+    """
+    metrics: Dict[str, Dict[str, Any]] = {}
+    collectors: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for entry in snapshot['metrics']:
+            merged = metrics.setdefault(entry['name'], {**entry, 'series': {}})
+            for key, value in entry['series']:
+                key = tuple(key)
+                if key not in merged['series']:
+                    merged['series'][key] = value
+                elif entry['kind'] == 'histogram':
+                    merged['series'][key] = _add_series(merged['series'][key], value)
+                else:
+                    merged['series'][key] += value
+        for entry in snapshot['collectors']:
+            merged = collectors.setdefault(entry['name'], {**entry, 'samples': {}})
+            for labels, value in entry['samples']:
+                if entry['kind'] == 'gauge' and per_process_gauges:
+                    labels = {**labels, 'pid': snapshot['pid']}
+                key = tuple(labels.items())
+                merged['samples'][key] = merged['samples'].get(key, 0) + value
+
+    lines = []
+    for name in sorted(metrics):
+        metric = metrics[name]
+        lines.append(f"# HELP {name} {metric['documentation']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for key, value in metric['series'].items():
+            labels = dict(zip(metric['labelnames'], key))
+            if metric['kind'] != 'histogram':
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip((*metric['buckets'], float('inf')), counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(float(bound))})} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    for name, collector in collectors.items():
+        lines.append(f"# HELP {name} {collector['documentation']}")
+        lines.append(f"# TYPE {name} {collector['kind']}")
+        lines.extend(
+            f"{name}{_format_labels(dict(key))} {_format_value(value)}"
+            for key, value in collector['samples'].items()
+        )
+    return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry; under several server workers see multiprocess.py
+registry = MetricsRegistry()
@@ -0,0 +1,110 @@
+# infrastructure/metrics/timing.py
+
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+from infrastructure.config import METRICS_ENABLED
+from infrastructure.metrics.registry import registry
+
+STAGE_SECONDS = registry.histogram(
+    'stage_duration_seconds', 'Time spent in each stage of request handling', ('stage',)
+)
+REQUEST_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'Request handling time by route and status', ('method', 'route', 'status')
+)
+
+# (stage, seconds) recorded during the current request or job; None outside one
+_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('stage_timings', default=None)
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def stage(name: str):
+    """Context manager timing a block as one stage.
+
+    With metrics disabled it returns a shared no-op, so an instrumented
+    block costs one call and a flag check.
+    """
+    if not METRICS_ENABLED:
+        return _NOOP_STAGE
+    return _Stage(name)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Add a stage duration measured elsewhere (e.g. an AWS call hook)"""
+    STAGE_SECONDS.observe(seconds, stage=name)
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def start_timings() -> Optional[Token]:
+    """Start collecting stages for the current request or job; pass the result to stop_timings"""
+    if not METRICS_ENABLED:
+        return None
+    return _timings.set([])
+
+
+def stop_timings(token: Optional[Token]) -> List[Tuple[str, float]]:
+    """The stages recorded since start_timings, in the order they finished"""
+    if token is None:
+        return []
+    timings = _timings.get() or []
+    try:
+        _timings.reset(token)
+    except ValueError:
+        # Stopped from a different context than it was started in
+        _timings.set(None)
+    return timings
+
+
+def record_request(method: str, route: str, status: int, seconds: float) -> None:
+    REQUEST_SECONDS.observe(seconds, method=method, route=route, status=status)
+
+
+def server_timing(timings: List[Tuple[str, float]], total: Optional[float] = None, prefix: str = '') -> str:
+    """Server-Timing header value: one entry per stage name, durations summed.
+
+    Stages that ran more than once (several DynamoDB queries, concurrent
+    section calls) say how many times in desc; concurrent stages overlap,
+    so their sum can exceed total.
+    """
+    merged: Dict[str, List[float]] = {}
+    for name, seconds in timings:
+        entry = merged.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = []
+    for name, (seconds, count) in merged.items():
+        desc = f';desc="{count} calls"' if count > 1 else ''
+        parts.append(f"{prefix}{name}{desc};dur={seconds * 1000:.1f}")
+    if total is not None:
+        parts.append(f"{prefix}total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
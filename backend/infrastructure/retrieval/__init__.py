@@ -0,0 +1,3 @@
+from .embeddings import HashingEmbeddings
+from .vector_index import LocalVectorIndex
+from .retrievers import LocalVectorRetriever, create_embeddings, create_local_retriever, create_retriever
\ No newline at end of file
@@ -0,0 +1,42 @@
+# infrastructure/retrieval/embeddings.py
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic local embedding stand-in based on feature hashing.
+
+    Unigrams and bigrams are hashed into a fixed number of signed buckets.
+    It needs no network or model weights, which makes it suitable for
+    offline benchmarks and for running the local retriever without Bedrock.
+    """
+
+    TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _tokens(self, text: str) -> List[str]:
+        words = self.TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in self._tokens(text):
+            digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+            value = int.from_bytes(digest, 'little')
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dim] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed(text).tolist()
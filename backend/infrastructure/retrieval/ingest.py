@@ -0,0 +1,89 @@
+# infrastructure/retrieval/ingest.py
+"""Incrementally load text/markdown files into the local vector index.
+
+    python -m infrastructure.retrieval.ingest docs/ --index data/vector_index --build-ivf
+
+Files already present in the index (by path) are skipped, so the command
+can be re-run as the corpus grows.
+"""
+
+import argparse
+import glob
+import os
+import logging
+from typing import Iterator, List, Tuple
+
+from infrastructure.config import LOCAL_INDEX_PATH, RAG_EMBEDDINGS
+from infrastructure.retrieval.retrievers import create_embeddings, create_local_retriever
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 150) -> List[str]:
+    """Split text into overlapping chunks, preferring paragraph boundaries"""
+    chunks = []
+    current = ''
+    for paragraph in (p.strip() for p in text.split('\n\n')):
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > chunk_size:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ''
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        while len(current) > chunk_size:
+            chunks.append(current[:chunk_size])
+            current = current[chunk_size - overlap:]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def iter_chunks(source_dir: str, patterns: List[str], skip: set,
+                chunk_size: int, overlap: int) -> Iterator[Tuple[str, dict]]:
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(source_dir, pattern), recursive=True)):
+            source = os.path.relpath(path, source_dir)
+            if source in skip:
+                continue
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            for i, chunk in enumerate(chunk_text(text, chunk_size, overlap)):
+                yield chunk, {'source': source, 'chunk': i}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source_dir')
+    parser.add_argument('--index', default=LOCAL_INDEX_PATH)
+    parser.add_argument('--embeddings', default=RAG_EMBEDDINGS, choices=['bedrock', 'hashing'])
+    parser.add_argument('--pattern', action='append', default=None,
+                        help='glob relative to source_dir (default: **/*.txt and **/*.md)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--overlap', type=int, default=150)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--build-ivf', action='store_true', help='rebuild IVF lists after loading')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    retriever = create_local_retriever(args.index, embeddings=create_embeddings(args.embeddings))
+    index = retriever.index
+    indexed_sources = {index.document(row)['metadata'].get('source') for row in range(len(index))}
+
+    texts, metadatas = [], []
+    patterns = args.pattern or ['**/*.txt', '**/*.md']
+    for text, metadata in iter_chunks(args.source_dir, patterns, indexed_sources, args.chunk_size, args.overlap):
+        texts.append(text)
+        metadatas.append(metadata)
+        if len(texts) >= args.batch_size:
+            retriever.add_texts(texts, metadatas, batch_size=args.batch_size)
+            texts, metadatas = [], []
+    if texts:
+        retriever.add_texts(texts, metadatas, batch_size=args.batch_size)
+
+    logger.info(f"Index at {args.index} now holds {len(index)} chunks")
+    if args.build_ivf:
+        index.build_ivf()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# infrastructure/retrieval/retrievers.py
+
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+from infrastructure.config import (
+    AWS_REGION, KNOWLEDGE_BASE_ID, RAG_RETRIEVER, RAG_TOP_K, RAG_EMBEDDINGS,
+    RAG_EMBEDDING_MODEL, RAG_EMBEDDING_DIM, LOCAL_INDEX_PATH, LOCAL_INDEX_NPROBE
+)
+from infrastructure.aws import get_client
+from infrastructure.metrics import stage
+from infrastructure.retrieval.embeddings import HashingEmbeddings
+from infrastructure.retrieval.vector_index import LocalVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorRetriever(BaseRetriever):
+    """LangChain retriever over a LocalVectorIndex"""
+
+    index: LocalVectorIndex
+    embeddings: Embeddings
+    k: int = 4
+    nprobe: int = 0
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        with stage('rag.search'):
+            query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            hits = self.index.search(query_vector, k=self.k, nprobe=self.nprobe or None)
+        documents = []
+        for row, score in hits:
+            record = self.index.document(row)
+            documents.append(Document(
+                page_content=record['page_content'],
+                metadata={**record.get('metadata', {}), 'score': score}
+            ))
+        return documents
+
+    def add_texts(self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None,
+                  batch_size: int = 64) -> List[int]:
+        """Embed and append texts to the index in batches"""
+        metadatas = metadatas or [{} for _ in texts]
+        rows = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            vectors = np.asarray(self.embeddings.embed_documents(batch), dtype=np.float32)
+            rows.extend(self.index.add(vectors, [
+                {'page_content': text, 'metadata': metadata}
+                for text, metadata in zip(batch, metadatas[start:start + batch_size])
+            ]))
+        return rows
+
+    def add_documents(self, documents: List[Document], batch_size: int = 64) -> List[int]:
+        return self.add_texts(
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents],
+            batch_size=batch_size
+        )
+
+
+def _aws_client(service_name: str, session=None):
+    """A client from session when given, otherwise the shared one from the registry"""
+    if session is not None:
+        return session.client(service_name, region_name=AWS_REGION)
+    return get_client(service_name)
+
+
+def create_embeddings(kind: str = RAG_EMBEDDINGS, session=None) -> Embeddings:
+    """Embedding model for the local index: Bedrock Titan or the offline hashing stand-in"""
+    if kind == 'hashing':
+        return HashingEmbeddings(dim=RAG_EMBEDDING_DIM)
+    if kind == 'bedrock':
+        from langchain_aws import BedrockEmbeddings
+        return BedrockEmbeddings(
+            client=_aws_client('bedrock-runtime', session),
+            model_id=RAG_EMBEDDING_MODEL,
+            region_name=AWS_REGION,
+            model_kwargs={'dimensions': RAG_EMBEDDING_DIM}
+        )
+    raise ValueError(f"Unsupported embeddings: {kind}")
+
+
+def create_local_retriever(path: str = LOCAL_INDEX_PATH, embeddings: Optional[Embeddings] = None,
+                           k: int = RAG_TOP_K, nprobe: int = LOCAL_INDEX_NPROBE,
+                           session=None) -> LocalVectorRetriever:
+    """Open (or create) the on-disk index at path and wrap it in a retriever"""
+    embeddings = embeddings or create_embeddings(session=session)
+    if os.path.exists(os.path.join(path, LocalVectorIndex.META_FILE)):
+        index = LocalVectorIndex.open(path)
+    else:
+        index = LocalVectorIndex(path, RAG_EMBEDDING_DIM)
+    return LocalVectorRetriever(index=index, embeddings=embeddings, k=k, nprobe=nprobe)
+
+
+def create_retriever(session=None, kind: str = RAG_RETRIEVER, k: int = RAG_TOP_K) -> BaseRetriever:
+    """Retriever for the RAG pipeline, selected by RAG_RETRIEVER (bedrock | local)"""
+    if kind == 'local':
+        logger.info(f"Using local vector retriever at {LOCAL_INDEX_PATH}")
+        return create_local_retriever(k=k, session=session)
+    if kind == 'bedrock':
+        from langchain_aws.retrievers import AmazonKnowledgeBasesRetriever
+        return AmazonKnowledgeBasesRetriever(
+            knowledge_base_id=KNOWLEDGE_BASE_ID,
+            retrieval_config={"vectorSearchConfiguration": {"numberOfResults": k}},
+            client=_aws_client('bedrock-agent-runtime', session),
+            region_name=AWS_REGION
+        )
+    raise ValueError(f"Unsupported retriever: {kind}")
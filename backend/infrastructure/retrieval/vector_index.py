@@ -0,0 +1,236 @@
+# infrastructure/retrieval/vector_index.py
+
+import json
+import os
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """On-disk embedding index searched in process.
+
+    Layout of the index directory:
+        embeddings.npy   float32 matrix (capacity x dim), memory-mapped
+        documents.jsonl  one {"page_content", "metadata"} record per row
+        meta.json        dim, row count and capacity
+        ivf.npz          optional IVF centroids and inverted lists
+
+    Vectors are L2-normalized on insert so inner product equals cosine
+    similarity. Searches are brute force over the memory-mapped matrix, or
+    restricted to the nprobe closest IVF lists once build_ivf() has run.
+    Rows added after the IVF build are always scanned exhaustively.
+    """
+
+    EMBEDDINGS_FILE = 'embeddings.npy'
+    DOCUMENTS_FILE = 'documents.jsonl'
+    META_FILE = 'meta.json'
+    IVF_FILE = 'ivf.npz'
+
+    def __init__(self, path: str, dim: int, initial_capacity: int = 1024):
+        self.path = path
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._documents: List[Dict[str, Any]] = []
+        self._count = 0
+        # (centroids, list_offsets, list_rows, rows covered) once build_ivf
+        # has run; replaced as a whole so searches never see a mix of builds
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, int]] = None
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(self._file(self.META_FILE)):
+            self._load()
+        else:
+            self._matrix = np.lib.format.open_memmap(
+                self._file(self.EMBEDDINGS_FILE), mode='w+', dtype=np.float32,
+                shape=(initial_capacity, dim)
+            )
+            self.flush()
+
+    @classmethod
+    def open(cls, path: str) -> 'LocalVectorIndex':
+        """Open an existing index, taking the dimension from its metadata"""
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        return cls(path, meta['dim'])
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._matrix.shape[0]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        with open(self._file(self.META_FILE)) as f:
+            meta = json.load(f)
+        if meta['dim'] != self.dim:
+            raise ValueError(f"Index at {self.path} has dim {meta['dim']}, expected {self.dim}")
+        self._count = meta['count']
+        self._matrix = np.load(self._file(self.EMBEDDINGS_FILE), mmap_mode='r+')
+
+        try:
+            with open(self._file(self.DOCUMENTS_FILE)) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            # Created but never added to; the file appears with the first add
+            lines = []
+        self._documents = [json.loads(line) for line in lines[:self._count]]
+        if len(lines) > self._count:
+            # Drop records past the committed row count (e.g. an interrupted add)
+            with open(self._file(self.DOCUMENTS_FILE), 'w') as f:
+                f.writelines(lines[:self._count])
+
+        if os.path.exists(self._file(self.IVF_FILE)):
+            ivf = np.load(self._file(self.IVF_FILE))
+            self._ivf = (ivf['centroids'], ivf['list_offsets'], ivf['list_rows'], int(ivf['count']))
+
+    def flush(self) -> None:
+        """Persist the matrix and metadata; documents are appended as they are added"""
+        self._matrix.flush()
+        meta = {'dim': self.dim, 'count': self._count, 'capacity': self.capacity}
+        tmp_path = self._file(self.META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._file(self.META_FILE))
+
+    def _grow(self, required: int) -> None:
+        # Caller holds self._lock. Capacity doubles so appends stay amortized O(1).
+        # Searches do not take the lock: the grown matrix replaces the old one
+        # in a single assignment, and a search still reading the old mapping
+        # keeps it valid (the replaced file stays mapped until it is dropped).
+        capacity = self.capacity
+        while capacity < required:
+            capacity *= 2
+        tmp_path = self._file(self.EMBEDDINGS_FILE + '.tmp')
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=np.float32, shape=(capacity, self.dim)
+        )
+        grown[:self._count] = self._matrix[:self._count]
+        grown.flush()
+        del grown
+        os.replace(tmp_path, self._file(self.EMBEDDINGS_FILE))
+        self._matrix = np.load(self._file(self.EMBEDDINGS_FILE), mmap_mode='r+')
+
+    def add(self, embeddings: np.ndarray, documents: List[Dict[str, Any]]) -> List[int]:
+        """Append embeddings and their documents; returns the new row ids"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected embeddings of shape (n, {self.dim}), got {vectors.shape}")
+        if len(vectors) != len(documents):
+            raise ValueError("embeddings and documents must have the same length")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+        with self._lock:
+            start = self._count
+            end = start + len(vectors)
+            if end > self.capacity:
+                self._grow(end)
+            self._matrix[start:end] = vectors
+            with open(self._file(self.DOCUMENTS_FILE), 'a') as f:
+                for doc in documents:
+                    f.write(json.dumps(doc) + '\n')
+            self._documents.extend(documents)
+            self._count = end
+            self.flush()
+        return list(range(start, end))
+
+    def document(self, row: int) -> Dict[str, Any]:
+        return self._documents[row]
+
+    def build_ivf(self, n_lists: Optional[int] = None, n_iter: int = 10,
+                  sample_size: int = 50000, seed: int = 0) -> None:
+        """Cluster the current rows into n_lists inverted lists (spherical k-means)"""
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(count)))
+            n_lists = min(n_lists, count)
+            data = self._matrix[:count]
+
+            rng = np.random.default_rng(seed)
+            sample_rows = rng.choice(count, size=min(sample_size, count), replace=False)
+            sample = np.asarray(data[np.sort(sample_rows)])
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+            for _ in range(n_iter):
+                assignment = self._assign(sample, centroids)
+                for list_id in range(n_lists):
+                    members = sample[assignment == list_id]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                    else:
+                        # Re-seed empty lists from a random sample row
+                        centroid = sample[rng.integers(len(sample))]
+                    centroids[list_id] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+            assignment = self._assign(data, centroids)
+            order = np.argsort(assignment, kind='stable')
+            list_sizes = np.bincount(assignment, minlength=n_lists)
+            list_rows = order.astype(np.int64)
+            list_offsets = np.concatenate(([0], np.cumsum(list_sizes))).astype(np.int64)
+            self._ivf = (centroids, list_offsets, list_rows, count)
+            np.savez(
+                self._file(self.IVF_FILE),
+                centroids=centroids,
+                list_offsets=list_offsets,
+                list_rows=list_rows,
+                count=count
+            )
+        logger.info(f"Built IVF index with {n_lists} lists over {count} rows")
+
+    @staticmethod
+    def _assign(data: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        assignment = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), chunk_size):
+            block = np.asarray(data[start:start + chunk_size])
+            assignment[start:start + chunk_size] = np.argmax(block @ centroids.T, axis=1)
+        return assignment
+
+    def search(self, query: np.ndarray, k: int = 4, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Top-k (row, cosine score) pairs, best first.
+
+        With nprobe set and an IVF index built, only the nprobe nearest lists
+        (plus rows added since the build) are scored.
+        """
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        q = q / max(np.linalg.norm(q), 1e-12)
+        # Each read once, in this order: an IVF build never covers more rows
+        # than the count read after it, and add() publishes rows before the
+        # count, so the matrix read last holds at least count rows
+        ivf = self._ivf
+        count = self._count
+        matrix = self._matrix
+        if count == 0:
+            return []
+
+        if nprobe and ivf is not None:
+            centroids, list_offsets, list_rows, ivf_count = ivf
+            probe = np.argsort(-(centroids @ q))[:nprobe]
+            candidate_rows = [
+                list_rows[list_offsets[i]:list_offsets[i + 1]] for i in probe
+            ]
+            candidate_rows.append(np.arange(ivf_count, count))
+            rows = np.sort(np.concatenate(candidate_rows))
+            scores = matrix[rows] @ q
+        else:
+            rows = None
+            scores = matrix[:count] @ q
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = rows[top] if rows is not None else top
+        return [(int(row), float(score)) for row, score in zip(ids, scores[top])]
@@ -1 +1,5 @@
-from .json_helper import DecimalEncoder, decimal_to_float
\ No newline at end of file
+from .fieldsets import FieldTree, fields_key, parse_fields, select_fields
+from .json_helper import DecimalEncoder, decimal_to_float, dumps_json, float_to_decimal
+from .lazy import LazyService
+from .singleflight import SingleFlight
+from .streaming_json import StreamingJSONObjectParser
\ No newline at end of file
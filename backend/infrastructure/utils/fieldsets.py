@@ -0,0 +1,68 @@
+# infrastructure/utils/fieldsets.py
+
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# Field name -> nested selection; an empty dict selects the whole value
+FieldTree = Dict[str, 'FieldTree']
+
+MAX_FIELDS = 50
+MAX_DEPTH = 6
+_FIELD_NAME = re.compile(r'^[A-Za-z0-9_]+$')
+
+
+def parse_fields(spec: Optional[str], always: Iterable[str] = ()) -> Optional[FieldTree]:
+    """Parse a ?fields= value such as "title,details.milestones.name" into a tree.
+
+    Paths are dot-separated from the top of the item; a path through a list
+    applies to every element. Fields in always are added to any selection.
+    Returns None when spec is empty (no pruning); raises ValueError when
+    it is malformed.
+    """
+    if spec is None or not spec.strip():
+        return None
+    paths = [path.strip() for path in spec.split(',') if path.strip()]
+    if len(paths) > MAX_FIELDS:
+        raise ValueError(f"fields may list at most {MAX_FIELDS} paths")
+
+    tree: FieldTree = {name: {} for name in always}
+    for path in paths:
+        names = path.split('.')
+        if len(names) > MAX_DEPTH or not all(_FIELD_NAME.match(name) for name in names):
+            raise ValueError(f"Invalid field path '{path}'")
+        node = tree
+        for depth, name in enumerate(names):
+            if name in node and not node[name]:
+                # An ancestor was already selected whole
+                break
+            if depth == len(names) - 1:
+                node[name] = {}
+            else:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def fields_key(tree: Optional[FieldTree]) -> str:
+    """Canonical form of a tree, equal for equivalent selections (cache and ETag key)"""
+    if not tree:
+        return ''
+    return ','.join(
+        f"{name}({fields_key(tree[name])})" if tree[name] else name
+        for name in sorted(tree)
+    )
+
+
+def select_fields(value: Any, tree: Optional[FieldTree]) -> Any:
+    """Copy of value keeping only the selected fields; unselected branches are never visited"""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [select_fields(element, tree) for element in value]
+    if not isinstance(value, dict):
+        # A path that goes deeper than the data stops at the value
+        return value
+    return {
+        name: select_fields(value[name], subtree)
+        for name, subtree in tree.items()
+        if name in value
+    }
@@ -3,6 +3,12 @@
 from decimal import Decimal
 import json
 
+# orjson is an optional C-backed encoder; fall back to the stdlib when absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, Decimal):
@@ -17,4 +23,29 @@ def decimal_to_float(obj):
         return {k: decimal_to_float(v) for k, v in obj.items()}
     elif isinstance(obj, list):
         return [decimal_to_float(x) for x in obj]
-    return obj
\ No newline at end of file
+    return obj
+
+def float_to_decimal(obj):
+    """Recursively converts float to Decimal (DynamoDB rejects floats)"""
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, dict):
+        return {k: float_to_decimal(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [float_to_decimal(x) for x in obj]
+    return obj
+
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(obj) -> bytes:
+    """Encode a DynamoDB item (or any nested structure) to JSON bytes in one pass.
+
+    Decimals are converted to floats by the encoder itself, so there is no
+    need to copy the tree with decimal_to_float first.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default)
+    return json.dumps(obj, cls=DecimalEncoder, separators=(',', ':')).encode('utf-8')
\ No newline at end of file
@@ -0,0 +1,53 @@
+# infrastructure/utils/lazy.py
+
+import threading
+import time
+import logging
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class LazyService(Generic[T]):
+    """Stand-in for a service that is built on first attribute access.
+
+    Route modules hold one of these at module level instead of the service
+    itself, so importing them (and forking workers) costs nothing until a
+    request actually needs the service. Construction happens once, under a
+    lock; if it fails the next access retries.
+    """
+
+    def __init__(self, factory: Callable[[], T], name: Optional[str] = None):
+        self._factory = factory
+        self._name = name or getattr(factory, '__name__', 'service')
+        self._lock = threading.Lock()
+        self._instance: Optional[T] = None
+        self.build_seconds: Optional[float] = None
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    self._instance = self._factory()
+                    self.build_seconds = time.perf_counter() - started
+                    logger.info(f"Built {self._name} in {self.build_seconds * 1000:.0f} ms")
+        return self._instance
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._instance = None
+            self.build_seconds = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the proxy itself; private
+        # names are never forwarded so copy/pickle probes cannot recurse
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
@@ -0,0 +1,91 @@
+# infrastructure/utils/streaming_json.py
+
+import json
+import logging
+from typing import Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingJSONObjectParser:
+    """Incrementally parses one JSON object from text arriving in pieces.
+
+    feed() returns each top-level (key, value) member as soon as its value
+    is complete: an object or array member the moment its closing bracket
+    arrives, a scalar member at the following comma or closing brace.
+    Text before the first '{' (prose, a ``` fence) and after the object
+    closes is ignored. Each character is scanned once, so feeding n
+    characters costs O(n) however small the pieces.
+
+    A member that is not valid JSON is skipped and its error kept in
+    errors, so one bad section does not lose the rest of the object.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self.errors: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member: List[str] = []
+        # The current member was already emitted when its container closed
+        self._emitted = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        members = []
+        for char in text:
+            if self.done:
+                break
+            if not self.started:
+                if char == '{':
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                self._member.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+                    self._finish_member(members)
+                    break
+                if self._depth == 1:
+                    # A section's value just closed; emit without waiting for the comma
+                    self._member.append(char)
+                    self._finish_member(members)
+                    self._emitted = True
+                    continue
+            elif char == ',' and self._depth == 1:
+                self._finish_member(members)
+                self._emitted = False
+                continue
+            self._member.append(char)
+        return members
+
+    def _finish_member(self, members: List[Tuple[str, Any]]) -> None:
+        text = ''.join(self._member).strip()
+        self._member = []
+        if self._emitted or not text:
+            return
+        try:
+            member = json.loads('{' + text + '}')
+        except json.JSONDecodeError as e:
+            error = f"Invalid JSON member {text[:40]!r}: {e}"
+            logger.error(error)
+            self.errors.append(error)
+            return
+        members.extend(member.items())
@@ -0,0 +1,97 @@
+# tests/conftest.py
+"""Shared fixtures. Runs without AWS (pip install -r requirements-dev.txt):
+
+    python -m pytest -q tests
+"""
+
+import os
+import tempfile
+
+# Before any application import reads them
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+# The fake model and the local index instead of Bedrock
+os.environ.setdefault('LLM_PROVIDER', 'fake')
+os.environ.setdefault('LLM_FAKE_LATENCY_SECONDS', '0')
+os.environ.setdefault('RAG_RETRIEVER', 'local')
+os.environ.setdefault('RAG_EMBEDDINGS', 'hashing')
+os.environ.setdefault('LOCAL_INDEX_PATH', tempfile.mkdtemp(prefix='precisionturn-index-'))
+
+import pytest
+from moto import mock_aws
+
+from infrastructure.aws import aws_clients
+from infrastructure.db.dynamodb import DynamoDBConnection
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """In-process DynamoDB stand-in with the plans table, as benchmarks/suite.py uses"""
+    from infrastructure.db.setup_tables import ensure_plans_table
+
+    # The credentials above, not a profile from the machine's AWS config
+    monkeypatch.delenv('AWS_PROFILE', raising=False)
+    monkeypatch.setattr(aws_clients, 'profile_name', None)
+    with mock_aws():
+        aws_clients.reset()
+        DynamoDBConnection._instance = None
+        connection = DynamoDBConnection()
+        ensure_plans_table(connection.dynamodb.meta.client)
+        yield connection
+        aws_clients.reset()
+        DynamoDBConnection._instance = None
+
+
+@pytest.fixture(scope='session')
+def knowledge_base():
+    """Local index seeded with the benchmark corpus"""
+    from api.routes.knowledge import kb_service
+    from benchmarks.suite import seed_knowledge_base
+
+    seed_knowledge_base(50)
+    # A service built earlier holds the index as it was when opened
+    kb_service.reset()
+
+
+@pytest.fixture
+def client(dynamodb):
+    """Flask test client whose services start from an empty table and caches"""
+    from app import create_app
+    from api.routes.knowledge import kb_service
+    from api.routes.plans import idempotency_records, plan_service
+
+    plan_service.reset()
+    idempotency_records.clear()
+    if kb_service.built:
+        kb_service.answer_cache.clear()
+    yield create_app({'TESTING': True}).test_client()
+    plan_service.reset()
+
+
+@pytest.fixture(scope='module')
+def moto_server():
+    """moto in server mode, for the aioboto3 code paths (the in-process
+    mock only patches botocore); yields the endpoint URL"""
+    import socket
+
+    from moto.server import ThreadedMotoServer
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def dynamodb_endpoint(moto_server):
+    """moto_server with the plans table (recreated if the in-process mock reset it)"""
+    import boto3
+
+    from infrastructure.db.setup_tables import ensure_plans_table
+
+    ensure_plans_table(boto3.client('dynamodb', endpoint_url=moto_server))
+    return moto_server
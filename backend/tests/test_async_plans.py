@@ -0,0 +1,190 @@
+# tests/test_async_plans.py
+
+import asyncio
+import functools
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrastructure.db.async_dynamodb import AsyncDynamoDBConnection
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.async_plan_repository import AsyncPlanRepository
+from infrastructure.db.repositories.plan_repository import PlanConditionError, PlanRepository
+
+
+def run(endpoint, scenario):
+    """Run scenario(repository) on a fresh connection and event loop"""
+    async def main():
+        async with AsyncDynamoDBConnection(endpoint_url=endpoint) as connection:
+            return await scenario(AsyncPlanRepository(connection))
+    return asyncio.run(main())
+
+
+def test_create_get_and_list_page(dynamodb_endpoint):
+    async def scenario(repository):
+        plans = [await repository.create(PlanModel(f"Async {i}", details={'budget': 1.5})) for i in range(5)]
+        with pytest.raises(ClientError):
+            await repository.create(plans[0])
+
+        item = await repository.get(plans[0].id)
+        assert item == plans[0].to_dynamodb_item()
+        assert await repository.get('missing') is None
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = await repository.list_page(limit=2, cursor=cursor, summary=True)
+            seen.extend(item['id'] for item in items)
+            if cursor is None:
+                break
+        assert {plan.id for plan in plans} <= set(seen)
+        with pytest.raises(ValueError):
+            await repository.list_page(cursor='not base64!')
+
+    run(dynamodb_endpoint, scenario)
+
+
+def test_conditional_update(dynamodb_endpoint):
+    async def scenario(repository):
+        plan = await repository.create(PlanModel('Async update', details={'scope': 'Partial'}))
+        draft_only = ('#status = :draft', {'#status': 'status'}, {':draft': 'draft'})
+
+        updated = await repository.update(plan.id, {('details', 'scope'): 'Full'}, condition=draft_only)
+        assert updated['details']['scope'] == 'Full'
+        await repository.update(plan.id, {'status': 'approved'}, created_at=plan.created_at)
+        with pytest.raises(PlanConditionError) as error:
+            await repository.update(plan.id, {'title': 'Edited'}, condition=draft_only)
+        assert error.value.item['status'] == 'approved'
+        assert await repository.update('missing', {'title': 'Edited'}) is None
+
+    run(dynamodb_endpoint, scenario)
+
+
+def test_delete_removes_every_version_in_a_transaction(dynamodb_endpoint):
+    async def scenario(repository):
+        plan = await repository.create(PlanModel('Async delete'))
+        older = plan.to_dynamodb_item()
+        older['createdAt'] = '2000-01-01T00:00:00'
+        await repository.transact_write([{'Put': {'Item': older}}])
+        assert len(await repository.version_keys(plan.id)) == 2
+
+        assert await repository.delete(plan.id) is True
+        assert await repository.version_keys(plan.id) == []
+        assert await repository.delete(plan.id) is False
+
+    run(dynamodb_endpoint, scenario)
+
+
+def test_blocking_repository_deletes_every_version(dynamodb):
+    repository = PlanRepository()
+    plan = repository.create(PlanModel('Plan'))
+    older = plan.to_dynamodb_item()
+    older['createdAt'] = '2000-01-01T00:00:00'
+    repository.table.put_item(Item=older)
+    assert len(repository.resolve_keys([plan.id], latest_only=False)[plan.id]) == 2
+
+    assert repository.delete(plan.id) is True
+    assert repository.resolve_keys([plan.id], latest_only=False) == {}
+    assert repository.delete(plan.id) is False
+
+
+def test_transact_write_leaves_the_callers_operations_untouched(dynamodb_endpoint):
+    async def scenario(repository):
+        plan = PlanModel('Async transaction')
+        operations = [{'Put': {'Item': plan.to_dynamodb_item()}}]
+        await repository.transact_write(operations)
+        assert operations == [{'Put': {'Item': plan.to_dynamodb_item()}}]
+        assert (await repository.get(plan.id))['title'] == 'Async transaction'
+
+    run(dynamodb_endpoint, scenario)
+
+
+def test_execute_transaction_is_all_or_nothing(dynamodb_endpoint):
+    async def scenario(repository):
+        plan = PlanModel('Async atomic')
+        with pytest.raises(ClientError) as error:
+            await repository.db.execute_transaction([
+                {'Put': {'TableName': repository.table_name, 'Item': plan.to_dynamodb_item()}},
+                {'ConditionCheck': {
+                    'TableName': repository.table_name,
+                    'Key': {'id': 'missing', 'createdAt': '2000-01-01T00:00:00'},
+                    'ConditionExpression': 'attribute_exists(id)'
+                }}
+            ])
+        assert error.value.response['Error']['Code'] == 'TransactionCanceledException'
+        assert await repository.get(plan.id) is None
+
+    run(dynamodb_endpoint, scenario)
+
+
+def test_closed_connection_refuses_calls():
+    connection = AsyncDynamoDBConnection(endpoint_url='http://127.0.0.1:1')
+    with pytest.raises(RuntimeError):
+        asyncio.run(connection.execute_transaction([]))
+
+
+@pytest.fixture
+def asgi_client(dynamodb_endpoint, monkeypatch):
+    """Starlette test client running the ASGI lifespan against the moto server"""
+    from starlette.testclient import TestClient
+
+    import asgi
+    from api.routes.plans import plan_service
+    from infrastructure.aws import aws_clients
+    from infrastructure.db import dynamodb
+    from infrastructure.db.dynamodb import DynamoDBConnection
+
+    monkeypatch.delenv('AWS_PROFILE', raising=False)
+    monkeypatch.setattr(aws_clients, 'profile_name', None)
+    monkeypatch.setattr(dynamodb, 'DYNAMODB_ENDPOINT_URL', dynamodb_endpoint)
+    monkeypatch.setattr(asgi, 'AsyncDynamoDBConnection',
+                        functools.partial(AsyncDynamoDBConnection, endpoint_url=dynamodb_endpoint))
+    # The job queue is shared with the other tests, so it is not drained here
+    monkeypatch.setattr(asgi, 'drain', lambda: None)
+    aws_clients.reset()
+    DynamoDBConnection._instance = None
+    plan_service.reset()
+    with TestClient(asgi.app) as client:
+        yield client
+    plan_service.reset()
+    aws_clients.reset()
+    DynamoDBConnection._instance = None
+
+
+def test_asgi_serves_plan_reads_and_deletes(asgi_client):
+    from api.routes.plans import plan_service
+
+    created = [plan_service.plan_repository.create(PlanModel(f"ASGI {i}")) for i in range(3)]
+
+    page = asgi_client.get('/api/plans/', params={'view': 'summary', 'limit': 2})
+    assert page.status_code == 200 and len(page.json()['items']) == 2 and page.json()['nextCursor']
+
+    plan_id = created[0].id
+    response = asgi_client.get(f"/api/plans/{plan_id}")
+    assert response.status_code == 200 and response.json()['title'] == 'ASGI 0'
+    assert asgi_client.get(f"/api/plans/{plan_id}", headers={'If-None-Match': response.headers['etag']}).status_code == 304
+
+    # Flask routes are mounted behind the async ones
+    assert asgi_client.patch(f"/api/plans/{created[1].id}", json={'title': 'Renamed'}).json()['title'] == 'Renamed'
+    assert asgi_client.delete(f"/api/plans/{plan_id}").status_code == 200
+    assert asgi_client.get(f"/api/plans/{plan_id}").status_code == 404
+    assert asgi_client.delete(f"/api/plans/{plan_id}").status_code == 404
+
+
+def test_asgi_compresses_large_plans_and_selects_fields(asgi_client):
+    from api.routes.plans import plan_service
+
+    plan = plan_service.plan_repository.create(PlanModel('ASGI large', details={'scope': 'Full ' * 400}))
+    url = f"/api/plans/{plan.id}"
+    identity = asgi_client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in identity.headers
+
+    # The client decodes the body; the headers show what was sent
+    response = asgi_client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip' and 'Accept-Encoding' in response.headers['vary']
+    assert response.headers['etag'] == f"W/{identity.headers['etag']}"
+    assert response.content == identity.content
+    assert asgi_client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['etag']}).status_code == 304
+
+    sparse = asgi_client.get(url, params={'fields': 'title'})
+    assert sparse.json() == {'id': plan.id, 'createdAt': plan.created_at, 'updatedAt': plan.updated_at, 'title': 'ASGI large'}
+    assert asgi_client.get(url, params={'fields': 'details..scope'}).status_code == 400
@@ -0,0 +1,91 @@
+# tests/test_benchmark_scoring.py
+
+import copy
+import json
+
+import numpy as np
+import pytest
+
+from infrastructure.config import INDUSTRY_BENCHMARKS_PATH
+from infrastructure.data.benchmark_index import BenchmarkIndex
+
+
+@pytest.fixture(scope='module')
+def data():
+    with open(INDUSTRY_BENCHMARKS_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='module')
+def index(data):
+    return BenchmarkIndex(data)
+
+
+def test_score_one_interpolates_between_percentiles(index):
+    # Small refinery: 25 days is the duration median, 400k/day sits between p10 and p25
+    score = index.score_one('Refinery', 10_000_000, 25)
+    assert (score['plantType'], score['sizeClass'], score['plantTypeMatched']) == ('refinery', 'small', True)
+    assert score['durationPercentile'] == pytest.approx(50)
+    assert score['costPercentile'] == pytest.approx(10 + 15 * 50_000 / 130_000)
+    assert score['benchmarkComparison'] == pytest.approx(400_000 / 650_000)
+    assert score['realistic'] and 0 < score['realism'] < 1
+    assert score['costBand'] == [350_000, 1_100_000]
+
+
+def test_plant_types_resolve_through_aliases_and_fallback(index):
+    assert index.score_one(' Oil Refinery ', 10_000_000, 25)['plantType'] == 'refinery'
+    unknown = index.score_one('Brewery', 10_000_000, 25)
+    assert unknown['plantType'] == 'general' and not unknown['plantTypeMatched']
+    missing = index.score_one('refinery', None, 25)
+    assert not missing['valid'] and not missing['realistic']
+    assert missing['realism'] is None and missing['costPercentile'] is None
+
+
+def test_ranks_are_extrapolated_outside_the_band(index):
+    cheap = index.score_one('refinery', 1_000_000, 25)
+    extreme = index.score_one('refinery', 10_000_000, 1000)
+    assert 0 <= cheap['costPercentile'] < 10 and not cheap['realistic']
+    assert extreme['durationPercentile'] == 100 and extreme['realism'] == 0
+
+
+def test_batch_scores_match_single_scores(index):
+    rng = np.random.default_rng(0)
+    types = [rng.choice(index.plant_types + ['unknown', None]) for _ in range(200)]
+    budgets = rng.uniform(1e6, 2e8, 200).tolist()
+    durations = rng.uniform(5, 120, 200).tolist()
+    budgets[3], durations[7] = 'n/a', 0
+
+    scores = index.score(types, budgets, durations)
+    for i in range(200):
+        single = index.score_one(types[i], budgets[i], durations[i])
+        assert bool(scores['realistic'][i]) == single['realistic']
+        if single['valid']:
+            assert scores['realism'][i] == pytest.approx(single['realism'])
+        else:
+            assert np.isnan(scores['realism'][i])
+
+
+def test_non_increasing_percentiles_are_rejected(data):
+    broken = copy.deepcopy(data)
+    broken['plantTypes']['refinery']['sizes']['small']['durationDays'][2] = 0
+    with pytest.raises(ValueError):
+        BenchmarkIndex(broken)
+
+
+def test_portfolio_analysis_ranks_stored_plans(client):
+    from infrastructure.db.models.plan import PlanModel
+    from infrastructure.db.repositories.plan_repository import PlanRepository
+
+    repository = PlanRepository()
+    for title, budget, duration in (('Typical', 10_000_000, 25), ('Rushed', 10_000_000, 5), ('Unknown', None, None)):
+        repository.create(PlanModel(title, details={'plantType': 'refinery', 'budget': budget, 'duration': duration}))
+
+    result = client.get('/api/plans/portfolio/analysis').get_json()
+    assert result['count'] == 3 and not result['truncated']
+    assert [plan['title'] for plan in result['plans']] == ['Typical', 'Rushed', 'Unknown']
+    assert result['summary']['realistic'] == 1 and result['summary']['missingInputs'] == 1
+
+    ascending = client.get('/api/plans/portfolio/analysis', query_string={'order': 'asc'}).get_json()
+    assert [plan['title'] for plan in ascending['plans']] == ['Rushed', 'Typical', 'Unknown']
+    for query in ({'limit': 0}, {'order': 'up'}, {'status': 'lost'}):
+        assert client.get('/api/plans/portfolio/analysis', query_string=query).status_code == 400
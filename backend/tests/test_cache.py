@@ -0,0 +1,77 @@
+# tests/test_cache.py
+
+import pytest
+
+from infrastructure.cache import InMemoryCacheBackend, create_cache_backend
+from infrastructure.cache import backends
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the cache module"""
+    now = [1000.0]
+    monkeypatch.setattr(backends.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = InMemoryCacheBackend('test', default_ttl=10)
+    cache.set('default', 'a')
+    cache.set('short', 'b', ttl=2)
+    cache.set('forever', 'c', ttl=0)
+
+    clock[0] += 5
+    assert cache.get('short') is None
+    assert cache.get('default') == 'a'
+    clock[0] += 5
+    assert cache.get('default') is None
+    assert cache.get('forever') == 'c'
+    # Expired entries are dropped when read
+    assert cache.stats()['size'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InMemoryCacheBackend('test', max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['size'] == 2
+    assert stats['hits'] == 3 and stats['misses'] == 1
+
+
+def test_add_only_stores_absent_or_expired_keys(clock):
+    cache = InMemoryCacheBackend('test')
+    assert cache.add('key', 'first', ttl=5)
+    assert not cache.add('key', 'second')
+    assert cache.get('key') == 'first'
+    clock[0] += 5
+    assert cache.add('key', 'third')
+    assert cache.get('key') == 'third'
+
+
+def test_clear_by_prefix():
+    cache = create_cache_backend('memory://', 'test')
+    cache.set('kb-1:a', 1)
+    cache.set('kb-1:b', 2)
+    cache.set('kb-2:a', 3)
+    assert cache.clear(prefix='kb-1:') == 2
+    assert cache.get('kb-2:a') == 3
+    with pytest.raises(ValueError):
+        create_cache_backend('ftp://cache', 'test')
+
+
+def test_answer_cache_shares_entries_across_question_variants(client, knowledge_base):
+    hits = client.get('/api/rag/cache').get_json()['hits']
+    first = client.post('/api/rag/query', json={'question': 'What is the purge time?'}).get_json()
+    repeat = client.post('/api/rag/query', json={'question': '  what is the PURGE time  '}).get_json()
+    assert repeat == first
+    stats = client.get('/api/rag/cache').get_json()
+    assert stats['hits'] == hits + 1 and stats['size'] == 1
+
+    assert client.post('/api/rag/cache/invalidate').get_json() == {'invalidated': 1}
+    assert client.get('/api/rag/cache').get_json()['size'] == 0
@@ -0,0 +1,71 @@
+# tests/test_compression.py
+
+import gzip
+
+import pytest
+
+from api.routes.compression import choose_encoding
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository
+
+# brotli is optional; without it only gzip is offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+needs_brotli = pytest.mark.skipif(brotli is None, reason='brotli is not installed')
+
+
+@pytest.mark.parametrize('header, encoding', [
+    (None, None), ('', None), ('identity', None),
+    ('gzip', 'gzip'), ('br;q=0.5, gzip', 'gzip'), ('br;q=0, *;q=0.1', 'gzip'), ('gzip;q=bad', None),
+    pytest.param('gzip, br', 'br', marks=needs_brotli), pytest.param('*', 'br', marks=needs_brotli)
+])
+def test_choose_encoding_honours_quality_values(header, encoding):
+    assert choose_encoding(header) == encoding
+
+
+def large_plan():
+    return PlanRepository().create(PlanModel('Plan', details={'scope': 'Full ' * 400}))
+
+
+@pytest.mark.parametrize('encoding, decompress', [
+    ('gzip', gzip.decompress),
+    pytest.param('br', lambda data: brotli.decompress(data), marks=needs_brotli)
+])
+def test_large_json_is_compressed_for_clients_that_accept_it(client, encoding, decompress):
+    plan = large_plan()
+    identity = client.get(f"/api/plans/{plan.id}")
+    assert 'Content-Encoding' not in identity.headers
+    assert 'Accept-Encoding' in identity.headers['Vary']
+
+    response = client.get(f"/api/plans/{plan.id}", headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert decompress(response.data) == identity.data
+    assert int(response.headers['Content-Length']) == len(response.data) < len(identity.data)
+    # The bytes differ from the identity response, so the validator is weak
+    assert response.headers['ETag'] == f"W/{identity.headers['ETag']}"
+
+    revalidated = client.get(f"/api/plans/{plan.id}", headers={
+        'Accept-Encoding': encoding, 'If-None-Match': response.headers['ETag']
+    })
+    assert revalidated.status_code == 304 and 'Content-Encoding' not in revalidated.headers
+
+
+def test_small_and_error_responses_are_sent_as_is(client):
+    plan = PlanRepository().create(PlanModel('Plan'))
+    small = client.get(f"/api/plans/{plan.id}", headers={'Accept-Encoding': 'gzip'})
+    assert small.status_code == 200 and 'Content-Encoding' not in small.headers
+    assert not small.headers['ETag'].startswith('W/')
+
+    missing = client.get('/api/plans/missing', headers={'Accept-Encoding': 'gzip'})
+    assert missing.status_code == 404 and 'Content-Encoding' not in missing.headers
+
+
+def test_compression_can_be_disabled(client, monkeypatch):
+    from api.routes import compression
+
+    monkeypatch.setattr(compression, 'COMPRESSION_ENABLED', False)
+    response = client.get(f"/api/plans/{large_plan().id}", headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
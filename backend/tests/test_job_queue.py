@@ -0,0 +1,128 @@
+# tests/test_job_queue.py
+
+import threading
+import time
+
+import pytest
+
+from infrastructure.cache import InMemoryCacheBackend
+from infrastructure.jobs import Job, JobQueue, QueueFullError
+
+
+def wait_finished(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = queue.record(job_id)
+        if record and record['status'] in (Job.SUCCEEDED, Job.FAILED):
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_lifecycle():
+    queue = JobQueue('test', max_workers=1)
+    release = threading.Event()
+    job = queue.submit(lambda value: release.wait(5) and value * 2, 21)
+    assert job.status in (Job.QUEUED, Job.RUNNING)
+
+    release.set()
+    record = wait_finished(queue, job.id)
+    assert record['status'] == Job.SUCCEEDED
+    assert record['result'] == 42
+    assert record['waitTime'] >= 0 and record['runTime'] >= 0
+    # Inputs are dropped once the job is done
+    assert job.args == () and job.kwargs == {}
+
+    stats = queue.stats()
+    assert stats['submitted'] == 1 and stats['succeeded'] == 1 and stats['depth'] == 0
+    queue.shutdown()
+
+
+def test_failed_job_records_error():
+    queue = JobQueue('test', max_workers=1)
+
+    def fail():
+        raise RuntimeError('boom')
+
+    record = wait_finished(queue, queue.submit(fail).id)
+    assert record['status'] == Job.FAILED
+    assert record['error'] == 'boom' and record['result'] is None
+    queue.shutdown()
+
+
+def test_submit_unique_coalesces_until_finished():
+    queue = JobQueue('test', max_workers=2)
+    release = threading.Event()
+    first, created = queue.submit_unique('key', release.wait, 5)
+    second, created_again = queue.submit_unique('key', release.wait, 5)
+    other, other_created = queue.submit_unique('other', lambda: 'done')
+    assert created and not created_again and other_created
+    assert second['id'] == first['id'] != other['id']
+    assert queue.stats()['coalesced'] == 1
+
+    release.set()
+    wait_finished(queue, first['id'])
+    # Finished work no longer absorbs new submissions
+    third, created = queue.submit_unique('key', lambda: 'again')
+    assert created and third['id'] != first['id']
+    queue.shutdown()
+
+
+def test_submit_unique_coalesces_across_queues_sharing_a_store():
+    store = InMemoryCacheBackend('jobs')
+    # Two server workers, each with its own queue
+    first_worker = JobQueue('test', max_workers=1, store=store)
+    second_worker = JobQueue('test', max_workers=1, store=store)
+    release = threading.Event()
+
+    record, created = first_worker.submit_unique('key', lambda: release.wait(5) and 'plan')
+    joined, joined_created = second_worker.submit_unique('key', lambda: 'duplicate')
+    assert created and not joined_created
+    assert joined['id'] == record['id']
+
+    release.set()
+    wait_finished(first_worker, record['id'])
+    # The other worker answers polls from the shared record
+    polled = second_worker.record(record['id'])
+    assert polled['status'] == Job.SUCCEEDED and polled['result'] == 'plan'
+    assert second_worker.get(record['id']) is None
+    first_worker.shutdown()
+    second_worker.shutdown()
+
+
+def test_full_queue_rejects():
+    queue = JobQueue('test', max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    running = queue.submit(release.wait, 5)
+    while queue.record(running.id)['status'] != Job.RUNNING:
+        time.sleep(0.01)
+    queue.submit(release.wait, 5)
+    with pytest.raises(QueueFullError):
+        queue.submit(release.wait, 5)
+    assert queue.stats()['rejected'] == 1
+    release.set()
+    queue.shutdown()
+
+
+def test_shutdown_finishes_queued_work_then_rejects():
+    queue = JobQueue('test', max_workers=1)
+    jobs = [queue.submit(time.sleep, 0.01) for _ in range(3)]
+    queue.shutdown(wait=True, timeout=5)
+    assert all(job.status == Job.SUCCEEDED for job in jobs)
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda: None)
+
+
+def test_shutdown_timeout_holds_with_a_full_queue():
+    queue = JobQueue('test', max_workers=1, max_queue_size=2)
+    release = threading.Event()
+    running = queue.submit(release.wait, 5)
+    while queue.record(running.id)['status'] != Job.RUNNING:
+        time.sleep(0.01)
+    queue.submit(release.wait, 5)
+    queue.submit(release.wait, 5)
+
+    started = time.monotonic()
+    queue.shutdown(wait=True, timeout=0.2)
+    assert time.monotonic() - started < 1
+    release.set()
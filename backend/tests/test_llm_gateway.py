@@ -0,0 +1,125 @@
+# tests/test_llm_gateway.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrastructure.llm.gateway import (
+    AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, LLMGateway, classify_error
+)
+
+
+def client_error(code, status=400):
+    return ClientError({'Error': {'Code': code}, 'ResponseMetadata': {'HTTPStatusCode': status}}, 'Converse')
+
+
+def test_classify_error():
+    assert classify_error(client_error('ThrottlingException')) == 'throttled'
+    assert classify_error(client_error('Anything', 429)) == 'throttled'
+    assert classify_error(client_error('ServiceUnavailableException', 503)) == 'transient'
+    assert classify_error(client_error('ValidationException')) is None
+    assert classify_error(ValueError('bad prompt')) is None
+
+
+def test_limit_grows_additively_and_halves_on_throttle():
+    limiter = AdaptiveConcurrencyLimiter(initial=4, min_limit=1, max_limit=8)
+    for _ in range(4):
+        limiter.release(limiter.try_acquire())
+    assert 4.9 < limiter.limit < 5.0
+
+    limiter.release(limiter.try_acquire(), throttled=True)
+    assert 2.4 < limiter.limit < 2.5
+
+
+def test_one_burst_of_throttles_decreases_once():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, min_limit=1, max_limit=8)
+    tokens = [limiter.try_acquire() for _ in range(4)]
+    for token in tokens:
+        limiter.release(token, throttled=True)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_limit_stays_within_bounds():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, min_limit=2, max_limit=3)
+    for _ in range(50):
+        limiter.release(limiter.try_acquire())
+    assert limiter.limit == 3
+    for _ in range(5):
+        limiter.release(limiter.try_acquire(), throttled=True)
+    assert limiter.limit == 2
+
+
+def test_acquire_waits_for_a_release():
+    limiter = AdaptiveConcurrencyLimiter(initial=1, min_limit=1, max_limit=1)
+    token = limiter.try_acquire()
+    assert limiter.try_acquire() is None
+    assert limiter.acquire(timeout=0.05) is None
+
+    threading.Timer(0.05, limiter.release, (token,)).start()
+    assert limiter.acquire(timeout=5) is not None
+
+
+def test_acquire_async_is_woken_by_a_release_from_another_thread():
+    limiter = AdaptiveConcurrencyLimiter(initial=1, min_limit=1, max_limit=1)
+
+    async def scenario():
+        token = await limiter.acquire_async(timeout=1)
+        assert await limiter.acquire_async(timeout=0.05) is None
+        threading.Timer(0.05, limiter.release, (token,)).start()
+        started = time.monotonic()
+        assert await limiter.acquire_async(timeout=5) is not None
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 1
+    assert limiter._async_waiters == []
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    # One probe is let through while half-open
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+
+def test_failed_probe_reopens_and_abandoned_probe_is_replaced():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_probe_stream_closed_by_the_consumer_closes_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    gateway = LLMGateway('test-model', breaker=breaker)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        next(gateway.stream(lambda: iter(['chunk'])))
+    time.sleep(0.06)
+
+    # The half-open probe is a stream the client abandons after one chunk
+    probe = gateway.stream(lambda: iter(['first', 'second']))
+    assert next(probe) == 'first'
+    probe.close()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert gateway.limiter.in_flight == 0
+    assert list(gateway.stream(lambda: iter(['again']))) == ['again']
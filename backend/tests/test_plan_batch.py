@@ -0,0 +1,50 @@
+# tests/test_plan_batch.py
+
+import pytest
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository
+
+
+def test_batch_get_returns_one_result_per_id_in_order(client):
+    repository = PlanRepository()
+    # More than one BatchGetItem call's worth of keys
+    plans = [repository.create(PlanModel(f"Plan {i}", details={'scope': 'Full'})) for i in range(105)]
+    ids = [plan.id for plan in reversed(plans)]
+    exact = {'id': plans[0].id, 'createdAt': plans[0].created_at}
+
+    response = client.post('/api/plans/batch-get', query_string={'fields': 'title'},
+                           json={'ids': ids + ['missing', ids[0], exact]})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [result['id'] for result in body['results']] == ids + ['missing']
+    assert body['summary'] == {'requested': 106, 'succeeded': 105, 'failed': 1}
+    first = body['results'][0]
+    assert first['status'] == 'ok' and first['plan']['title'] == 'Plan 104'
+    # Only the requested fields (and the plan's key) are returned
+    assert 'details' not in first['plan']
+    assert body['results'][-1] == {'id': 'missing', 'status': 'not_found'}
+
+
+def test_batch_delete_removes_plans_and_their_cached_responses(client):
+    repository = PlanRepository()
+    plans = [repository.create(PlanModel(f"Plan {i}")) for i in range(3)]
+    # Warm the plan cache, which the delete has to invalidate
+    assert client.get(f"/api/plans/{plans[0].id}").status_code == 200
+
+    body = client.post('/api/plans/batch-delete', json={
+        'ids': [plans[0].id, {'id': plans[1].id, 'createdAt': plans[1].created_at}, 'missing']
+    }).get_json()
+    assert [result['status'] for result in body['results']] == ['deleted', 'deleted', 'not_found']
+    assert body['summary'] == {'requested': 3, 'succeeded': 2, 'failed': 1}
+
+    assert client.get(f"/api/plans/{plans[0].id}").status_code == 404
+    remaining = client.post('/api/plans/batch-get', json={'ids': [plan.id for plan in plans]}).get_json()
+    assert [result['status'] for result in remaining['results']] == ['not_found', 'not_found', 'ok']
+
+
+@pytest.mark.parametrize('path', ['/api/plans/batch-get', '/api/plans/batch-delete'])
+@pytest.mark.parametrize('body', [{}, {'ids': []}, {'ids': 'plan-1'}, {'ids': [3]}, {'ids': ['x'] * 501}])
+def test_batch_endpoints_reject_bad_input(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 400 and 'error' in response.get_json()
@@ -0,0 +1,45 @@
+# tests/test_plan_etags.py
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository
+
+
+def test_unchanged_plan_revalidates_with_304(client):
+    plan = PlanRepository().create(PlanModel('Plan', details={'scope': 'Full'}))
+    first = client.get(f"/api/plans/{plan.id}")
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'no-cache'
+    assert first.get_json()['title'] == 'Plan'
+
+    for validator in (etag, f"W/{etag}", f'"other", {etag}'):
+        revalidated = client.get(f"/api/plans/{plan.id}", headers={'If-None-Match': validator})
+        assert revalidated.status_code == 304 and revalidated.data == b''
+        assert revalidated.headers['ETag'] == etag
+
+    stale = client.get(f"/api/plans/{plan.id}", headers={'If-None-Match': '"other"'})
+    assert stale.status_code == 200 and stale.get_json() == first.get_json()
+
+
+def test_update_changes_the_etag(client):
+    plan = PlanRepository().create(PlanModel('Plan'))
+    etag = client.get(f"/api/plans/{plan.id}").headers['ETag']
+
+    assert client.patch(f"/api/plans/{plan.id}", json={'title': 'Renamed'}).status_code == 200
+    response = client.get(f"/api/plans/{plan.id}", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'Renamed'
+    assert response.headers['ETag'] != etag
+
+
+def test_repeat_reads_are_served_from_the_plan_cache(client, monkeypatch):
+    from api.routes.plans import plan_service
+
+    plan = PlanRepository().create(PlanModel('Plan'))
+    body = client.get(f"/api/plans/{plan.id}").data
+    assert client.get('/api/plans/missing-plan').status_code == 404
+
+    def fail(plan_id):
+        raise AssertionError('cached plan was read from DynamoDB')
+
+    monkeypatch.setattr(plan_service.plan_repository, 'get', fail)
+    assert client.get(f"/api/plans/{plan.id}").data == body
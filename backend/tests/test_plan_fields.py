@@ -0,0 +1,105 @@
+# tests/test_plan_fields.py
+
+import pytest
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository
+from infrastructure.utils.fieldsets import MAX_FIELDS, fields_key, parse_fields, select_fields
+
+DETAILS = {
+    'scope': 'Full',
+    'budget': 1000,
+    'generated_plan': {'milestones': [
+        {'title': 'Shutdown', 'duration': 2},
+        {'title': 'Startup', 'duration': 3, 'dependencies': ['Shutdown']}
+    ]}
+}
+
+
+def test_parse_fields_builds_a_tree():
+    tree = parse_fields(' title , details.generated_plan.milestones.title,details.scope ', always=('id',))
+    assert tree == {'id': {}, 'title': {}, 'details': {'generated_plan': {'milestones': {'title': {}}}, 'scope': {}}}
+    # Selecting an ancestor whole swallows its descendants, in either order
+    assert parse_fields('details,details.scope') == parse_fields('details.scope,details') == {'details': {}}
+    assert parse_fields('title,') == {'title': {}}
+    assert parse_fields(None) is None and parse_fields(' ') is None
+
+
+@pytest.mark.parametrize('spec', ['details..scope', 'ti-tle', 'a.b.c.d.e.f.g', ','.join(['a'] * (MAX_FIELDS + 1))])
+def test_parse_fields_rejects_malformed_specs(spec):
+    with pytest.raises(ValueError):
+        parse_fields(spec)
+
+
+def test_fields_key_is_canonical():
+    assert fields_key(parse_fields('title,details.scope')) == fields_key(parse_fields('details.scope,title'))
+    assert fields_key(parse_fields('title')) != fields_key(parse_fields('title,details'))
+    assert fields_key(None) == ''
+
+
+def test_select_fields_applies_list_paths_to_each_element():
+    selected = select_fields({'details': DETAILS, 'title': 'Plan'}, parse_fields('details.generated_plan.milestones.title,missing'))
+    assert selected == {'details': {'generated_plan': {'milestones': [{'title': 'Shutdown'}, {'title': 'Startup'}]}}}
+    # A path deeper than the data stops at the value
+    assert select_fields({'details': {'scope': 'Full'}}, parse_fields('details.scope.name')) == {'details': {'scope': 'Full'}}
+
+
+def test_get_plan_returns_only_the_selected_fields(client):
+    plan = PlanRepository().create(PlanModel('Plan', details=DETAILS))
+    url = f"/api/plans/{plan.id}"
+    full = client.get(url)
+
+    sparse = client.get(url, query_string={'fields': 'title,details.generated_plan.milestones.title'})
+    assert sparse.status_code == 200
+    assert sparse.get_json() == {
+        'id': plan.id, 'createdAt': plan.created_at, 'updatedAt': plan.updated_at, 'title': 'Plan',
+        'details': {'generated_plan': {'milestones': [{'title': 'Shutdown'}, {'title': 'Startup'}]}}
+    }
+
+    # Each selection has its own ETag; an equivalent spelling shares it
+    etag = sparse.headers['ETag']
+    assert etag != full.headers['ETag']
+    assert client.get(url, query_string={'fields': 'details.generated_plan.milestones.title,title'}).headers['ETag'] == etag
+    assert client.get(url, query_string={'fields': 'title'}).headers['ETag'] != etag
+    revalidated = client.get(url, query_string={'fields': 'title,details.generated_plan.milestones.title'},
+                             headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+
+    # A new version of the plan changes every selection's ETag
+    assert client.patch(url, json={'title': 'Renamed'}).status_code == 200
+    renamed = client.get(url, query_string={'fields': 'title,details.generated_plan.milestones.title'},
+                         headers={'If-None-Match': etag})
+    assert renamed.status_code == 200 and renamed.get_json()['title'] == 'Renamed'
+
+
+def test_sparse_responses_are_cached_with_the_plan(client, monkeypatch):
+    from api.routes.plans import plan_service
+
+    plan = PlanRepository().create(PlanModel('Plan', details=DETAILS))
+    url = f"/api/plans/{plan.id}"
+    bodies = {fields: client.get(url, query_string={'fields': fields}).data for fields in ('title', 'details.scope')}
+
+    def fail(plan_id):
+        raise AssertionError('cached plan was read from DynamoDB')
+
+    monkeypatch.setattr(plan_service.plan_repository, 'get', fail)
+    for fields, body in bodies.items():
+        assert client.get(url, query_string={'fields': fields}).data == body
+    assert client.get(url).get_json()['details'] == DETAILS
+
+
+def test_list_selects_fields_of_each_plan(client):
+    repository = PlanRepository()
+    for i in range(3):
+        repository.create(PlanModel(f"Plan {i}", details=DETAILS))
+    items = client.get('/api/plans/', query_string={'fields': 'details.budget'}).get_json()['items']
+    assert len(items) == 3
+    assert all(set(item) == {'id', 'createdAt', 'updatedAt', 'details'} and item['details'] == {'budget': 1000}
+               for item in items)
+
+
+@pytest.mark.parametrize('path', ['/api/plans/', '/api/plans/plan-1'])
+def test_malformed_fields_are_rejected(client, path):
+    response = client.get(path, query_string={'fields': 'details..scope'})
+    assert response.status_code == 400 and 'error' in response.get_json()
@@ -0,0 +1,74 @@
+# tests/test_plan_idempotency.py
+
+import threading
+import time
+
+PLAN = {'title': 'Crude unit turnaround', 'plantType': 'refinery', 'duration': 30, 'budget': 5000000, 'scope': 'Full'}
+
+
+def wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/plans/jobs/{job_id}").get_json()
+        if job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_retry_with_the_same_key_replays_the_job_then_the_plan(client):
+    headers = {'Idempotency-Key': 'retry-key'}
+    first = client.post('/api/plans/generate', json=PLAN, headers=headers)
+    assert first.status_code == 202 and 'Idempotent-Replayed' not in first.headers
+    job = wait_for_job(client, first.get_json()['id'])
+    assert job['status'] == 'succeeded'
+
+    retry = client.post('/api/plans/generate', json=PLAN, headers=headers)
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json()['result']['id'] == job['result']['id']
+
+    reused = client.post('/api/plans/generate', json={**PLAN, 'budget': 1}, headers=headers)
+    assert reused.status_code == 422
+
+
+def test_concurrent_requests_cannot_both_claim_a_key(client, monkeypatch):
+    from api.routes import plans
+
+    # Hold the first request between claiming the key and submitting its job
+    entered, release = threading.Event(), threading.Event()
+    submit_unique = plans.plan_jobs.submit_unique
+
+    def held_submit(*args, **kwargs):
+        if not entered.is_set():
+            entered.set()
+            release.wait(5)
+        return submit_unique(*args, **kwargs)
+
+    monkeypatch.setattr(plans.plan_jobs, 'submit_unique', held_submit)
+    headers = {'Idempotency-Key': 'race-key'}
+    responses = {}
+    first = threading.Thread(target=lambda: responses.update(
+        first=client.application.test_client().post('/api/plans/generate', json=PLAN, headers=headers)
+    ))
+    first.start()
+    assert entered.wait(5)
+
+    different = client.post('/api/plans/generate', json={**PLAN, 'budget': 1}, headers=headers)
+    assert different.status_code == 422
+    same = threading.Thread(target=lambda: responses.update(
+        same=client.application.test_client().post('/api/plans/generate', json=PLAN, headers=headers)
+    ))
+    same.start()
+    release.set()
+    first.join(5)
+    same.join(5)
+
+    # The identical request joins the claiming request's job
+    assert responses['first'].status_code == responses['same'].status_code == 202
+    assert responses['first'].get_json()['id'] == responses['same'].get_json()['id']
+    wait_for_job(client, responses['first'].get_json()['id'])
+
+
+def test_overlong_key_is_rejected(client):
+    response = client.post('/api/plans/generate', json=PLAN, headers={'Idempotency-Key': 'k' * 256})
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+# tests/test_plan_pagination.py
+
+import pytest
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    key = {'id': 'plan-1', 'createdAt': '2026-01-01T00:00:00', 'status': 'draft'}
+    cursor = encode_cursor(key)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == key
+    assert encode_cursor(None) is None and decode_cursor('') is None
+
+
+@pytest.mark.parametrize('cursor', ['not base64!', 'WzEsMl0'])  # the second decodes to a list
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_list_page_cursor_walks_every_plan(dynamodb):
+    repository = PlanRepository()
+    ids = {repository.create(PlanModel(f"Plan {i}")).id for i in range(5)}
+    seen, cursor = [], None
+    while True:
+        items, cursor = repository.list_page(limit=2, cursor=cursor)
+        seen.extend(item['id'] for item in items)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+def test_list_endpoint_pages_and_projects_summaries(client):
+    repository = PlanRepository()
+    for i in range(3):
+        repository.create(PlanModel(f"Plan {i}", details={'budget': 100 + i, 'milestones': [{'title': 'A'}]}))
+
+    first = client.get('/api/plans/', query_string={'limit': 2, 'view': 'summary'}).get_json()
+    assert len(first['items']) == 2 and first['nextCursor']
+    assert all('milestones' not in item['details'] and 'budget' in item['details'] for item in first['items'])
+
+    rest = client.get('/api/plans/', query_string={'limit': 2, 'cursor': first['nextCursor']}).get_json()
+    assert len(rest['items']) == 1 and rest['nextCursor'] is None
+    assert rest['items'][0]['details']['milestones'] == [{'title': 'A'}]
+
+
+@pytest.mark.parametrize('query', [
+    {'limit': 0}, {'view': 'compact'}, {'cursor': 'not base64!'}, {'status': 'lost'}, {'from': 'yesterday'}
+])
+def test_list_endpoint_rejects_bad_parameters(client, query):
+    assert client.get('/api/plans/', query_string=query).status_code == 400
@@ -0,0 +1,25 @@
+# tests/test_plan_reads.py
+
+from decimal import Decimal
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanRepository
+
+
+def test_get_plan_returns_the_stored_item_without_a_model_round_trip(client, monkeypatch):
+    from api.routes.plans import plan_service
+
+    plan = PlanRepository().create(PlanModel('Plan', details={'budget': 1.5, 'plantType': 'refinery'}))
+
+    def fail(item):
+        raise AssertionError('read path should not build a PlanModel')
+
+    monkeypatch.setattr(PlanModel, 'from_dynamodb_item', fail)
+    item = plan_service.get_plan(plan.id)
+    assert item == plan.to_dynamodb_item()
+    assert item['details']['budget'] == Decimal('1.5')
+    assert plan_service.get_plan('missing') is None
+
+    response = client.get(f"/api/plans/{plan.id}")
+    assert response.status_code == 200
+    assert response.get_json()['details'] == {'budget': 1.5, 'plantType': 'refinery'}
@@ -0,0 +1,82 @@
+# tests/test_plan_updates.py
+
+import pytest
+
+from infrastructure.db.models.plan import PlanModel
+from infrastructure.db.repositories.plan_repository import PlanConditionError, PlanRepository, update_request
+
+
+def test_update_request_uses_a_placeholder_per_path_segment():
+    request = update_request('plan-1', '2026-01-01T00:00:00', {
+        'title': 'New title',
+        ('details', 'scope'): 'Full',
+        ('details', 'a.b'): 1
+    })
+    names = request['ExpressionAttributeNames']
+    assert request['Key'] == {'id': 'plan-1', 'createdAt': '2026-01-01T00:00:00'}
+    assert request['UpdateExpression'] == 'SET #p0_0 = :v0, #p1_0.#p1_1 = :v1, #p2_0.#p2_1 = :v2'
+    assert (names['#p1_0'], names['#p1_1']) == ('details', 'scope')
+    # A dotted key stays one map key
+    assert names['#p2_1'] == 'a.b'
+    assert request['ExpressionAttributeValues'] == {':v0': 'New title', ':v1': 'Full', ':v2': 1}
+    assert request['ConditionExpression'] == 'attribute_exists(#id)'
+
+
+def test_update_request_ands_the_condition():
+    condition = ('#status IN (:s0, :s1)', {'#status': 'status'}, {':s0': 'draft', ':s1': 'approved'})
+    request = update_request('plan-1', '2026-01-01T00:00:00', {'status': 'approved'}, condition)
+    assert request['ConditionExpression'] == 'attribute_exists(#id) AND (#status IN (:s0, :s1))'
+    assert request['ExpressionAttributeNames']['#status'] == 'status'
+    assert request['ExpressionAttributeValues'][':s1'] == 'approved'
+
+
+def test_conditional_update(dynamodb):
+    repository = PlanRepository()
+    plan = repository.create(PlanModel('Plan', details={'scope': 'Partial'}))
+    draft_only = ('#status = :draft', {'#status': 'status'}, {':draft': 'draft'})
+
+    updated = repository.update(plan.id, {('details', 'scope'): 'Full'}, condition=draft_only)
+    assert updated['details']['scope'] == 'Full'
+
+    repository.update(plan.id, {'status': 'approved'})
+    with pytest.raises(PlanConditionError) as error:
+        repository.update(plan.id, {'title': 'Edited'}, condition=draft_only)
+    assert error.value.item['status'] == 'approved'
+    assert repository.update('missing', {'title': 'Edited'}) is None
+
+
+def test_patch_writes_only_the_given_detail_keys(client):
+    plan = PlanRepository().create(PlanModel('Plan', details={'scope': 'Partial', 'budget': 10}))
+    response = client.patch(f"/api/plans/{plan.id}", json={
+        'id': plan.id, 'createdAt': plan.created_at, 'details': {'scope': 'Full', 'plantType': 'refinery'}
+    })
+    body = response.get_json()
+    assert response.status_code == 200 and response.headers['ETag']
+    assert body['details'] == {'scope': 'Full', 'budget': 10, 'plantType': 'refinery'}
+    assert body['plantType'] == 'refinery' and body['updatedAt'] > plan.updated_at
+
+
+def test_patch_enforces_status_transitions_and_locks(client):
+    plan = PlanRepository().create(PlanModel('Plan'))
+    url = f"/api/plans/{plan.id}"
+
+    assert client.patch(url, json={'status': 'completed'}).status_code == 409
+    assert client.patch(url, json={'status': 'approved'}).get_json()['status'] == 'approved'
+    # Approved plans are locked for content edits
+    locked = client.patch(url, json={'title': 'Edited'})
+    assert locked.status_code == 409 and 'approved' in locked.get_json()['error']
+    assert client.patch(url, json={'status': 'in_progress', 'title': 'Started'}).status_code == 409
+    assert client.patch(url, json={'status': 'in_progress'}).status_code == 200
+    assert client.patch(url, json={'title': 'Started'}).get_json()['title'] == 'Started'
+
+
+@pytest.mark.parametrize('body', [
+    [], {}, {'title': ''}, {'status': 'lost'}, {'details': 'text'}, {'owner': 'me'}, {'id': 'other'}
+])
+def test_patch_rejects_bad_updates(client, body):
+    plan = PlanRepository().create(PlanModel('Plan'))
+    assert client.patch(f"/api/plans/{plan.id}", json=body).status_code == 400
+
+
+def test_patch_missing_plan(client):
+    assert client.patch('/api/plans/missing', json={'title': 'Edited'}).status_code == 404
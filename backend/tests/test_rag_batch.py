@@ -0,0 +1,85 @@
+# tests/test_rag_batch.py
+
+import pytest
+
+from infrastructure.config import RAG_BATCH_MAX_QUESTIONS
+
+QUESTIONS = [
+    'What PPE is required for confined space entry?',
+    'How long should a heat exchanger be purged?',
+    '  what PPE is required for CONFINED space entry?? ',
+    'Who signs off the permit to work?'
+]
+
+
+def test_batch_answers_every_question_in_order(client, knowledge_base):
+    response = client.post('/api/rag/batch', json={'questions': QUESTIONS})
+    assert response.status_code == 200
+    body = response.get_json()
+
+    results = body['results']
+    assert [result['question'] for result in results] == QUESTIONS
+    assert all(result['answer'] and result['error'] is None and not result['cached'] for result in results)
+    # Questions that normalize the same are answered once
+    assert results[2]['answer'] == results[0]['answer'] and results[2]['sources'] == results[0]['sources']
+    assert body['summary'] == {
+        'questions': 4, 'unique': 3, 'cached': 0, 'failed': 0, 'documents': len(body['documents'])
+    }
+
+    # Sources are shared passages referenced by id, each with its own score
+    for result in results:
+        assert result['sources']
+        for source in result['sources']:
+            assert set(source) == {'id', 'score'} and source['id'] in body['documents']
+    assert set(next(iter(body['documents'].values()))) == {'content', 'location'}
+
+
+def test_batch_answers_are_cached_for_later_batches_and_queries(client, knowledge_base):
+    first = client.post('/api/rag/batch', json={'questions': QUESTIONS}).get_json()
+    again = client.post('/api/rag/batch', json={'questions': QUESTIONS}).get_json()
+    assert all(result['cached'] for result in again['results'])
+    assert again['summary']['cached'] == 3
+    assert [result['answer'] for result in again['results']] == [result['answer'] for result in first['results']]
+
+    hits = client.get('/api/rag/cache').get_json()['hits']
+    single = client.post('/api/rag/query', json={'question': QUESTIONS[1]}).get_json()
+    assert single['answer'] == first['results'][1]['answer']
+    assert client.get('/api/rag/cache').get_json()['hits'] == hits + 1
+
+    # A cached answer is reused alongside newly answered questions
+    mixed = client.post('/api/rag/batch', json={'questions': [QUESTIONS[3], 'Which gaskets need replacing?']}).get_json()
+    assert [result['cached'] for result in mixed['results']] == [True, False]
+
+
+def test_one_failed_question_does_not_fail_the_batch(client, knowledge_base, monkeypatch):
+    from api.routes.knowledge import kb_service
+
+    service = kb_service.get()
+    retriever = service.retriever
+
+    class FailingRetriever:
+        """Retrieval for questions about permits fails"""
+        def batch(self, questions, **kwargs):
+            results = retriever.batch(questions, **kwargs)
+            return [RuntimeError('index unavailable') if 'permit' in question else docs
+                    for question, docs in zip(questions, results)]
+
+    monkeypatch.setattr(service, 'retriever', FailingRetriever())
+    body = client.post('/api/rag/batch', json={'questions': QUESTIONS}).get_json()
+    failed = body['results'][3]
+    assert failed['answer'] is None and failed['error'] == 'index unavailable' and failed['sources'] == []
+    assert body['summary']['failed'] == 1
+    assert all(result['answer'] for result in body['results'][:3])
+
+    # The failure is not cached
+    monkeypatch.undo()
+    assert client.post('/api/rag/batch', json={'questions': [QUESTIONS[3]]}).get_json()['results'][0]['answer']
+
+
+@pytest.mark.parametrize('body', [
+    {}, {'questions': []}, {'questions': 'What PPE?'}, {'questions': ['ok', 3]}, {'questions': ['ok', '  ']},
+    {'questions': ['q'] * (RAG_BATCH_MAX_QUESTIONS + 1)}
+])
+def test_batch_rejects_bad_input(client, body):
+    response = client.post('/api/rag/batch', json=body)
+    assert response.status_code == 400 and 'error' in response.get_json()
@@ -0,0 +1,91 @@
+# tests/test_rag_streaming.py
+
+import json
+import random
+
+import pytest
+
+from api.services.knowledgebaseservice import KnowledgeBaseService, StreamingAnswerFormatter
+
+ANSWERS = [
+    "Lockout steps:\n1. Isolate the feed\n2. Vent the line\n\n• Wear a harness\n* Post a watch\n**Note** permits expire",
+    "  Indented text  \n\n\n12 valves are tagged.\n3.5 hours of purge\nShort header:   \n",
+    "A plain paragraph that runs well past the header limit, so it is decided long before it ends with a colon:\nNext",
+    "1\n2.\n\n   \n",
+    "",
+]
+
+
+def service():
+    # format_line needs no model or retriever
+    return KnowledgeBaseService.__new__(KnowledgeBaseService)
+
+
+def stream(text, seed):
+    formatter = StreamingAnswerFormatter(service())
+    rng = random.Random(seed)
+    parts, i = [], 0
+    while i < len(text):
+        step = rng.randint(1, 6)
+        parts.append(formatter.feed(text[i:i + step]))
+        i += step
+    parts.append(formatter.flush())
+    return parts
+
+
+@pytest.mark.parametrize('text', ANSWERS)
+def test_streamed_output_matches_format_answer(text):
+    expected = service().format_answer(text)
+    for seed in range(20):
+        assert ''.join(stream(text, seed)) == expected
+
+
+def test_decided_lines_stream_before_their_newline():
+    formatter = StreamingAnswerFormatter(service())
+    assert formatter.feed('Header') == ''
+    assert formatter.feed(':') == ''
+    assert formatter.feed('\n1') == '\nHeader:'
+    assert formatter.feed('. Drain ') == '\n\n1. Drain'
+    assert formatter.feed('the tank') == ' the tank'
+    assert formatter.feed('\n• ') == '\n•'
+    long_line = 'x' * (KnowledgeBaseService.HEADER_MAX_CHARS + 1)
+    assert formatter.feed(f"\n{long_line}") == f"\n{long_line}"
+    assert formatter.flush() == ''
+
+
+def test_long_line_ending_in_a_colon_is_not_a_header():
+    line = 'y' * KnowledgeBaseService.HEADER_MAX_CHARS + ':'
+    assert service().format_line(line) == line
+    assert service().format_line('Steps:') == '\nSteps:'
+
+
+def read_events(response):
+    events = []
+    for frame in response.get_data(as_text=True).split('\n\n'):
+        if not frame:
+            continue
+        fields = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((fields.get('event', 'message'), json.loads(fields['data'])))
+    return events
+
+
+def test_stream_endpoint_sends_sources_tokens_then_end(client, knowledge_base):
+    response = client.get('/api/rag/stream', query_string={'question': 'Which PPE is needed for vessel entry?'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    events = read_events(response)
+
+    assert events[0][0] == 'sources' and events[0][1]['source_documents']
+    tokens = [data['token'] for event, data in events[1:-1]]
+    assert tokens and all(event == 'message' for event, _ in events[1:-1])
+    assert events[-1] == ('end', {'error': None})
+
+    # The streamed answer is cached, and a repeat replays it in one token
+    replay = read_events(client.post('/api/rag/stream', json={'question': 'Which PPE is needed for vessel entry?'}))
+    assert [event for event, _ in replay] == ['sources', 'message', 'end']
+    assert replay[1][1]['token'] == ''.join(tokens)
+
+
+def test_stream_endpoint_requires_a_question(client):
+    assert client.get('/api/rag/stream').status_code == 400
+    assert client.post('/api/rag/stream', json={}).status_code == 400
@@ -0,0 +1,117 @@
+# tests/test_scheduling.py
+
+import random
+
+import pytest
+
+from api.services.schedulingservice import MilestoneSchedule, ScheduleError
+from benchmarks.fixtures import make_generated_plan
+
+
+def test_critical_path():
+    schedule = MilestoneSchedule([
+        {'title': 'Shutdown', 'duration': 2},
+        {'title': 'Inspect', 'duration': 3, 'dependencies': ['Shutdown']},
+        {'title': 'Clean', 'duration': 1, 'dependencies': ['Shutdown']},
+        {'title': 'Startup', 'duration': 2, 'dependencies': ['Inspect', 'Clean']}
+    ])
+    assert schedule.project_duration == 7
+    assert schedule.critical_path() == ['Shutdown', 'Inspect', 'Startup']
+    clean = schedule.milestone(schedule.index['Clean'])
+    assert clean['earliestStart'] == 2 and clean['totalFloat'] == 2 and not clean['critical']
+
+
+def test_incremental_update_matches_full_recompute():
+    milestones = make_generated_plan(n_milestones=60, seed=3)['milestones']
+    schedule = MilestoneSchedule(milestones)
+    rng = random.Random(7)
+    for _ in range(200):
+        node = rng.randrange(len(milestones))
+        duration = rng.choice([0, 0.5, 1, 3, 8, 20])
+        before = schedule.milestones()
+        moved = schedule.set_duration(node, duration)
+
+        milestones[node] = {**milestones[node], 'duration': duration}
+        full = MilestoneSchedule(milestones)
+        assert schedule.earliest_start == full.earliest_start
+        assert schedule.tail == full.tail
+        assert schedule.project_duration == full.project_duration
+        # Nodes reported as unmoved kept their timings
+        after = schedule.milestones()
+        for index in set(range(len(milestones))) - moved:
+            assert after[index]['earliestStart'] == before[index]['earliestStart']
+
+
+def test_unchanged_duration_moves_nothing():
+    schedule = MilestoneSchedule([{'title': 'A', 'duration': 2}, {'title': 'B', 'duration': 1, 'dependencies': ['A']}])
+    assert schedule.set_duration(0, 2) == set()
+    with pytest.raises(ValueError):
+        schedule.set_duration(0, -1)
+
+
+def test_cycle_raises():
+    with pytest.raises(ScheduleError, match='cycle'):
+        MilestoneSchedule([
+            {'title': 'A', 'duration': 1, 'dependencies': ['B']},
+            {'title': 'B', 'duration': 1, 'dependencies': ['A']}
+        ])
+
+
+def test_bad_references_are_reported_not_raised():
+    schedule = MilestoneSchedule([
+        {'title': 'A', 'duration': 'soon', 'dependencies': ['A', 'Missing']}
+    ])
+    assert schedule.durations == [0.0]
+    assert len(schedule.issues) == 3
+
+
+MILESTONES = [
+    {'title': 'Shutdown', 'duration': 2},
+    {'title': 'Inspect', 'duration': 3, 'dependencies': ['Shutdown']},
+    {'title': 'Clean', 'duration': 1, 'dependencies': ['Shutdown']},
+    {'title': 'Startup', 'duration': 2, 'dependencies': ['Inspect', 'Clean']}
+]
+
+
+def saved_plan(milestones=MILESTONES):
+    from infrastructure.db.models.plan import PlanModel
+    from infrastructure.db.repositories.plan_repository import PlanRepository
+
+    return PlanRepository().create(PlanModel('Plan', details={'duration': 10, 'generated_plan': {'milestones': milestones}}))
+
+
+def test_schedule_endpoint(client):
+    plan = saved_plan()
+    schedule = client.get(f"/api/plans/{plan.id}/schedule").get_json()
+    assert schedule['projectDuration'] == 7 and schedule['plannedDuration'] == 10
+    assert schedule['criticalPath'] == ['Shutdown', 'Inspect', 'Startup']
+    assert client.get('/api/plans/missing/schedule').status_code == 404
+
+    cyclic = saved_plan([{'title': 'A', 'dependencies': ['B']}, {'title': 'B', 'dependencies': ['A']}])
+    assert client.get(f"/api/plans/{cyclic.id}/schedule").status_code == 422
+
+
+def test_what_if_reports_changes_and_leaves_the_schedule_unchanged(client):
+    plan = saved_plan()
+    url = f"/api/plans/{plan.id}/schedule/what-if"
+    result = client.post(url, json={'changes': [{'milestone': 'Clean', 'duration': 6}]}).get_json()
+    assert (result['baselineDuration'], result['projectDuration'], result['delta']) == (7, 10, 3)
+    assert result['criticalPath'] == ['Shutdown', 'Clean', 'Startup']
+    assert {m['title'] for m in result['changedMilestones']} == {'Clean', 'Startup'}
+
+    assert client.get(f"/api/plans/{plan.id}/schedule").get_json()['projectDuration'] == 7
+    # A PATCH gives the plan a new version, and the schedule follows it
+    milestones = [dict(m, duration=5) if m['title'] == 'Inspect' else m for m in MILESTONES]
+    client.patch(f"/api/plans/{plan.id}", json={'details': {'generated_plan': {'milestones': milestones}}})
+    assert client.get(f"/api/plans/{plan.id}/schedule").get_json()['projectDuration'] == 9
+
+
+@pytest.mark.parametrize('body', [
+    [], {}, {'changes': []}, {'changes': ['Clean']},
+    {'changes': [{'milestone': 'Missing', 'duration': 1}]},
+    {'changes': [{'milestone': 'Clean', 'duration': -1}]},
+    {'changes': [{'milestone': 'Clean', 'duration': True}]}
+])
+def test_what_if_rejects_bad_changes(client, body):
+    plan = saved_plan()
+    assert client.post(f"/api/plans/{plan.id}/schedule/what-if", json=body).status_code == 400
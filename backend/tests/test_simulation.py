@@ -0,0 +1,115 @@
+# tests/test_simulation.py
+
+import numpy as np
+import pytest
+
+from api.services.schedulingservice import MilestoneSchedule
+from api.services.simulationservice import MonteCarloSimulator, derive_parameters
+from benchmarks.fixtures import make_generated_plan
+
+MILESTONES = [
+    {'title': 'Shutdown', 'duration': 2},
+    {'title': 'Inspect', 'duration': 3, 'dependencies': ['Shutdown']},
+    {'title': 'Clean', 'duration': 1, 'dependencies': ['Shutdown']},
+    {'title': 'Startup', 'duration': 2, 'dependencies': ['Inspect', 'Clean']}
+]
+
+
+def fixed(values):
+    return np.array([[v, v, v] for v in values], dtype=float)
+
+
+def test_propagation_matches_the_scalar_schedule_per_iteration():
+    milestones = make_generated_plan(n_milestones=40, seed=5)['milestones']
+    schedule = MilestoneSchedule(milestones)
+    simulator = MonteCarloSimulator(schedule, fixed(schedule.durations), np.zeros((0, 3)))
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(0, 10, size=(len(milestones), 25)).astype(np.float32)
+
+    project, critical = simulator._propagate(samples.copy())
+    expected_critical = np.zeros(len(milestones))
+    for column in range(samples.shape[1]):
+        edited = [{**m, 'duration': float(samples[i, column])} for i, m in enumerate(milestones)]
+        reference = MilestoneSchedule(edited)
+        assert project[column] == pytest.approx(reference.project_duration, rel=1e-5)
+        for title in reference.critical_path():
+            expected_critical[reference.index[title]] += 1
+    # Every node on the scalar critical path is counted critical by the batch
+    assert np.all(critical >= expected_critical)
+
+
+def test_fixed_ranges_reproduce_the_deterministic_schedule():
+    schedule = MilestoneSchedule(MILESTONES)
+    simulator = MonteCarloSimulator(schedule, fixed(schedule.durations), fixed([100.0, 50.0]))
+    run = simulator.run(500, seed=1, batch_size=64)
+    assert np.allclose(run['durations'], 7) and np.allclose(run['costs'], 150)
+    criticality = dict(zip(schedule.titles, run['criticality']))
+    assert criticality == {'Shutdown': 1.0, 'Inspect': 1.0, 'Clean': 0.0, 'Startup': 1.0}
+
+
+def test_sampled_means_follow_the_distribution():
+    schedule = MilestoneSchedule([{'title': 'A', 'duration': 10}, {'title': 'B', 'duration': 10, 'dependencies': ['A']}])
+    ranges = np.array([[5, 10, 30], [5, 10, 30]], dtype=float)
+    triangular = MonteCarloSimulator(schedule, ranges, np.zeros((0, 3)), distribution='triangular')
+    run = triangular.run(20000, seed=3)
+    # A chain sums its activities; each triangular mean is (low + mode + high) / 3
+    assert run['durations'].mean() == pytest.approx(2 * 45 / 3, rel=0.02)
+    pert = MonteCarloSimulator(schedule, ranges, np.zeros((0, 3))).run(20000, seed=3)
+    assert pert['durations'].mean() == pytest.approx(2 * (5 + 4 * 10 + 30) / 6, rel=0.02)
+
+    again = MonteCarloSimulator(schedule, ranges, np.zeros((0, 3))).run(20000, seed=3)
+    assert np.array_equal(again['durations'], pert['durations'])
+    with pytest.raises(ValueError):
+        MonteCarloSimulator(schedule, ranges, np.zeros((0, 3)), distribution='normal')
+
+
+def test_risks_widen_the_pessimistic_bound_of_named_milestones():
+    schedule = MilestoneSchedule(MILESTONES)
+    plan = {'details': {
+        'risk_assessment': {'high_risks': [{'title': 'Cracked tubes', 'description': 'Inspect may find cracks'}]},
+        'cost_breakdown': [{'category': 'Labor', 'amount': 100}, {'category': 'Bad', 'amount': 'n/a'}]
+    }}
+    durations, costs, categories = derive_parameters(plan, schedule, {'milestones': {'Startup': {'low': 1, 'mode': 2, 'high': 9}}})
+    inspect, clean, startup = (durations[schedule.index[t]] for t in ('Inspect', 'Clean', 'Startup'))
+    assert inspect[2] == pytest.approx(3 * (1.35 + 0.25))
+    assert clean[2] == pytest.approx(1 * 1.35)
+    assert list(startup) == [1, 2, 9]
+    assert categories == ['Labor'] and costs.tolist() == [[95.0, 100.0, 125.0]]
+
+
+def saved_plan(milestones=MILESTONES):
+    from infrastructure.db.models.plan import PlanModel
+    from infrastructure.db.repositories.plan_repository import PlanRepository
+
+    return PlanRepository().create(PlanModel('Plan', details={
+        'duration': 8, 'budget': 1000,
+        'generated_plan': {'milestones': milestones},
+        'cost_breakdown': [{'category': 'Labor', 'amount': 600}, {'category': 'Materials', 'amount': 300}]
+    }))
+
+
+def test_simulate_endpoint(client):
+    plan = saved_plan()
+    url = f"/api/plans/{plan.id}/simulate"
+    result = client.post(url, json={'iterations': 2000, 'seed': 7, 'startDate': '2026-03-02'}).get_json()
+    duration, cost = result['duration'], result['cost']
+    assert duration['deterministic'] == 7 and duration['planned'] == 8
+    assert duration['p50'] <= duration['p80'] <= duration['p90']
+    assert 0 < duration['probabilityWithinPlanned'] < 1
+    assert cost['deterministic'] == 900 and cost['categories'] == ['Labor', 'Materials']
+    assert result['criticality'][-1] == {'title': 'Clean', 'index': 0.0}
+    assert result['completionDate']['p50'] >= '2026-03-09'
+
+    assert client.post(url, json={'iterations': 2000, 'seed': 7, 'startDate': '2026-03-02'}).get_json()['duration'] == duration
+    assert client.post('/api/plans/missing/simulate', json={}).status_code == 404
+    assert client.post(f"/api/plans/{saved_plan([]).id}/simulate", json={}).status_code == 422
+
+
+@pytest.mark.parametrize('options', [
+    [], {'iterations': 10}, {'iterations': True}, {'seed': -1}, {'startDate': 'soon'},
+    {'distribution': 'normal'}, {'delayCostPerDay': -5}, {'durationFactors': [2, 1, 3]},
+    {'milestones': {'Missing': {'low': 1, 'mode': 2, 'high': 3}}}, {'costs': {'Fuel': {'low': 1, 'mode': 2, 'high': 3}}}
+])
+def test_simulate_rejects_bad_options(client, options):
+    plan = saved_plan()
+    assert client.post(f"/api/plans/{plan.id}/simulate", json=options).status_code == 400
@@ -0,0 +1,103 @@
+# tests/test_vector_index.py
+
+import numpy as np
+import pytest
+
+from infrastructure.retrieval import create_local_retriever
+from infrastructure.retrieval.vector_index import LocalVectorIndex
+
+DIM = 16
+
+
+def random_vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def docs(n, start=0):
+    return [{'page_content': f"doc {i}", 'metadata': {'row': i}} for i in range(start, start + n)]
+
+
+def exact_top(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:k])
+
+
+def test_search_returns_the_exact_nearest_rows(tmp_path):
+    index = LocalVectorIndex(str(tmp_path), DIM)
+    vectors = random_vectors(200)
+    assert index.add(vectors, docs(200)) == list(range(200))
+
+    query = random_vectors(1, seed=1)[0]
+    hits = index.search(query, k=5)
+    assert [row for row, _ in hits] == exact_top(vectors, query, 5)
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True) and scores[0] <= 1.0 + 1e-6
+    # An indexed vector is its own best match
+    assert index.search(vectors[42], k=1)[0][0] == 42
+    assert index.document(42)['metadata'] == {'row': 42}
+
+
+def test_add_grows_capacity_and_index_reopens(tmp_path):
+    index = LocalVectorIndex(str(tmp_path), DIM, initial_capacity=4)
+    vectors = random_vectors(11)
+    index.add(vectors[:3], docs(3))
+    index.add(vectors[3:], docs(8, start=3))
+    assert len(index) == 11 and index.capacity == 16
+
+    reopened = LocalVectorIndex.open(str(tmp_path))
+    assert len(reopened) == 11 and reopened.dim == DIM
+    assert reopened.search(vectors[9], k=1)[0][0] == 9
+    assert reopened.document(10)['page_content'] == 'doc 10'
+
+
+def test_empty_index_reopens(tmp_path):
+    LocalVectorIndex(str(tmp_path), DIM)
+    reopened = LocalVectorIndex.open(str(tmp_path))
+    assert len(reopened) == 0 and reopened.search(np.ones(DIM)) == []
+    reopened.add(random_vectors(2), docs(2))
+    assert len(LocalVectorIndex.open(str(tmp_path))) == 2
+
+
+def test_add_rejects_mismatched_input(tmp_path):
+    index = LocalVectorIndex(str(tmp_path), DIM)
+    with pytest.raises(ValueError):
+        index.add(np.zeros((2, DIM + 1)), docs(2))
+    with pytest.raises(ValueError):
+        index.add(np.zeros((2, DIM)), docs(1))
+    with pytest.raises(ValueError):
+        LocalVectorIndex(str(tmp_path), DIM * 2)
+    assert index.search(np.ones(DIM)) == []
+
+
+def test_ivf_search_probes_lists_and_covers_later_rows(tmp_path):
+    index = LocalVectorIndex(str(tmp_path), DIM)
+    vectors = random_vectors(300)
+    index.add(vectors, docs(300))
+    index.build_ivf(n_lists=8, seed=0)
+
+    query = random_vectors(1, seed=2)[0]
+    # Probing every list is exhaustive
+    assert index.search(query, k=10, nprobe=8) == index.search(query, k=10)
+    # Each indexed vector lands in its own nearest list
+    assert all(index.search(vectors[row], k=1, nprobe=1)[0][0] == row for row in range(0, 300, 17))
+
+    # Rows added after the build are scanned without a rebuild
+    extra = random_vectors(5, seed=3)
+    index.add(extra, docs(5, start=300))
+    assert index.search(extra[2], k=1, nprobe=1)[0][0] == 302
+
+    # The IVF build is persisted next to the matrix
+    reopened = LocalVectorIndex.open(str(tmp_path))
+    assert reopened.search(query, k=10, nprobe=8) == index.search(query, k=10)
+
+
+def test_local_retriever_ranks_the_matching_text_first(tmp_path):
+    retriever = create_local_retriever(str(tmp_path), k=2)
+    retriever.add_texts(
+        ['Purge the vessel with nitrogen', 'Inspect the heat exchanger tubes', 'Torque the flange bolts'],
+        [{'source': 'purge'}, {'source': 'inspect'}, {'source': 'torque'}]
+    )
+    documents = retriever.invoke('heat exchanger tube inspection')
+    assert len(documents) == 2
+    assert documents[0].metadata['source'] == 'inspect'
+    assert documents[0].metadata['score'] >= documents[1].metadata['score']
@@ -12,8 +12,25 @@ const validatePlanData = (plan: any): boolean => {
   );
 };
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+// Plan generation runs as a background job; poll until it finishes
+const waitForPlanJob = async (jobUrl: string): Promise<Plan> => {
+  while (true) {
+    const response = await fetch(`http://localhost:8001${jobUrl}`);
+    if (!response.ok) throw new Error('Failed to fetch plan generation status');
+    const job = await response.json();
+
+    if (job.status === 'succeeded') return job.result;
+    if (job.status === 'failed') throw new Error(job.error || 'Failed to generate plan');
+
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+};
+
 export const usePlans = () => {
   const [plans, setPlans] = useState<Plan[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [currentPlan, setCurrentPlan] = useState<Plan | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [isLoadingPlan, setIsLoadingPlan] = useState(false);
@@ -24,13 +41,15 @@ export const usePlans = () => {
     fetchPlans();
   }, []);
 
-  const fetchPlans = async () => {
+  const fetchPlans = async (cursor?: string) => {
     setIsLoading(true);
     try {
-      const response = await fetch('http://localhost:8001/api/plans');
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`http://localhost:8001/api/plans${query}`);
       if (!response.ok) throw new Error('Failed to fetch plans');
       const data = await response.json();
-      setPlans(data);
+      setPlans(prev => cursor ? [...prev, ...data.items] : data.items);
+      setNextCursor(data.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch plans');
     } finally {
@@ -85,7 +104,8 @@ export const usePlans = () => {
       });
 
       if (!response.ok) throw new Error('Failed to generate plan');
-      const newPlan = await response.json();
+      const job = await response.json();
+      const newPlan = await waitForPlanJob(`/api/plans/jobs/${job.id}`);
       
       setPlans(prev => [...prev, newPlan]);
       return newPlan;
@@ -100,7 +120,7 @@ export const usePlans = () => {
   const updatePlan = async (id: string, updates: Partial<Plan>) => {
     try {
       const response = await fetch(`http://localhost:8001/api/plans/${id}`, {
-        method: 'PUT',
+        method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(updates)
       });
@@ -155,7 +175,8 @@ export const usePlans = () => {
       });
 
       if (!response.ok) throw new Error('Failed to duplicate plan');
-      const newPlan = await response.json();
+      const job = await response.json();
+      const newPlan = await waitForPlanJob(`/api/plans/jobs/${job.id}`);
       
       setPlans(prev => [...prev, newPlan]);
       return newPlan;
@@ -176,6 +197,8 @@ export const usePlans = () => {
     updatePlan,
     deletePlan,
     duplicatePlan,
-    refreshPlans: fetchPlans
+    hasMorePlans: nextCursor !== null,
+    loadMorePlans: () => nextCursor ? fetchPlans(nextCursor) : Promise.resolve(),
+    refreshPlans: () => fetchPlans()
   };
 };
\ No newline at end of file